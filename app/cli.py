@@ -0,0 +1,361 @@
+"""Headless command line for getsupernovae.
+
+Runs the same provider -> selection -> report pipeline as the GUI without
+importing tkinter, so searches can be scheduled from cron or run over ssh:
+
+    python getsupernovae.py search --mag 16 --days 21 --site Sabadell \\
+        --format json --output tonight.json
+    python -m app.cli search --date 2026-03-12 --window South --format pdf -o tonight.pdf
+    python -m app.cli batch --from 2026-04-01 --to 2026-04-30 --sites Sabadell Requena \\
+        --format json --output-dir april/
+    python -m app.cli replay --archive captures/ --from 2026-03-01 --to 2026-03-31 \\
+        --site Sabadell --output-dir march/
+    python -m app.cli serve --host 0.0.0.0 --port 8765
+
+TXT and JSON reports go to stdout unless `--output` is given; PDF reports
+default to the user's Documents folder like the GUI. `batch` downloads and
+parses the catalog once and writes one report per night and site plus a
+summary into `--output-dir` (see services.batch). `replay` does the same
+for past nights against the Rochester pages archived then (see
+services.replay). `serve` answers
+`/candidates?site=...&date=...&mag=...` over HTTP (see services.api_server)
+until interrupted. Exit status is 0 on
+success, 1 when the catalog cannot be fetched or a report not written,
+and 2 for invalid arguments.
+"""
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+import time
+from datetime import date
+from typing import List, Optional
+
+from app.config.snconfig import bootstrap_config, load_catalog_sources, load_sites
+from app.i18n import set_language
+from app.models.catalog import SupernovaCatalog
+from app.services import selection
+from app.services.batch import (
+    BatchJob,
+    BatchResult,
+    batch_summary,
+    default_workers,
+    expand_dates,
+    run_batch,
+    summary_text,
+)
+from app.services.composite import make_provider_factory
+from app.services.provider import FileRochesterProvider, NetworkRochesterProvider
+from app.services.ranking import DEFAULT_ORDER, ORDERS
+from app.services.refresher import DEFAULT_INTERVAL, CatalogRefresher
+from app.services.replay import SnapshotArchive, replay_nights
+from app.services.selection_cache import SelectionCache
+from app.services.timing import PipelineTimer, log_timings
+
+FORMATS = ("txt", "json", "pdf")
+
+
+class CliError(Exception):
+    """Invalid command line input; reported on stderr with exit status 2."""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="getsupernovae",
+        description="Search for observable supernovae without the GUI.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="select visible supernovae and write a report")
+    search.add_argument("--date", help="observation date YYYY-MM-DD (default: today)")
+    search.add_argument("--site", help="site name from sites.json (default: the first site)")
+    add_search_arguments(search)
+    search.add_argument("-o", "--output", help="report path (default: stdout for txt/json)")
+    search.set_defaults(func=run_search)
+
+    batch = commands.add_parser("batch", help="search several nights (and sites) from one catalog download")
+    batch.add_argument("--dates", nargs="+", default=[], metavar="DATE", help="observation dates YYYY-MM-DD")
+    batch.add_argument("--from", dest="from_date", metavar="DATE", help="first night of a date range")
+    batch.add_argument("--to", dest="to_date", metavar="DATE", help="last night of a date range")
+    batch.add_argument("--sites", nargs="+", metavar="SITE", help="site names (default: the first site)")
+    add_search_arguments(batch)
+    batch.add_argument("--output-dir", default=".", help="directory for the reports and summary (default: .)")
+    batch.add_argument("--workers", type=int, default=default_workers(),
+                       help="worker processes (default: one per CPU)")
+    batch.set_defaults(func=run_batch_command)
+
+    replay = commands.add_parser("replay", help="re-run past nights against the archived Rochester pages")
+    replay.add_argument("--archive", help="directory of archived pages (default: $GETSUPERNOVAE_ARCHIVE_DIR)")
+    replay.add_argument("--dates", nargs="+", default=[], metavar="DATE", help="observation dates YYYY-MM-DD")
+    replay.add_argument("--from", dest="from_date", metavar="DATE", help="first night of a date range")
+    replay.add_argument("--to", dest="to_date", metavar="DATE", help="last night of a date range")
+    replay.add_argument("--site", help="site name from sites.json (default: the first site)")
+    replay.add_argument("--capture-hour", type=int, default=12,
+                        help="use the latest capture taken before this hour of each day (default: 12)")
+    add_search_arguments(replay)
+    replay.add_argument("--output-dir", default=".", help="directory for the reports and summary (default: .)")
+    replay.set_defaults(func=run_replay)
+
+    serve = commands.add_parser("serve", help="answer candidate queries over a local HTTP/JSON API")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, help="port (default: 8765)")
+    serve.add_argument("--workers", type=int, default=4, help="request worker threads (default: 4)")
+    serve.add_argument("--refresh-minutes", type=float, default=DEFAULT_INTERVAL / 60,
+                       help="catalog refresh interval (default: 30)")
+    serve.add_argument("--cache-size", type=int, default=64, help="cached selections (default: 64)")
+    serve.add_argument("--source", help="serve a saved Rochester HTML page instead of downloading")
+    serve.set_defaults(func=run_serve)
+    return parser
+
+
+def add_search_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments shared by every command that runs a search."""
+    parser.add_argument("--mag", default="17", help="maximum magnitude (default: 17)")
+    parser.add_argument("--days", default="21", help="days back to search (default: 21)")
+    parser.add_argument("--time", default="21:00", help="observation start time HH:MM (default: 21:00)")
+    parser.add_argument("--hours", default="5", help="observation length in hours (default: 5)")
+    parser.add_argument("--min-alt", default="25", help="minimum altitude in degrees (default: 25)")
+    parser.add_argument("--window", help="named visibility window (overrides --min-alt)")
+    parser.add_argument("--filter", help="filter expression, e.g. \"type = Ia and mag < 15\"")
+    parser.add_argument("--sort", choices=ORDERS, default=DEFAULT_ORDER,
+                        help="result order (default: start of visibility)")
+    parser.add_argument("--top", metavar="K", help="keep only the best K results (default: all)")
+    parser.add_argument("--source", help="read a saved Rochester HTML page instead of downloading")
+    parser.add_argument("--lang", help="report language (e.g. en, es, ca)")
+    parser.add_argument("--format", choices=FORMATS, default="txt", help="report format (default: txt)")
+
+
+def resolve_site(name: Optional[str], sites=None):
+    sites = sites if sites is not None else load_sites()
+    if not sites:
+        raise CliError("no sites configured")
+    if name is None:
+        return next(iter(sites.items()))
+    if name not in sites:
+        raise CliError(f"unknown site {name!r}; available: {', '.join(sites)}")
+    return name, sites[name]
+
+
+def search_config(args, site, day: Optional[str] = None) -> selection.SupernovaCallBackData:
+    """Validate the search arguments and return the selection settings."""
+    try:
+        return selection.make_search_config(
+            site, day, args.mag, args.days, args.time, args.hours, args.min_alt,
+            args.window, args.filter, args.top, args.sort,
+        )
+    except ValueError as ex:
+        raise CliError(str(ex))
+
+
+def provider_factory_for(args):
+    if args.source:
+        return functools.partial(FileRochesterProvider, args.source)
+    # merge local candidate lists (catalog_sources.json) like the GUI does
+    return make_provider_factory(load_catalog_sources(), NetworkRochesterProvider)
+
+
+def fetch_catalog(provider_factory, timer: Optional[PipelineTimer] = None) -> SupernovaCatalog:
+    try:
+        provider = provider_factory(timeout=20)
+    except TypeError:
+        provider = provider_factory()
+    if hasattr(provider, "timer"):
+        provider.timer = timer
+    return SupernovaCatalog.from_dtos(provider.fetch())
+
+
+def write_report(fmt: str, supernovas, e: selection.SupernovaCallBackData, output: Optional[str]) -> Optional[str]:
+    """Write the report in `fmt`; return the path written (None for stdout)."""
+    report_args = (
+        supernovas, e.fromDate, e.observationDate, e.magnitude, e.site,
+        float(e.minLatitude), e.visibilityWindowName,
+    )
+    if fmt == "pdf":
+        # reportlab and matplotlib are only loaded for this format
+        from app.reports.report_pdf import createPdf
+
+        return createPdf(*report_args, output_path=output)
+    if fmt == "json":
+        from app.reports.report_json import createJson
+
+        text = createJson(*report_args) + "\n"
+    else:
+        from app.reports.report_text import createTextAsString
+
+        text = createTextAsString(*report_args)
+    if not output or output == "-":
+        sys.stdout.write(text)
+        return None
+    with open(output, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    return output
+
+
+def run_search(args) -> int:
+    site_name, site = resolve_site(args.site)
+    e = search_config(args, site, args.date)
+    timer = PipelineTimer()
+    try:
+        catalog = fetch_catalog(provider_factory_for(args), timer)
+    except Exception as ex:
+        print(f"getsupernovae: cannot fetch the catalog: {ex}", file=sys.stderr)
+        return 1
+    supernovas = selection.RochesterSupernova().selectAndSortSupernovas(e, catalog, timer=timer)
+    log_timings(timer, source="CLI")
+    try:
+        path = write_report(args.format, supernovas, e, args.output)
+    except OSError as ex:
+        print(f"getsupernovae: cannot write the report: {ex}", file=sys.stderr)
+        return 1
+    if path:
+        print(f"{len(supernovas)} supernovae for {site_name} on {e.observationDate}: {path}", file=sys.stderr)
+    return 0
+
+
+def batch_report_path(output_dir: str, fmt: str, job: BatchJob) -> str:
+    site = re.sub(r"[^A-Za-z0-9_-]+", "_", job.site_name).strip("_") or "site"
+    return os.path.join(output_dir, f"{job.date}_{site}.{fmt}")
+
+
+def write_batch_report(output_dir: str, fmt: str, job: BatchJob, supernovas) -> str:
+    """`run_batch` report callable (module level so worker processes can use it)."""
+    return write_report(fmt, supernovas, job.config, batch_report_path(output_dir, fmt, job))
+
+
+def run_batch_command(args) -> int:
+    try:
+        dates = expand_dates(args.dates, args.from_date, args.to_date)
+    except ValueError as ex:
+        raise CliError(f"invalid dates: {ex}")
+    if not dates:
+        raise CliError("no observation dates; use --dates or --from/--to")
+    all_sites = load_sites()
+    sites = [resolve_site(name, all_sites) for name in (args.sites or [None])]
+    jobs = [BatchJob(name, search_config(args, site, day)) for day in dates for name, site in sites]
+
+    try:
+        catalog = fetch_catalog(provider_factory_for(args))
+    except Exception as ex:
+        print(f"getsupernovae: cannot fetch the catalog: {ex}", file=sys.stderr)
+        return 1
+    try:
+        os.makedirs(args.output_dir, exist_ok=True)
+    except OSError as ex:
+        print(f"getsupernovae: cannot create {args.output_dir}: {ex}", file=sys.stderr)
+        return 1
+
+    report = functools.partial(write_batch_report, args.output_dir, args.format)
+    results = run_batch(catalog, jobs, report=report, workers=args.workers)
+    return finish_batch(args.output_dir, args.format, results)
+
+
+def finish_batch(output_dir: str, fmt: str, results: List[BatchResult]) -> int:
+    """Write and print the summary of `results`; return the exit status."""
+    text = summary_text(results)
+    if fmt == "json":
+        summary_path = os.path.join(output_dir, "summary.json")
+        content = json.dumps(batch_summary(results), indent=2, ensure_ascii=False) + "\n"
+    else:
+        summary_path = os.path.join(output_dir, "summary.txt")
+        content = text
+    try:
+        with open(summary_path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+    except OSError as ex:
+        print(f"getsupernovae: cannot write the summary: {ex}", file=sys.stderr)
+        return 1
+    sys.stdout.write(text)
+    return 1 if any(r.error for r in results) else 0
+
+
+def run_replay(args) -> int:
+    if args.source:
+        raise CliError("replay reads the archived pages; --source is not supported")
+    archive_dir = args.archive or os.environ.get("GETSUPERNOVAE_ARCHIVE_DIR")
+    if not archive_dir:
+        raise CliError("no archive directory; use --archive or set GETSUPERNOVAE_ARCHIVE_DIR")
+    try:
+        dates = expand_dates(args.dates, args.from_date, args.to_date)
+    except ValueError as ex:
+        raise CliError(f"invalid dates: {ex}")
+    if not dates:
+        raise CliError("no observation dates; use --dates or --from/--to")
+    site_name, site = resolve_site(args.site)
+    jobs = {day: BatchJob(site_name, search_config(args, site, day)) for day in dates}
+
+    archive = SnapshotArchive(archive_dir)
+    if not len(archive):
+        print(f"getsupernovae: no archived pages in {archive_dir}", file=sys.stderr)
+        return 1
+    try:
+        os.makedirs(args.output_dir, exist_ok=True)
+    except OSError as ex:
+        print(f"getsupernovae: cannot create {args.output_dir}: {ex}", file=sys.stderr)
+        return 1
+
+    results = []
+    started = time.perf_counter()
+    nights = replay_nights(
+        archive, [date.fromisoformat(day) for day in dates],
+        lambda day: jobs[day.isoformat()].config, selection.RochesterSupernova(), args.capture_hour,
+    )
+    for day, captured, supernovas in nights:
+        job = jobs[day.isoformat()]
+        result = BatchResult(job.date, site_name)
+        if captured is None:
+            result.error = "no archived page before that night"
+        else:
+            result.count = len(supernovas)
+            result.names = [sn.name for sn in supernovas]
+            try:
+                result.path = write_batch_report(args.output_dir, args.format, job, supernovas)
+            except OSError as ex:
+                result.error = str(ex)
+        result.wall = time.perf_counter() - started
+        started = time.perf_counter()
+        results.append(result)
+    return finish_batch(args.output_dir, args.format, results)
+
+
+def run_serve(args) -> int:
+    # only this command needs the HTTP server and its request pool
+    from app.services.api_server import DEFAULT_PORT, ApiServer, CandidatesService
+
+    port = args.port if args.port is not None else DEFAULT_PORT
+    interval = max(1.0, args.refresh_minutes) * 60
+    refresher = CatalogRefresher(provider_factory_for(args), interval=interval)
+    service = CandidatesService(refresher, load_sites(), SelectionCache(max_entries=args.cache_size))
+    try:
+        server = ApiServer((args.host, port), service, workers=args.workers)
+    except OSError as ex:
+        print(f"getsupernovae: cannot listen on {args.host}:{port}: {ex}", file=sys.stderr)
+        return 1
+    refresher.start()
+    host, port = server.server_address[:2]
+    print(f"serving on http://{host}:{port}/candidates", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        refresher.stop()
+        server.server_close()
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    bootstrap_config()
+    if getattr(args, "lang", None):
+        set_language(args.lang)
+    try:
+        return args.func(args)
+    except CliError as ex:
+        parser.exit(2, f"getsupernovae {args.command}: error: {ex}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
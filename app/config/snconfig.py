@@ -114,6 +114,36 @@ def load_visibility_windows(path=None):
     return defaults
 
 
+def load_catalog_sources(path=None):
+    """Load the list of extra local catalog sources merged with Rochester.
+
+    The file `catalog_sources.json` holds a list of objects such as
+    `{"type": "csv", "path": "~/lists/survey.csv"}` (type `csv` or `html`).
+    Returns an empty list when the file is missing or invalid.
+    """
+    candidates = get_config_candidates(path, "catalog_sources.json")
+
+    for p in candidates:
+        try:
+            if not p:
+                continue
+            with open(p, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if not isinstance(data, list):
+                continue
+            result = []
+            for entry in data:
+                if isinstance(entry, dict) and entry.get("path"):
+                    entry = dict(entry)
+                    entry["path"] = os.path.expanduser(str(entry["path"]))
+                    result.append(entry)
+            return result
+        except Exception:
+            continue
+
+    return []
+
+
 def get_user_config_dir():
     """Return the user config directory for getsupernovae.
 
@@ -140,6 +170,29 @@ def get_user_config_dir():
     return os.path.expanduser("~/.config/getsupernovae")
 
 
+def get_user_cache_dir():
+    """Return the user cache directory for getsupernovae.
+
+    Mirrors `get_user_config_dir`: respects XDG_CACHE_HOME on Linux, uses
+    ~/Library/Caches on macOS or LOCALAPPDATA on Windows.
+    """
+    env = os.environ.get("GETSUPERNOVAE_CACHE_DIR")
+    if env:
+        return env
+    # keep test runs away from the real user cache (see get_user_config_dir)
+    if "pytest" in sys.modules or "PYTEST_CURRENT_TEST" in os.environ:
+        return os.path.join(os.getcwd(), ".getsupernovae_test_cache")
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    if xdg:
+        return os.path.join(xdg, "getsupernovae")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/getsupernovae")
+    localappdata = os.environ.get("LOCALAPPDATA")
+    if localappdata:
+        return os.path.join(localappdata, "getsupernovae", "cache")
+    return os.path.expanduser("~/.cache/getsupernovae")
+
+
 def bootstrap_config():
     """Create user config dir and write default config files if missing."""
     cfg = get_user_config_dir()
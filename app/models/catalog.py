@@ -0,0 +1,322 @@
+"""Column-wise storage for parsed Rochester catalogs.
+
+A list of `SupernovaDTO` keeps one dataclass, several `str`/`date` objects
+and a scalar `SkyCoord` per entry alive. `SupernovaCatalog` stores the same
+fields as columns instead:
+
+- magnitude, RA/Dec (degrees) and date ordinals as numpy arrays
+- mostly-unique strings (name, coordinates text, link, ...) as unicode arrays
+- repetitive strings (host, type, date texts) interned as integer codes into
+  a small table of distinct values
+
+Coordinates are rebuilt lazily with one vectorized `SkyCoord`. Indexing or
+iterating yields `SupernovaRow` views exposing the `SupernovaDTO` attributes,
+so existing per-row code keeps working while selection can use the numpy
+columns directly.
+"""
+import hashlib
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from astropy.coordinates import SkyCoord
+import astropy.units as u
+
+from app.models.dto import SupernovaDTO
+
+# Marker for None in unicode columns. Numpy string arrays cannot hold None
+# and silently strip trailing NULs, so use a Unicode noncharacter instead.
+NONE_STR = "\uffff"
+
+# mostly unique per entry: stored as unicode arrays
+_TEXT_FIELDS = ("name", "ra", "decl", "link", "maxMagnitude", "row_hash")
+# few distinct values: stored as codes into a table of distinct strings
+_INTERNED_FIELDS = ("host", "type", "date", "maxMagnitudeDate", "firstObserved", "mag_limit")
+STRING_FIELDS = _TEXT_FIELDS + _INTERNED_FIELDS
+DATE_FIELDS = ("date_obj", "maxMagnitudeDate_obj", "firstObserved_obj")
+
+
+def _encode_str(value: Optional[str]) -> str:
+    return NONE_STR if value is None else str(value)
+
+
+def _decode_str(value) -> Optional[str]:
+    return None if value == NONE_STR else str(value)
+
+
+def date_to_ordinal(value: Optional[date]) -> int:
+    """Proleptic ordinal of `value`, 0 for None."""
+    return value.toordinal() if value is not None else 0
+
+
+def ordinal_to_date(value: int) -> Optional[date]:
+    return date.fromordinal(int(value)) if value > 0 else None
+
+
+class InternedColumn:
+    """String column stored as int32 codes into a table of distinct values."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, codes: np.ndarray, values: List[Optional[str]]):
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def from_values(cls, items: Iterable[Optional[str]]) -> "InternedColumn":
+        table: Dict[Optional[str], int] = {}
+        codes = [table.setdefault(None if v is None else str(v), len(table)) for v in items]
+        return cls(np.asarray(codes, dtype=np.int32), list(table))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        return self.values[self.codes[i]]
+
+    def take(self, indices: np.ndarray) -> "InternedColumn":
+        return InternedColumn(self.codes[indices], self.values)
+
+    def to_array(self) -> np.ndarray:
+        """Expand to a plain unicode array (None as `NONE_STR`)."""
+        table = np.array([_encode_str(v) for v in self.values] or [NONE_STR], dtype=str)
+        return table[self.codes] if len(self.codes) else np.array([], dtype=str)
+
+
+class SupernovaRow:
+    """Read-only view of one catalog entry with the `SupernovaDTO` attributes."""
+
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog: "SupernovaCatalog", index: int):
+        self._catalog = catalog
+        self._index = index
+
+    def __getattr__(self, attr):
+        # only reached for names not defined on the class
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return self._catalog.value(attr, self._index)
+
+    @property
+    def coordinates(self):
+        return self._catalog.coordinate(self._index)
+
+    def to_dto(self) -> SupernovaDTO:
+        return self._catalog.to_dto(self._index)
+
+    def __repr__(self) -> str:
+        return f"SupernovaRow({self.name!r}, mag={self.mag!r}, date={self.date!r})"
+
+
+class SupernovaCatalog(Sequence):
+    """Parsed catalog stored column-wise; see the module docstring."""
+
+    def __init__(self, columns: Dict[str, object]):
+        self._columns = columns
+        self._coords = None
+        self._fingerprint = None
+
+    # construction ------------------------------------------------------
+
+    @classmethod
+    def from_dtos(cls, dtos: Iterable[SupernovaDTO]) -> "SupernovaCatalog":
+        if isinstance(dtos, SupernovaCatalog):
+            return dtos
+        dtos = list(dtos)
+        columns: Dict[str, object] = {}
+        for f in _TEXT_FIELDS:
+            columns[f] = np.array([_encode_str(getattr(d, f, None)) for d in dtos], dtype=str)
+        for f in _INTERNED_FIELDS:
+            columns[f] = InternedColumn.from_values(getattr(d, f, None) for d in dtos)
+        for f in DATE_FIELDS:
+            columns[f] = np.array([date_to_ordinal(getattr(d, f, None)) for d in dtos], dtype=np.int32)
+        columns["mag"] = np.array(
+            [np.nan if d.mag is None else float(d.mag) for d in dtos], dtype=np.float64
+        )
+
+        ra_deg = np.full(len(dtos), np.nan)
+        dec_deg = np.full(len(dtos), np.nan)
+        for i, d in enumerate(dtos):
+            coord = getattr(d, "coordinates", None)
+            if coord is not None:
+                ra_deg[i] = coord.ra.degree
+                dec_deg[i] = coord.dec.degree
+        columns["ra_deg"] = ra_deg
+        columns["dec_deg"] = dec_deg
+        return cls(columns)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "SupernovaCatalog":
+        """Build a catalog from plain arrays as produced by `to_arrays`."""
+        columns: Dict[str, object] = {}
+        for f in _TEXT_FIELDS:
+            columns[f] = np.asarray(arrays[f], dtype=str)
+        for f in _INTERNED_FIELDS:
+            columns[f] = InternedColumn.from_values(_decode_str(v) for v in arrays[f])
+        for f in DATE_FIELDS:
+            columns[f] = np.asarray(arrays[f], dtype=np.int32)
+        for f in ("mag", "ra_deg", "dec_deg"):
+            columns[f] = np.asarray(arrays[f], dtype=np.float64)
+        return cls(columns)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Return every column as a plain numpy array (e.g. for `np.savez`)."""
+        arrays = {}
+        for f in STRING_FIELDS:
+            col = self._columns[f]
+            arrays[f] = col.to_array() if isinstance(col, InternedColumn) else col
+        for f in DATE_FIELDS + ("mag", "ra_deg", "dec_deg"):
+            arrays[f] = self._columns[f]
+        return arrays
+
+    # columns -----------------------------------------------------------
+
+    @property
+    def mag(self) -> np.ndarray:
+        """Magnitudes (NaN when unknown)."""
+        return self._columns["mag"]
+
+    @property
+    def ra_deg(self) -> np.ndarray:
+        return self._columns["ra_deg"]
+
+    @property
+    def dec_deg(self) -> np.ndarray:
+        return self._columns["dec_deg"]
+
+    @property
+    def has_coordinates(self) -> np.ndarray:
+        return ~(np.isnan(self.ra_deg) | np.isnan(self.dec_deg))
+
+    def ordinals(self, field: str = "date_obj") -> np.ndarray:
+        """Date column `field` as proleptic ordinals (0 when unknown)."""
+        if field not in DATE_FIELDS:
+            raise KeyError(field)
+        return self._columns[field]
+
+    def column(self, field: str) -> np.ndarray:
+        """Values of a string column as an object array (None when missing)."""
+        col = self._columns[field]
+        if isinstance(col, InternedColumn):
+            table = np.empty(len(col.values), dtype=object)
+            table[:] = col.values
+            return table[col.codes]
+        if field in _TEXT_FIELDS:
+            return np.array([_decode_str(v) for v in col], dtype=object)
+        return col
+
+    def factorized(self, field: str) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """(codes, distinct values) of a string column.
+
+        Interned columns are returned as stored, so a per-value test only
+        runs once for each distinct value.
+        """
+        col = self._columns[field]
+        if isinstance(col, InternedColumn):
+            return col.codes, col.values
+        return np.arange(len(col), dtype=np.int32), [_decode_str(v) for v in col]
+
+    @property
+    def names(self) -> np.ndarray:
+        return self._columns["name"]
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of every column; equal catalogs give equal fingerprints.
+
+        Used as the catalog version in cache keys. Computed once.
+        """
+        if self._fingerprint is None:
+            h = hashlib.sha1()
+            for f in STRING_FIELDS + DATE_FIELDS + ("mag", "ra_deg", "dec_deg"):
+                col = self._columns[f]
+                if isinstance(col, InternedColumn):
+                    h.update(repr(col.values).encode("utf-8"))
+                    col = col.codes
+                h.update(f.encode("ascii"))
+                h.update(np.ascontiguousarray(col).tobytes())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    @property
+    def coordinates(self) -> Optional[SkyCoord]:
+        """All positions as one vectorized `SkyCoord` (built on first use).
+
+        Entries without coordinates hold (0, 0); check `has_coordinates`.
+        """
+        if self._coords is None and len(self):
+            ok = self.has_coordinates
+            self._coords = SkyCoord(
+                ra=np.where(ok, self.ra_deg, 0.0) * u.deg,
+                dec=np.where(ok, self.dec_deg, 0.0) * u.deg,
+                frame="icrs",
+            )
+        return self._coords
+
+    # rows --------------------------------------------------------------
+
+    def value(self, field: str, i: int):
+        """Return the `SupernovaDTO` value of `field` for entry `i`."""
+        col = self._columns.get(field)
+        if col is None:
+            if field == "coordinates":
+                return self.coordinate(i)
+            raise AttributeError(field)
+        if isinstance(col, InternedColumn):
+            return col[i]
+        if field in _TEXT_FIELDS:
+            return _decode_str(col[i])
+        if field in DATE_FIELDS:
+            return ordinal_to_date(col[i])
+        if field == "mag":
+            return None if np.isnan(col[i]) else float(col[i])
+        return col[i]
+
+    def coordinate(self, i: int) -> Optional[SkyCoord]:
+        if np.isnan(self.ra_deg[i]) or np.isnan(self.dec_deg[i]):
+            return None
+        return self.coordinates[i]
+
+    def to_dto(self, i: int) -> SupernovaDTO:
+        values = {f: self.value(f, i) for f in STRING_FIELDS + DATE_FIELDS + ("mag",)}
+        return SupernovaDTO(coordinates=self.coordinate(i), **values)
+
+    def to_dtos(self) -> List[SupernovaDTO]:
+        coords = self.coordinates
+        ok = self.has_coordinates
+        result = []
+        for i in range(len(self)):
+            values = {f: self.value(f, i) for f in STRING_FIELDS + DATE_FIELDS + ("mag",)}
+            result.append(SupernovaDTO(coordinates=coords[i] if ok[i] else None, **values))
+        return result
+
+    def take(self, indices) -> "SupernovaCatalog":
+        """Return a new catalog with the entries at `indices` (or a bool mask)."""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        columns = {}
+        for f, col in self._columns.items():
+            columns[f] = col.take(indices) if isinstance(col, InternedColumn) else col[indices]
+        return SupernovaCatalog(columns)
+
+    def __len__(self) -> int:
+        return len(self._columns["mag"])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(np.arange(len(self))[i])
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("catalog index out of range")
+        return SupernovaRow(self, i)
+
+    def __iter__(self) -> Iterator[SupernovaRow]:
+        for i in range(len(self)):
+            yield SupernovaRow(self, i)
+
+    def __repr__(self) -> str:
+        return f"SupernovaCatalog({len(self)} entries)"
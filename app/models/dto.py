@@ -27,3 +27,8 @@ class SupernovaDTO:
     type: Optional[str] = None
     maxMagnitudeDate_obj: Optional[date] = None
     firstObserved_obj: Optional[date] = None
+    # digest of the raw table cells (see snparser.row_signature); used to
+    # detect unchanged rows between consecutive fetches
+    row_hash: Optional[str] = None
+    # '>' or '<' when `mag` is only a limit (e.g. '>18.5' = fainter than 18.5)
+    mag_limit: Optional[str] = None
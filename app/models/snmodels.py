@@ -44,3 +44,6 @@ class Supernova:
     # optional parsed date objects (kept as date for compatibility)
     maxMagnitudeDate_obj: Optional[date] = None
     firstObserved_obj: Optional[date] = None
+    # optional enrichment from the Rochester detail page (see services.details)
+    discoverer: Optional[str] = None
+    recentMagnitudes: List[Any] = field(default_factory=list)
@@ -1,7 +1,21 @@
 """Reports shim for refactor.
 Re-export existing report modules under `app.reports`.
+
+The names are resolved on first access (module `__getattr__`), so importing
+a single report such as `app.reports.report_json` does not load reportlab
+and matplotlib for the PDF report.
 """
-from .report_text import *  # noqa: F401,F403
-from .report_pdf import *  # noqa: F401,F403
+import importlib
+
+_MODULES = ("report_text", "report_pdf")
 
 __all__ = []
+
+
+def __getattr__(name):
+    if not name.startswith("_"):
+        for module in _MODULES:
+            mod = importlib.import_module(f"{__name__}.{module}")
+            if hasattr(mod, name):
+                return getattr(mod, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
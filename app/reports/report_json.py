@@ -0,0 +1,88 @@
+"""Machine-readable JSON report of a search.
+
+`createJson` returns the same content as the text/PDF reports (search
+settings, site and the sorted supernovae with their visibility window) as a
+JSON document, for scripts consuming the headless CLI output.
+"""
+import json
+from typing import List, Optional
+
+from app.models.snmodels import Supernova
+from app.services.constellations import assign_constellations
+from app.utils.snparser import format_iso_datetime
+
+
+def _degrees(angle) -> Optional[float]:
+    try:
+        return round(float(angle.degree), 2)
+    except Exception:
+        return None
+
+
+def visibilityToDict(data: Supernova) -> dict:
+    """Start/end of the visible interval and the peak altitude (degrees)."""
+    cords = list(getattr(data.visibility, "azCords", None) or [])
+    if not cords:
+        return {"from": None, "to": None, "maxAlt": None}
+    alts = [a for a in (_degrees(getattr(c.coord, "alt", None)) for c in cords) if a is not None]
+    return {
+        "from": format_iso_datetime(cords[0].time),
+        "to": format_iso_datetime(cords[-1].time),
+        "maxAlt": max(alts) if alts else data.visibility.maxAlt,
+    }
+
+
+def supernovaToDict(data: Supernova) -> dict:
+    try:
+        mag = float(data.mag)
+    except (TypeError, ValueError):
+        mag = None
+    coords = data.coordinates
+    return {
+        "name": data.name,
+        "date": data.date,
+        "mag": mag,
+        "type": data.type,
+        "host": data.host,
+        "constellation": data.constellation,
+        "ra": data.ra,
+        "decl": data.decl,
+        "raDeg": _degrees(coords.ra) if coords is not None else None,
+        "decDeg": _degrees(coords.dec) if coords is not None else None,
+        "firstObserved": data.firstObserved,
+        "maxMagnitude": data.maxMagnitude,
+        "maxMagnitudeDate": data.maxMagnitudeDate,
+        "link": data.link or "",
+        "visibility": visibilityToDict(data),
+    }
+
+
+def siteToDict(site, minLatitude, visibilityWindowName=None) -> dict:
+    try:
+        place = {
+            "lon": round(float(site.lon.value), 4),
+            "lat": round(float(site.lat.value), 4),
+            "height": round(float(site.height.value), 1),
+        }
+    except Exception:
+        place = {}
+    place["minAlt"] = float(minLatitude)
+    place["visibilityWindow"] = visibilityWindowName
+    return place
+
+
+def createJsonData(supernovas: List[Supernova], fromDate: str, observationDate: str, magnitude, site, minLatitude, visibilityWindowName=None) -> dict:
+    assign_constellations(supernovas)
+    return {
+        "fromDate": fromDate,
+        "observationDate": observationDate,
+        "magnitude": float(magnitude),
+        "site": siteToDict(site, minLatitude, visibilityWindowName),
+        "count": len(supernovas),
+        "supernovae": [supernovaToDict(sn) for sn in supernovas],
+    }
+
+
+def createJson(supernovas: List[Supernova], fromDate: str, observationDate: str, magnitude, site, minLatitude, visibilityWindowName=None) -> str:
+    data = createJsonData(supernovas, fromDate, observationDate, magnitude, site, minLatitude, visibilityWindowName)
+    return json.dumps(data, indent=2, ensure_ascii=False)
@@ -10,6 +10,8 @@ from reportlab.lib.utils import ImageReader
 from app.utils.snparser import format_iso_datetime
 from app.models.snmodels import Supernova
 from app.reports.plotutils import VisibilityPlotter
+from app.reports.report_text import textDetails
+from app.services.constellations import assign_constellations
 from app.config.snconfig import load_visibility_windows as _load_visibility_windows
 import app.i18n as i18n
 from pathlib import Path
@@ -57,8 +59,14 @@ def addSupernovaToPdf(textObject, data: Supernova):
         textObject.textLine(line)
 
 
-def createPdf(supernovas, fromDate: str, observationDate: str, magnitude, site, minLatitude, visibilityWindowName=None):
+def createPdf(supernovas, fromDate: str, observationDate: str, magnitude, site, minLatitude, visibilityWindowName=None, output_path=None):
+    """Write the PDF report and return its path.
+
+    Saved as `<observationDate>.pdf` in the user's Documents folder unless
+    `output_path` is given.
+    """
     logger.info("Creating pdf")
+    assign_constellations(supernovas)
     import i18n as i18n_module
     # choose a font to embed for better mobile compatibility (Unicode, degree sign)
     used_font = "Courier"
@@ -97,7 +105,9 @@ def createPdf(supernovas, fromDate: str, observationDate: str, magnitude, site,
     topy = 29.7 * cm - margintop
 
     # Determine user-friendly save location
-    if platform.system() == "Windows":
+    if output_path:
+        docs = None
+    elif platform.system() == "Windows":
         # Try Documents folder first, fall back to Desktop, then current dir
         try:
             docs = Path.home() / "Documents"
@@ -118,7 +128,7 @@ def createPdf(supernovas, fromDate: str, observationDate: str, magnitude, site,
             logger.exception("failed to determine Documents/home path; falling back to cwd")
             docs = Path.cwd()
     
-    pdf_filename = docs / f"{observationDate}.pdf"
+    pdf_filename = Path(output_path) if output_path else docs / f"{observationDate}.pdf"
     canvas = Canvas(str(pdf_filename), pagesize=A4)
     try:
         canvas.setPageCompression(0)
@@ -176,6 +186,11 @@ def createPdf(supernovas, fromDate: str, observationDate: str, magnitude, site,
             "",
             "",
         ]
+        details = textDetails(data)
+        if details:
+            # insert before "Discovered": the two trailing blank lines are
+            # where the Rochester/TNS links get drawn
+            lines[-3:-3] = details.split("\n")
         return lines
 
     plotter = VisibilityPlotter()
@@ -4,9 +4,23 @@ from typing import List
 from app.models.snmodels import Supernova
 from app.utils.snparser import format_iso_datetime
 from app.config.snconfig import load_visibility_windows
+from app.services.constellations import assign_constellations
 import app.i18n as i18n
 
 
+def textDetails(data: Supernova) -> str:
+    """Return the optional detail-page lines (discoverer, recent magnitudes)."""
+    lines = []
+    discoverer = getattr(data, "discoverer", None)
+    if discoverer:
+        lines.append(i18n._("  Discoverer: {discoverer}").format(discoverer=discoverer))
+    recent = getattr(data, "recentMagnitudes", None)
+    if recent:
+        mags = ", ".join(f"{d} {m:.1f}" for d, m in recent)
+        lines.append(i18n._("  Recent magnitudes: {mags}").format(mags=mags))
+    return "\n".join(lines)
+
+
 def textSupernova(data: Supernova) -> str:
     tpl = i18n._(
         """
@@ -30,7 +44,7 @@ RA:{ra}, DECL.{decl}
     visible_to = format_iso_datetime(data.visibility.azCords[-1].time)
     observation_time = f"{visible_from} - {visible_to}"
 
-    return tpl.format(
+    text = tpl.format(
         date=data.date,
         mag=data.mag,
         type=data.type,
@@ -52,6 +66,11 @@ RA:{ra}, DECL.{decl}
         link=getattr(data, "link", ""),
     )
 
+    details = textDetails(data)
+    if details:
+        text += details + "\n"
+    return text
+
 
 def textSite(site, minLatitude, visibilityWindowName=None):
     try:
@@ -84,6 +103,8 @@ def createText(supernovas: List[Supernova], fromDate: str, observationDate: str,
     print(header)
     print(siteInfo)
 
+    assign_constellations(supernovas)
+
     for data in supernovas:
         print(textSupernova(data))
 
@@ -94,6 +115,8 @@ def createTextAsString(supernovas: List[Supernova], fromDate: str, observationDa
 
     fulltext = i18n._("{header}\n{siteInfo}\n\n").format(header=header, siteInfo=siteInfo)
 
+    assign_constellations(supernovas)
+
     for data in supernovas:
         fulltext += i18n._("\n{sn}\n").format(sn=textSupernova(data))
 
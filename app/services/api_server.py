@@ -0,0 +1,202 @@
+"""Local HTTP/JSON API over the selection pipeline.
+
+One process keeps the catalog warm (`CatalogRefresher`) and answers
+
+    GET /candidates?site=Sabadell&date=2026-04-12&mag=16
+    GET /sites
+    GET /health
+
+for every phone or planning tool on the network, instead of each machine
+downloading and transforming the list itself. `/candidates` accepts the
+search settings of the GUI as query parameters (`site`, `date`, `mag`,
+`days`, `time`, `hours`, `minAlt`, `window`, `filter`, and `top`/`sort`
+as in services.ranking; all optional) and returns the JSON report of
+`app.reports.report_json`. Selection results are kept in a
+`SelectionCache` keyed by the catalog fingerprint and settings, so
+repeated queries are answered without recomputing visibility, and
+concurrent identical queries compute once. Requests are handled by a
+fixed pool of worker threads.
+"""
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from app.reports.report_json import createJsonData
+from app.services import selection
+from app.services.selection_cache import SelectionCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+# query parameter -> make_search_config argument
+QUERY_PARAMS = {
+    "date": "observationDate",
+    "mag": "magnitude",
+    "days": "daysToSearch",
+    "time": "observationTime",
+    "hours": "observationHours",
+    "minAlt": "minLatitude",
+    "window": "visibilityWindowName",
+    "filter": "filterExpression",
+    "top": "maxResults",
+    "sort": "sortBy",
+}
+
+
+class ApiError(Exception):
+    """A request that cannot be answered; `status` is the HTTP status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class CandidatesService:
+    """Answer candidate queries from a warm catalog and cached selections."""
+
+    def __init__(self, refresher, sites, cache: Optional[SelectionCache] = None):
+        self.refresher = refresher
+        self.sites = sites
+        self.cache = cache if cache is not None else SelectionCache(max_entries=64)
+        self._fetch_lock = threading.Lock()
+        # selection key -> lock held while that selection is computed
+        self._inflight: Dict[tuple, threading.Lock] = {}
+        self._inflight_lock = threading.Lock()
+
+    def catalog(self):
+        catalog, _checked = self.refresher.latest()
+        if catalog is not None:
+            return catalog
+        # first request before the background refresh finished: fetch once
+        with self._fetch_lock:
+            catalog, _checked = self.refresher.latest()
+            if catalog is None:
+                catalog = self.refresher.refresh()
+        if catalog is None:
+            raise ApiError(503, f"catalog not available: {self.refresher.error or 'not fetched yet'}")
+        return catalog
+
+    def site(self, name: Optional[str]):
+        if not self.sites:
+            raise ApiError(500, "no sites configured")
+        if not name:
+            return next(iter(self.sites.items()))
+        if name in self.sites:
+            return name, self.sites[name]
+        for known, site in self.sites.items():
+            if known.lower() == name.lower():
+                return known, site
+        raise ApiError(404, f"unknown site {name!r}; available: {', '.join(self.sites)}")
+
+    def candidates(self, params: Dict[str, str]) -> Tuple[dict, bool]:
+        """Return (JSON report, served from cache) for the query `params`."""
+        site_name, site = self.site(params.get("site"))
+        kwargs = {arg: params[key] for key, arg in QUERY_PARAMS.items() if params.get(key)}
+        try:
+            e = selection.make_search_config(site, **kwargs)
+        except ValueError as ex:
+            raise ApiError(400, str(ex))
+
+        catalog = self.catalog()
+        selector = selection.RochesterSupernova()
+        key = selector.selectionKey(e, catalog)
+        results = self.cache.get(key)
+        cached = results is not None
+        if results is None:
+            with self._inflight_lock:
+                lock = self._inflight.setdefault(key, threading.Lock())
+            with lock:
+                # an identical query may have finished while we waited
+                results = self.cache.get(key)
+                if results is None:
+                    results = selector.selectAndSortSupernovas(e, catalog)
+                    self.cache.put(key, results)
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+        data = createJsonData(
+            results, e.fromDate, e.observationDate, e.magnitude, e.site,
+            float(e.minLatitude), e.visibilityWindowName,
+        )
+        data["site"]["name"] = site_name
+        data["catalogAge"] = self.refresher.age()
+        return data, cached
+
+    def health(self) -> dict:
+        catalog, _checked = self.refresher.latest()
+        return {
+            "catalog": len(catalog) if catalog is not None else None,
+            "catalogAge": self.refresher.age(),
+            "error": self.refresher.error,
+            "cachedSelections": len(self.cache),
+            "cacheHits": self.cache.hits,
+            "cacheMisses": self.cache.misses,
+        }
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    server_version = "getsupernovae"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        service: CandidatesService = self.server.service
+        try:
+            if url.path == "/candidates":
+                data, cached = service.candidates(params)
+                self.send_json(200, data, {"X-Cache": "HIT" if cached else "MISS"})
+            elif url.path == "/sites":
+                self.send_json(200, {"sites": list(service.sites)})
+            elif url.path == "/health":
+                self.send_json(200, service.health())
+            else:
+                raise ApiError(404, f"no such endpoint: {url.path}")
+        except ApiError as ex:
+            self.send_json(ex.status, {"error": str(ex)})
+        except Exception as ex:
+            logger.exception("request %s failed", self.path)
+            self.send_json(500, {"error": str(ex) or type(ex).__name__})
+
+    def send_json(self, status: int, data: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        # planning tools running in a browser call the API from other origins
+        self.send_header("Access-Control-Allow-Origin", "*")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+
+class ApiServer(HTTPServer):
+    """HTTP server handing each connection to a fixed pool of worker threads."""
+
+    def __init__(self, address, service: CandidatesService, workers: int = 4):
+        super().__init__(address, ApiRequestHandler)
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="api-worker")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
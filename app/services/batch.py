@@ -0,0 +1,163 @@
+"""Batch searches over several observation nights and sites.
+
+Planning a month means running the same search once per night. `run_batch`
+does it from a single parsed catalog: the catalog is sent once to each
+worker process (not re-downloaded or re-parsed per night), the nights and
+sites are spread over the workers, and within a worker the AltAz frames of
+a site and window are built once and shared by every candidate (see
+`app.ui.snvisibility.observation_frames`). Each job writes its own report
+through the `report` callable and returns a small `BatchResult`;
+`batch_summary` / `summary_text` combine those into one overview.
+"""
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Iterable, List, Optional
+
+from app.models.catalog import SupernovaCatalog
+from app.services import selection
+from app.services.constellations import default_grid
+
+
+@dataclass
+class BatchJob:
+    """One search of the batch: a night at a site."""
+    site_name: str
+    config: "selection.SupernovaCallBackData"
+
+    @property
+    def date(self) -> str:
+        return self.config.observationDate
+
+
+@dataclass
+class BatchResult:
+    date: str
+    site_name: str
+    count: int = 0
+    names: List[str] = field(default_factory=list)
+    path: Optional[str] = None
+    error: Optional[str] = None
+    wall: float = 0.0
+
+
+def expand_dates(dates: Iterable[str] = (), start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+    """Return the sorted, distinct YYYY-MM-DD dates of `dates` plus `start..end`.
+
+    Raises ValueError for a malformed date or an empty/reversed range.
+    """
+    days = {date.fromisoformat(d) for d in dates}
+    if start or end:
+        first = date.fromisoformat(start or end)
+        last = date.fromisoformat(end or start)
+        if last < first:
+            raise ValueError(f"date range ends before it starts: {first} .. {last}")
+        days.update(first + timedelta(days=i) for i in range((last - first).days + 1))
+    return [d.isoformat() for d in sorted(days)]
+
+
+def default_workers() -> int:
+    """Number of CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+# catalog shared by every job of a worker process, set by _init_worker
+_worker_catalog = None
+
+
+def _load_shared_tables() -> None:
+    """Load the Earth-orientation (IERS) table and the constellation grid.
+
+    Both are read lazily on first use, which costs seconds per process;
+    loading them before the pool starts lets forked workers inherit them.
+    """
+    try:
+        from astropy.utils import iers
+
+        iers.earth_orientation_table.get()
+        default_grid()
+    except Exception:
+        # each worker falls back to loading them itself
+        pass
+
+
+def _init_worker(catalog) -> None:
+    global _worker_catalog
+    _worker_catalog = catalog
+
+
+def _run_job(job: BatchJob, report: Optional[Callable] = None, catalog=None) -> BatchResult:
+    started = time.perf_counter()
+    result = BatchResult(job.date, job.site_name)
+    try:
+        supernovas = selection.RochesterSupernova().selectAndSortSupernovas(
+            job.config, catalog if catalog is not None else _worker_catalog
+        )
+        result.count = len(supernovas)
+        result.names = [sn.name for sn in supernovas]
+        if report is not None:
+            result.path = report(job, supernovas)
+    except Exception as ex:
+        result.error = str(ex) or type(ex).__name__
+    result.wall = time.perf_counter() - started
+    return result
+
+
+def run_batch(catalog, jobs: List[BatchJob], report: Optional[Callable] = None, workers: int = 1) -> List[BatchResult]:
+    """Run every job against `catalog`; return their results in job order.
+
+    `report(job, supernovas)` writes the job's report and returns its path;
+    with `workers > 1` it must be picklable (a module-level function or a
+    `functools.partial` of one). A failing job is reported in its
+    `BatchResult.error` and does not stop the others.
+    """
+    catalog = SupernovaCatalog.from_dtos(catalog)
+    workers = max(1, min(int(workers or 1), len(jobs)))
+    if workers == 1:
+        return [_run_job(job, report, catalog) for job in jobs]
+    _load_shared_tables()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(catalog,)) as pool:
+        futures = [pool.submit(_run_job, job, report) for job in jobs]
+        return [f.result() for f in futures]
+
+
+def batch_summary(results: List[BatchResult]) -> dict:
+    """Per-night counts plus the candidates visible on more than one night."""
+    nights: "OrderedDict[str, set]" = OrderedDict()
+    for r in results:
+        for name in r.names:
+            nights.setdefault(name, set()).add(r.date)
+    recurring = sorted(
+        ((name, sorted(days)) for name, days in nights.items() if len(days) > 1),
+        key=lambda item: (-len(item[1]), item[0]),
+    )
+    return {
+        "runs": [
+            {"date": r.date, "site": r.site_name, "count": r.count, "report": r.path,
+             "error": r.error, "wall": round(r.wall, 3)}
+            for r in results
+        ],
+        "candidates": len(nights),
+        "recurring": [{"name": name, "nights": days} for name, days in recurring],
+    }
+
+
+def summary_text(results: List[BatchResult]) -> str:
+    summary = batch_summary(results)
+    lines = [f"{'date':<12}{'site':<20}{'found':>6}  report"]
+    for run in summary["runs"]:
+        where = run["report"] or ""
+        if run["error"]:
+            where = f"ERROR: {run['error']}"
+        lines.append(f"{run['date']:<12}{run['site']:<20}{run['count']:>6}  {where}")
+    lines.append("")
+    lines.append(f"{summary['candidates']} distinct supernovae")
+    for item in summary["recurring"]:
+        lines.append(f"  {item['name']}: {len(item['nights'])} nights ({', '.join(item['nights'])})")
+    return "\n".join(lines) + "\n"
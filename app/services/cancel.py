@@ -0,0 +1,38 @@
+"""Cooperative cancellation for long-running searches.
+
+A `CancellationToken` is handed to the download, the HTML parser and the
+visibility loop; each checks it between units of work (network chunks,
+table rows, catalog entries) and raises `OperationCancelled` once the token
+is cancelled. Nothing is interrupted forcibly, so a cancelled search stops
+at its next checkpoint and leaves no half-written state behind.
+"""
+import threading
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """Raised inside a worker when its search has been cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag shared by the UI and a worker."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled()
+
+
+def check_cancelled(token: Optional[CancellationToken]) -> None:
+    """Raise `OperationCancelled` if `token` (which may be None) is cancelled."""
+    if token is not None and token.cancelled:
+        raise OperationCancelled()
@@ -0,0 +1,228 @@
+"""Composite provider merging Rochester with local candidate catalogs.
+
+`CompositeProvider` fetches or reads several sources concurrently with
+asyncio and merges them through a name/position index. Sources are listed
+in precedence order: when two sources describe the same object the entry
+of the earlier source wins and only its missing fields are filled from the
+later ones. The result is the usual list of `SupernovaDTO`, so callers such
+as `AsyncRochesterDownload` and `refilter_from_cache` work unchanged.
+"""
+import asyncio
+import dataclasses
+import logging
+import math
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models.dto import SupernovaDTO
+from app.services.cancel import OperationCancelled
+
+logger = logging.getLogger(__name__)
+
+# fields filled from lower-precedence sources when missing in the winner
+_FILL_FIELDS = (
+    "date",
+    "date_obj",
+    "mag",
+    "host",
+    "link",
+    "firstObserved",
+    "firstObserved_obj",
+    "maxMagnitude",
+    "maxMagnitudeDate",
+    "maxMagnitudeDate_obj",
+    "type",
+)
+
+_NAME_PREFIX = re.compile(r"^(?:sn|at)\s*", re.IGNORECASE)
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Normalise a designation: 'SN 2025abc', 'AT2025abc' -> '2025abc'."""
+    if not name:
+        return ""
+    return _NAME_PREFIX.sub("", name.strip()).replace(" ", "").lower()
+
+
+def _angular_distance_deg(ra1, dec1, ra2, dec2) -> float:
+    """Great-circle distance in degrees (haversine)."""
+    ra1, dec1, ra2, dec2 = map(math.radians, (ra1, dec1, ra2, dec2))
+    h = math.sin((dec2 - dec1) / 2) ** 2 + math.cos(dec1) * math.cos(dec2) * math.sin((ra2 - ra1) / 2) ** 2
+    return math.degrees(2 * math.asin(min(1.0, math.sqrt(h))))
+
+
+class CatalogIndex:
+    """Index of merged entries by normalised name and sky position.
+
+    Positions are bucketed in declination bands one match radius wide, so a
+    lookup only compares against entries in the three neighbouring bands.
+    """
+
+    def __init__(self, radius_arcsec: float = 5.0):
+        self.radius_deg = radius_arcsec / 3600.0
+        self.entries: List[SupernovaDTO] = []
+        self._by_name: Dict[str, int] = {}
+        self._bands: Dict[int, List[Tuple[float, float, int]]] = {}
+
+    def _position(self, dto: SupernovaDTO):
+        coord = getattr(dto, "coordinates", None)
+        if coord is None:
+            return None
+        try:
+            return float(coord.ra.degree), float(coord.dec.degree)
+        except Exception:
+            return None
+
+    def _band(self, dec: float) -> int:
+        return int(math.floor(dec / self.radius_deg)) if self.radius_deg > 0 else 0
+
+    def find(self, dto: SupernovaDTO) -> Optional[int]:
+        """Return the index of an entry matching `dto` by name or position."""
+        idx = self._by_name.get(normalize_name(dto.name))
+        if idx is not None:
+            return idx
+
+        pos = self._position(dto)
+        if pos is None or self.radius_deg <= 0:
+            return None
+        ra, dec = pos
+        band = self._band(dec)
+        best = None
+        for b in (band - 1, band, band + 1):
+            for ra2, dec2, i in self._bands.get(b, ()):
+                d = _angular_distance_deg(ra, dec, ra2, dec2)
+                if d <= self.radius_deg and (best is None or d < best[0]):
+                    best = (d, i)
+        return best[1] if best else None
+
+    def add(self, dto: SupernovaDTO) -> int:
+        i = len(self.entries)
+        self.entries.append(dto)
+        self._register(dto, i)
+        return i
+
+    def _register(self, dto: SupernovaDTO, i: int) -> None:
+        key = normalize_name(dto.name)
+        if key:
+            self._by_name.setdefault(key, i)
+        pos = self._position(dto)
+        if pos is not None:
+            self._bands.setdefault(self._band(pos[1]), []).append((pos[0], pos[1], i))
+
+    def merge(self, dto: SupernovaDTO) -> None:
+        """Add `dto`, or fill the missing fields of the entry it matches."""
+        i = self.find(dto)
+        if i is None:
+            self.add(dto)
+            return
+
+        winner = self.entries[i]
+        fill = {}
+        for f in _FILL_FIELDS:
+            if getattr(winner, f, None) in (None, "") and getattr(dto, f, None) not in (None, ""):
+                fill[f] = getattr(dto, f)
+        if "mag" in fill:
+            fill["mag_limit"] = getattr(dto, "mag_limit", None)
+        if fill:
+            # copy instead of mutating the source's objects; the merged
+            # content no longer matches the source row fingerprint
+            self.entries[i] = dataclasses.replace(winner, row_hash=None, **fill)
+        # the alias name also resolves to the merged entry
+        self._by_name.setdefault(normalize_name(dto.name), i)
+
+
+def merge_catalogs(catalogs: Sequence[List[SupernovaDTO]], radius_arcsec: float = 5.0) -> List[SupernovaDTO]:
+    """Merge `catalogs` (highest precedence first) with de-duplication."""
+    index = CatalogIndex(radius_arcsec)
+    for catalog in catalogs:
+        for dto in catalog or []:
+            index.merge(dto)
+    return index.entries
+
+
+class CompositeProvider:
+    """Fetch several providers concurrently and merge their catalogs.
+
+    Providers exposing an async `fetch_async()` are awaited directly, plain
+    blocking `fetch()` implementations run in worker threads. A failing
+    source is logged and skipped; the fetch only fails when every source
+    failed.
+    """
+
+    def __init__(self, sources: Sequence, radius_arcsec: float = 5.0, timeout: int = 20):
+        self.sources = list(sources)
+        self.radius_arcsec = radius_arcsec
+        self.timeout = timeout
+        self.errors: List[Tuple[object, BaseException]] = []
+        # optional CancellationToken and PipelineTimer, handed to every source
+        self.cancel = None
+        self.timer = None
+
+    async def _fetch_source(self, source) -> List[SupernovaDTO]:
+        fetch_async = getattr(source, "fetch_async", None)
+        if fetch_async is not None:
+            return await fetch_async()
+        return await asyncio.to_thread(source.fetch)
+
+    async def fetch_async(self) -> List[SupernovaDTO]:
+        for source in self.sources:
+            if hasattr(source, "cancel"):
+                source.cancel = self.cancel
+            if hasattr(source, "timer"):
+                source.timer = self.timer
+        results = await asyncio.gather(
+            *(self._fetch_source(s) for s in self.sources), return_exceptions=True
+        )
+        catalogs = []
+        self.errors = []
+        for source, res in zip(self.sources, results):
+            if isinstance(res, OperationCancelled):
+                raise res
+            if isinstance(res, BaseException):
+                logger.warning("catalog source %r failed: %s", getattr(source, "source", source), res)
+                self.errors.append((source, res))
+                continue
+            catalogs.append(res)
+
+        if self.sources and not catalogs:
+            raise self.errors[0][1]
+        return merge_catalogs(catalogs, self.radius_arcsec)
+
+    def fetch(self) -> List[SupernovaDTO]:
+        return asyncio.run(self.fetch_async())
+
+
+def make_provider_factory(sources_conf: Optional[List[dict]], primary_factory=None):
+    """Return a provider factory for the configured local catalog sources.
+
+    `sources_conf` is the list loaded by `load_catalog_sources`, e.g.
+    `[{"type": "csv", "path": "~/lists/atlas.csv"}]`. Rochester (built by
+    `primary_factory`) always has the highest precedence. Without local
+    sources the primary factory is returned unchanged.
+    """
+    from app.services.provider import (
+        CsvSupernovaProvider,
+        FileRochesterProvider,
+        NetworkRochesterProvider,
+    )
+
+    primary_factory = primary_factory or NetworkRochesterProvider
+    if not sources_conf:
+        return primary_factory
+
+    def factory(timeout: int = 20):
+        sources = [primary_factory(timeout=timeout)]
+        for conf in sources_conf:
+            kind = str(conf.get("type", "csv")).lower()
+            path = conf.get("path")
+            if not path:
+                continue
+            if kind == "csv":
+                sources.append(CsvSupernovaProvider(path, timeout=timeout))
+            elif kind == "html":
+                sources.append(FileRochesterProvider(path, timeout=timeout))
+            else:
+                logger.warning("unknown catalog source type %r", kind)
+        return CompositeProvider(sources, timeout=timeout)
+
+    return factory
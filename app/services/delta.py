@@ -0,0 +1,75 @@
+"""Differences between consecutive Rochester catalogs.
+
+The active list only changes by a handful of rows between fetches. These
+helpers compare two parsed catalogs by SN name and row content so callers
+can restrict expensive work (coordinates, visibility, constellation) to
+the entries that actually changed.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set
+
+from app.models.dto import SupernovaDTO
+
+_CONTENT_FIELDS = (
+    "date",
+    "mag",
+    "mag_limit",
+    "host",
+    "ra",
+    "decl",
+    "link",
+    "firstObserved",
+    "maxMagnitude",
+    "maxMagnitudeDate",
+    "type",
+)
+
+
+@dataclass
+class CatalogDelta:
+    """Names added, changed, removed and unchanged between two catalogs."""
+    added: Set[str] = field(default_factory=set)
+    changed: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    unchanged: Set[str] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+def content_key(dto: SupernovaDTO):
+    """Return a comparable value describing the row content of `dto`."""
+    row_hash = getattr(dto, "row_hash", None)
+    if row_hash:
+        return row_hash
+    return tuple(getattr(dto, f, None) for f in _CONTENT_FIELDS)
+
+
+def index_by_name(dtos: Iterable[SupernovaDTO]) -> Dict[str, SupernovaDTO]:
+    """Index `dtos` by name; later duplicates win, like a page re-read."""
+    return {d.name: d for d in dtos if getattr(d, "name", None)}
+
+
+def diff_catalogs(
+    previous: Optional[Iterable[SupernovaDTO]], current: Iterable[SupernovaDTO]
+) -> CatalogDelta:
+    """Compare `current` against `previous` by name and row content.
+
+    With no previous catalog every current entry is reported as added.
+    """
+    prev = index_by_name(previous or [])
+    cur = index_by_name(current)
+
+    delta = CatalogDelta()
+    for name, dto in cur.items():
+        old = prev.get(name)
+        if old is None:
+            delta.added.add(name)
+        elif content_key(old) != content_key(dto):
+            delta.changed.add(name)
+        else:
+            delta.unchanged.add(name)
+
+    delta.removed = set(prev) - set(cur)
+    return delta
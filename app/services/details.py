@@ -0,0 +1,204 @@
+"""Optional enrichment from the per-supernova Rochester detail pages.
+
+Each `Supernova.link` points to a detail page with the discoverer and the
+recent photometry. `DetailFetcher` downloads the pages for a result set
+concurrently (bounded thread pool, per-host concurrency limit, keep-alive
+connections) and keeps them in an on-disk cache; `enrich_supernovas`
+attaches the parsed fields to the `Supernova` objects used by the reports.
+Both take the search's `CancellationToken`: pages not started yet are
+dropped once it is cancelled and the pages in flight are not waited for.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup
+
+from app.config.snconfig import get_user_cache_dir
+from app.services.cancel import CancellationToken, check_cancelled
+from app.services.httpclient import default_pool
+from app.utils.snparser import parse_date, parse_magnitude
+
+# number of most recent magnitudes kept per supernova
+RECENT_MAGNITUDES = 5
+# seconds between checks of the cancellation token while pages are in flight
+CANCEL_POLL = 0.1
+
+_DISCOVERER_PATTERNS = [
+    re.compile(r"discover(?:er|ed by)\s*:\s*([^\n;]+)", re.IGNORECASE),
+    re.compile(r"discovered\b[^\n]*?\bby\s+([^\n;(]+)", re.IGNORECASE),
+]
+_DATE_PREFIX = re.compile(r"^\s*(\d{4}[-/.]\d{1,2}[-/.]\d{1,2})")
+
+
+def parse_detail_html(html: bytes | str) -> dict:
+    """Extract discoverer and recent magnitudes from a detail page.
+
+    Returns a dict with keys `discoverer` (str or None) and
+    `recentMagnitudes` (list of (YYYY-MM-DD, mag) tuples, newest first).
+    """
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+
+    soup = BeautifulSoup(html, "html.parser")
+    text = soup.get_text("\n")
+
+    discoverer = None
+    for pattern in _DISCOVERER_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            discoverer = " ".join(m.group(1).split()).strip(" ,.")
+            break
+
+    # photometry tables: a row starting with a date followed by a magnitude
+    mags: Dict[str, float] = {}
+    for row in soup.find_all("tr"):
+        cells = [c.get_text(strip=True) for c in row.find_all("td")]
+        if len(cells) < 2:
+            continue
+        m = _DATE_PREFIX.match(cells[0])
+        if not m:
+            continue
+        date_obj, date_text = parse_date(m.group(1))
+        if date_obj is None:
+            continue
+        for cell in cells[1:]:
+            val, limit = parse_magnitude(cell)
+            if val is not None and limit is None:
+                # keep the brightest measurement of each night
+                mags[date_text] = min(val, mags.get(date_text, val))
+                break
+
+    recent = sorted(mags.items(), reverse=True)[:RECENT_MAGNITUDES]
+    return {"discoverer": discoverer, "recentMagnitudes": recent}
+
+
+class DetailCache:
+    """On-disk cache of detail pages keyed by URL."""
+
+    def __init__(self, directory: Optional[str] = None, max_age: float = 6 * 3600):
+        self.directory = directory or os.path.join(get_user_cache_dir(), "details")
+        self.max_age = max_age
+
+    def path_for(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".html")
+
+    def get(self, url: str) -> Optional[bytes]:
+        p = self.path_for(url)
+        try:
+            if time.time() - os.path.getmtime(p) > self.max_age:
+                return None
+            with open(p, "rb") as fh:
+                return fh.read()
+        except Exception:
+            return None
+
+    def put(self, url: str, body: bytes) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self.path_for(url) + ".tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(body)
+            os.replace(tmp, self.path_for(url))
+        except Exception:
+            pass
+
+
+class DetailFetcher:
+    """Fetch and parse detail pages concurrently.
+
+    At most `max_workers` pages are in flight overall and at most `per_host`
+    against any single host, so the Rochester server is never hammered.
+    """
+
+    def __init__(self, max_workers: int = 8, per_host: int = 2, cache: Optional[DetailCache] = None, pool=None, timeout: float = 20):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.cache = cache if cache is not None else DetailCache()
+        self.pool = pool if pool is not None else default_pool()
+        self.timeout = timeout
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            sem = self._host_limits.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host)
+                self._host_limits[host] = sem
+            return sem
+
+    def fetch_one(self, url: str) -> Optional[dict]:
+        """Return parsed details for `url`, or None when unavailable."""
+        body = self.cache.get(url)
+        if body is None:
+            try:
+                with self._host_limit(url):
+                    resp = self.pool.get(url, timeout=self.timeout)
+            except Exception:
+                return None
+            if resp.status != 200:
+                return None
+            body = resp.body
+            self.cache.put(url, body)
+        try:
+            return parse_detail_html(body)
+        except Exception:
+            return None
+
+    def fetch_many(self, urls: Iterable[str], cancel: Optional[CancellationToken] = None) -> Dict[str, dict]:
+        """Fetch all distinct `urls` concurrently; failed pages are omitted.
+
+        Raises `OperationCancelled` as soon as `cancel` is cancelled,
+        without starting the remaining pages or waiting for those in flight.
+        """
+        unique = [u for u in dict.fromkeys(urls) if u]
+        if not unique:
+            return {}
+        ex = ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique)))
+        try:
+            futures = {ex.submit(self._fetch_unless_cancelled, url, cancel): url for url in unique}
+            pending = set(futures)
+            while pending:
+                check_cancelled(cancel)
+                _, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+            check_cancelled(cancel)
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
+        results: Dict[str, dict] = {}
+        for future, url in futures.items():
+            details = future.result()
+            if details is not None:
+                results[url] = details
+        return results
+
+    def _fetch_unless_cancelled(self, url: str, cancel: Optional[CancellationToken]) -> Optional[dict]:
+        if cancel is not None and cancel.cancelled:
+            return None
+        return self.fetch_one(url)
+
+
+def enrich_supernovas(supernovas: List, fetcher: DetailFetcher, cancel: Optional[CancellationToken] = None) -> List:
+    """Attach discoverer and recent magnitudes from the detail pages.
+
+    Entries without a link or whose page failed are left untouched. When
+    `cancel` is cancelled, `OperationCancelled` is raised and no entry is
+    changed.
+    """
+    if not supernovas:
+        return supernovas
+    details = fetcher.fetch_many((getattr(sn, "link", None) for sn in supernovas), cancel)
+    for sn in supernovas:
+        d = details.get(getattr(sn, "link", None))
+        if not d:
+            continue
+        sn.discoverer = d.get("discoverer")
+        sn.recentMagnitudes = list(d.get("recentMagnitudes") or [])
+    return supernovas
@@ -0,0 +1,108 @@
+"""Typed events from a search worker to the UI.
+
+A worker thread posts events to an `EventChannel` as the search advances:
+
+- `StageStarted(stage)`: "fetch", "select", "details", ...
+- `Progress(done, total)`: candidates whose visibility is known so far.
+- `PartialResult(supernova)`: an accepted result, before the final ranking.
+- `SearchFailed(message)`, `SearchCancelled()` or `SearchDone(results)`:
+  exactly one of them ends every run.
+
+`post` queues the event and wakes the consumer through the channel's
+`notify` callback, which the GUI sets to generate a Tk virtual event. The
+Tk loop then drains the channel at once, with no fixed polling delay. Events are plain picklable
+dataclasses, so the same types can travel through a
+`multiprocessing.Queue` from a worker process.
+"""
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+
+@dataclass(frozen=True)
+class SearchEvent:
+    """Base class of the worker -> UI events."""
+
+
+@dataclass(frozen=True)
+class StageStarted(SearchEvent):
+    stage: str
+
+
+@dataclass(frozen=True)
+class Progress(SearchEvent):
+    done: int
+    total: int
+
+
+@dataclass(frozen=True)
+class PartialResult(SearchEvent):
+    supernova: Any
+
+
+@dataclass(frozen=True)
+class SearchFailed(SearchEvent):
+    message: str
+
+
+@dataclass(frozen=True)
+class SearchCancelled(SearchEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class SearchDone(SearchEvent):
+    results: List[Any] = field(default_factory=list)
+
+
+FINAL_EVENTS = (SearchDone, SearchFailed, SearchCancelled)
+
+
+class EventChannel:
+    """Thread-safe FIFO of `SearchEvent`s with an optional wake-up callback.
+
+    `notify()` is called from the posting thread when an event arrives and
+    the consumer has not been woken since its last `drain`, so a burst of
+    events costs one wake-up. It must be thread-safe (e.g.
+    `widget.event_generate(..., when="tail")`); errors raised by it are
+    ignored and the consumer still finds the events on its next drain.
+    """
+
+    def __init__(self, notify: Optional[Callable[[], None]] = None):
+        self._queue: "queue.Queue[SearchEvent]" = queue.Queue()
+        self.notify = notify
+        self._lock = threading.Lock()
+        self._signalled = False
+
+    def post(self, event: SearchEvent) -> None:
+        self._queue.put(event)
+        with self._lock:
+            if self._signalled:
+                return
+            self._signalled = True
+        notify = self.notify
+        if notify is not None:
+            try:
+                notify()
+            except Exception:
+                pass
+
+    def drain(self, limit: Optional[int] = None) -> List[SearchEvent]:
+        """Return up to `limit` queued events (all of them when None).
+
+        A consumer stopping at `limit` must come back for the rest: events
+        already queued do not trigger another `notify`.
+        """
+        with self._lock:
+            self._signalled = False
+        events = []
+        try:
+            while limit is None or len(events) < limit:
+                events.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def empty(self) -> bool:
+        return self._queue.empty()
@@ -0,0 +1,514 @@
+"""Filter expressions compiled into vectorized catalog predicates.
+
+A filter is a short boolean expression over catalog fields, for example::
+
+    type contains Ia and host not empty
+    constellation in (UMa, Leo) or mag between 13 and 16
+    not (type = II) and date >= 2025-11-01
+
+`compile_filter` parses the text once and returns a `CompiledFilter` whose
+`mask(rows)` evaluates it over a whole `SupernovaCatalog` (or a list of
+`SupernovaDTO`-like rows) as numpy boolean arrays. Text tests run once per
+distinct value of an interned column and are then gathered by code, so the
+cost per entry is a few array operations.
+
+Grammar (keywords are case-insensitive)::
+
+    expr    := term ('or' term)*
+    term    := factor ('and' factor)*
+    factor  := 'not' factor | '(' expr ')' | test
+    test    := FIELD ('=' | '!=' | '<' | '<=' | '>' | '>=') VALUE
+             | FIELD ['not'] 'contains' VALUE
+             | FIELD ['not'] 'in' '(' VALUE (',' VALUE)* ')'
+             | FIELD ['not'] 'between' VALUE 'and' VALUE
+             | FIELD ['is'] ['not'] 'empty'
+
+Text comparisons ignore case. Constellations match either the full name or
+the IAU abbreviation. Entries with a missing value never satisfy a
+comparison, also when it is negated (`mag not between 13 and 16`,
+`not mag < 16`); use `empty` to test for them. `not` over a compound
+expression negates its result as is.
+"""
+import functools
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.catalog import InternedColumn, SupernovaCatalog, date_to_ordinal
+from app.utils.snparser import parse_date
+
+
+class FilterSyntaxError(ValueError):
+    """Raised for a filter expression that cannot be parsed."""
+
+    def __init__(self, message: str, position: Optional[int] = None):
+        super().__init__(message if position is None else f"{message} (at position {position + 1})")
+        self.position = position
+
+
+@dataclass(frozen=True)
+class _Field:
+    kind: str  # "number", "date" or "text"
+    source: str
+
+
+FIELDS: Dict[str, _Field] = {
+    "mag": _Field("number", "mag"),
+    "ra": _Field("number", "ra_deg"),
+    "dec": _Field("number", "dec_deg"),
+    "date": _Field("date", "date_obj"),
+    "discovered": _Field("date", "firstObserved_obj"),
+    "maxdate": _Field("date", "maxMagnitudeDate_obj"),
+    "name": _Field("text", "name"),
+    "type": _Field("text", "type"),
+    "host": _Field("text", "host"),
+    "constellation": _Field("text", "constellation"),
+}
+_ALIASES = {
+    "magnitude": "mag",
+    "decl": "dec",
+    "first_observed": "discovered",
+    "firstobserved": "discovered",
+    "max_date": "maxdate",
+    "const": "constellation",
+}
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<op><=|>=|!=|==|=|<|>)
+      | (?P<punct>[(),])
+      | "(?P<dq>[^"]*)"
+      | '(?P<sq>[^']*)'
+      | (?P<word>[^\s(),<>=!"']+)
+    )""",
+    re.VERBOSE,
+)
+_KEYWORDS = {"and", "or", "not", "in", "contains", "between", "is", "empty"}
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str  # "op", "punct", "str" (quoted), "word"
+    text: str
+    pos: int
+
+    def is_kw(self, *words: str) -> bool:
+        return self.kind == "word" and self.text.lower() in words
+
+
+def _tokenize(text: str) -> List[_Token]:
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        if text[pos:].strip() == "":
+            break
+        m = _TOKEN_RE.match(text, pos)
+        if m is None or m.end() == pos:
+            raise FilterSyntaxError(f"unexpected character {text[pos:].lstrip()[:1]!r}", pos)
+        start = m.start(m.lastgroup)
+        if m.lastgroup in ("dq", "sq"):
+            tokens.append(_Token("str", m.group(m.lastgroup), start))
+        else:
+            tokens.append(_Token(m.lastgroup, m.group(m.lastgroup), start))
+        pos = m.end()
+    return tokens
+
+
+# evaluation ---------------------------------------------------------------
+
+class _Columns:
+    """Lazily gathered columns of `rows` needed by a filter."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.catalog = rows if isinstance(rows, SupernovaCatalog) else None
+        self._cache: Dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def number(self, source: str) -> np.ndarray:
+        if source not in self._cache:
+            if self.catalog is not None:
+                values = getattr(self.catalog, source)
+            elif source == "mag":
+                values = np.array(
+                    [np.nan if r.mag is None else float(r.mag) for r in self.rows], dtype=np.float64
+                )
+            else:
+                ra, dec = self._degrees()
+                values = ra if source == "ra_deg" else dec
+            self._cache[source] = values
+        return self._cache[source]
+
+    def date(self, source: str) -> np.ndarray:
+        if source not in self._cache:
+            if self.catalog is not None:
+                values = self.catalog.ordinals(source)
+            else:
+                values = np.array(
+                    [date_to_ordinal(getattr(r, source, None)) for r in self.rows], dtype=np.int64
+                )
+            self._cache[source] = values
+        return self._cache[source]
+
+    def text(self, source: str) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """(codes, distinct values) of a text field."""
+        if source not in self._cache:
+            if source == "constellation":
+                values = self._constellations()
+            elif self.catalog is not None:
+                values = self.catalog.factorized(source)
+            else:
+                col = InternedColumn.from_values(getattr(r, source, None) for r in self.rows)
+                values = (col.codes, col.values)
+            self._cache[source] = values
+        return self._cache[source]
+
+    def _degrees(self) -> Tuple[np.ndarray, np.ndarray]:
+        if "_deg" not in self._cache:
+            ra = np.full(len(self.rows), np.nan)
+            dec = np.full(len(self.rows), np.nan)
+            for i, r in enumerate(self.rows):
+                coord = getattr(r, "coordinates", None)
+                if coord is not None:
+                    ra[i] = coord.ra.degree
+                    dec[i] = coord.dec.degree
+            self._cache["_deg"] = (ra, dec)
+        return self._cache["_deg"]
+
+    def _constellations(self) -> Tuple[np.ndarray, List[Optional[str]]]:
+        from app.services.constellations import default_grid
+
+        if self.catalog is not None:
+            ra, dec = self.catalog.ra_deg, self.catalog.dec_deg
+        else:
+            ra, dec = self._degrees()
+        known = ~(np.isnan(ra) | np.isnan(dec))
+        names = np.empty(len(ra), dtype=object)
+        if known.any():
+            names[known] = default_grid().lookup(ra[known], dec[known])
+        col = InternedColumn.from_values(names)
+        return col.codes, col.values
+
+
+Predicate = Callable[[_Columns], np.ndarray]
+
+
+@functools.lru_cache(maxsize=1)
+def _constellation_abbreviations() -> Dict[str, str]:
+    """IAU abbreviation (lower case) -> full name (lower case)."""
+    from astropy.utils import data
+
+    table = {}
+    text = data.get_pkg_data_contents("data/constellation_names.dat", package="astropy.coordinates")
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        abbrev, _, name = line.strip().partition(" ")
+        table[abbrev.lower()] = name.strip().lower()
+    return table
+
+
+def _text_key(field: str, value: str) -> str:
+    key = value.strip().lower()
+    if field == "constellation":
+        key = _constellation_abbreviations().get(key, key)
+    return key
+
+
+def _text_test(field: _Field, test: Callable[[str], bool]) -> Predicate:
+    """Run `test` once per distinct (lower-cased) value, then gather by code."""
+    name = field.source
+
+    def predicate(cols: _Columns) -> np.ndarray:
+        codes, values = cols.text(name)
+        table = np.fromiter(
+            (v is not None and test(v.lower()) for v in values), dtype=bool, count=len(values)
+        )
+        return table[codes] if len(values) else np.zeros(len(codes), dtype=bool)
+
+    return predicate
+
+
+def _empty_test(field: _Field) -> Predicate:
+    if field.kind == "number":
+        return lambda cols: np.isnan(cols.number(field.source))
+    if field.kind == "date":
+        return lambda cols: cols.date(field.source) <= 0
+    return _text_test_with_missing(field)
+
+
+def _present_test(field: _Field) -> Predicate:
+    """Entries that have a value for `field` (the complement of `empty`)."""
+    missing = _empty_test(field)
+    return lambda cols: ~missing(cols)
+
+
+def _text_test_with_missing(field: _Field) -> Predicate:
+    def predicate(cols: _Columns) -> np.ndarray:
+        codes, values = cols.text(field.source)
+        table = np.fromiter(
+            (v is None or not v.strip() for v in values), dtype=bool, count=len(values)
+        )
+        return table[codes] if len(values) else np.zeros(len(codes), dtype=bool)
+
+    return predicate
+
+
+_NUMERIC_OPS = {
+    "=": np.equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    # token helpers -------------------------------------------------------
+
+    def peek(self, offset: int = 0) -> Optional[_Token]:
+        j = self.i + offset
+        return self.tokens[j] if j < len(self.tokens) else None
+
+    def next(self, expected: str = "a value") -> _Token:
+        tok = self.peek()
+        if tok is None:
+            raise FilterSyntaxError(f"expected {expected} at end of filter", len(self.text))
+        self.i += 1
+        return tok
+
+    def accept_kw(self, *words: str) -> bool:
+        tok = self.peek()
+        if tok is not None and tok.is_kw(*words):
+            self.i += 1
+            return True
+        return False
+
+    def expect_punct(self, char: str) -> None:
+        tok = self.next(f"'{char}'")
+        if tok.kind != "punct" or tok.text != char:
+            raise FilterSyntaxError(f"expected '{char}', found {tok.text!r}", tok.pos)
+
+    # grammar -------------------------------------------------------------
+
+    def parse(self) -> Predicate:
+        if not self.tokens:
+            raise FilterSyntaxError("empty filter", 0)
+        pred = self.expr()
+        tok = self.peek()
+        if tok is not None:
+            raise FilterSyntaxError(f"unexpected {tok.text!r}", tok.pos)
+        return pred
+
+    def expr(self) -> Predicate:
+        parts = [self.term()]
+        while self.accept_kw("or"):
+            parts.append(self.term())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda cols: np.logical_or.reduce([p(cols) for p in parts])
+
+    def term(self) -> Predicate:
+        parts = [self.factor()]
+        while self.accept_kw("and"):
+            parts.append(self.factor())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda cols: np.logical_and.reduce([p(cols) for p in parts])
+
+    def factor(self) -> Predicate:
+        if self.accept_kw("not"):
+            inner = self.factor()
+            present = getattr(inner, "present", None)
+            if present is not None:
+                return lambda cols: ~inner(cols) & present(cols)
+            return lambda cols: ~inner(cols)
+        tok = self.peek()
+        if tok is not None and tok.kind == "punct" and tok.text == "(":
+            self.i += 1
+            inner = self.expr()
+            self.expect_punct(")")
+            return inner
+        return self.test()
+
+    def field(self) -> _Field:
+        tok = self.next("a field name")
+        name = tok.text.lower()
+        name = _ALIASES.get(name, name)
+        if tok.kind != "word" or name not in FIELDS:
+            known = ", ".join(sorted(FIELDS))
+            raise FilterSyntaxError(f"unknown field {tok.text!r} (known: {known})", tok.pos)
+        return FIELDS[name]
+
+    def value(self) -> _Token:
+        tok = self.next()
+        if tok.kind == "str" or (tok.kind == "word" and tok.text.lower() not in _KEYWORDS):
+            return tok
+        raise FilterSyntaxError(f"expected a value, found {tok.text!r}", tok.pos)
+
+    def number(self, field: _Field, tok: _Token) -> float:
+        if field.kind == "date":
+            try:
+                return float(date_to_ordinal(parse_date(tok.text)[0]))
+            except Exception:
+                raise FilterSyntaxError(f"invalid date {tok.text!r}", tok.pos) from None
+        try:
+            return float(tok.text)
+        except ValueError:
+            raise FilterSyntaxError(f"invalid number {tok.text!r}", tok.pos) from None
+
+    def test(self) -> Predicate:
+        field_tok = self.peek()
+        field = self.field()
+        negate = False
+
+        self.accept_kw("is")
+        if self.accept_kw("not"):
+            negate = True
+        tok = self.next("an operator")
+
+        if tok.is_kw("empty"):
+            pred = _empty_test(field)
+            if negate:
+                return lambda cols: ~pred(cols)
+            return pred
+        elif tok.is_kw("contains"):
+            pred = self.contains(field, field_tok)
+        elif tok.is_kw("in"):
+            pred = self.membership(field)
+        elif tok.is_kw("between"):
+            pred = self.between(field)
+        elif tok.kind == "op" and not negate:
+            pred = self.compare(field, tok.text)
+        else:
+            raise FilterSyntaxError(f"expected an operator, found {tok.text!r}", tok.pos)
+
+        present = _present_test(field)
+        if negate:
+            positive = pred
+            pred = lambda cols: ~positive(cols) & present(cols)
+        # read by `factor` so that `not <test>` does not match missing values either
+        pred.present = present
+        return pred
+
+    def compare(self, field: _Field, op: str) -> Predicate:
+        tok = self.value()
+        if field.kind == "text":
+            if op not in ("=", "==", "!="):
+                raise FilterSyntaxError(f"operator {op!r} needs a numeric or date field", tok.pos)
+            key = _text_key(field.source, tok.text)
+            if op == "!=":
+                return _text_test(field, lambda v: v != key)
+            return _text_test(field, lambda v: v == key)
+
+        value = self.number(field, tok)
+        ufunc = _NUMERIC_OPS[op]
+        if field.kind == "date":
+            # unknown dates (ordinal 0) never match
+            return lambda cols: (cols.date(field.source) > 0) & ufunc(cols.date(field.source), value)
+
+        def predicate(cols: _Columns) -> np.ndarray:
+            with np.errstate(invalid="ignore"):
+                return ufunc(cols.number(field.source), value)
+
+        if op == "!=":
+            # NaN != x is True in numpy, but a missing value never matches
+            return lambda cols: predicate(cols) & ~np.isnan(cols.number(field.source))
+        return predicate
+
+    def contains(self, field: _Field, field_tok: _Token) -> Predicate:
+        tok = self.value()
+        if field.kind != "text":
+            raise FilterSyntaxError("'contains' needs a text field", field_tok.pos)
+        needle = tok.text.strip().lower()
+        return _text_test(field, lambda v: needle in v)
+
+    def membership(self, field: _Field) -> Predicate:
+        self.expect_punct("(")
+        items = [self.value()]
+        while True:
+            tok = self.next("',' or ')'")
+            if tok.kind == "punct" and tok.text == ")":
+                break
+            if tok.kind != "punct" or tok.text != ",":
+                raise FilterSyntaxError(f"expected ',' or ')', found {tok.text!r}", tok.pos)
+            items.append(self.value())
+
+        if field.kind == "text":
+            keys = frozenset(_text_key(field.source, t.text) for t in items)
+            return _text_test(field, lambda v: v in keys)
+
+        values = np.array([self.number(field, t) for t in items])
+        if field.kind == "date":
+            return lambda cols: np.isin(cols.date(field.source), values)
+        return lambda cols: np.isin(cols.number(field.source), values)
+
+    def between(self, field: _Field) -> Predicate:
+        low_tok = self.value()
+        if not self.accept_kw("and"):
+            tok = self.peek()
+            raise FilterSyntaxError("expected 'and' after 'between'", tok.pos if tok else len(self.text))
+        high_tok = self.value()
+        if field.kind == "text":
+            raise FilterSyntaxError("'between' needs a numeric or date field", low_tok.pos)
+        low, high = sorted((self.number(field, low_tok), self.number(field, high_tok)))
+        if field.kind == "date":
+            return lambda cols: (cols.date(field.source) >= low) & (cols.date(field.source) <= high)
+
+        def predicate(cols: _Columns) -> np.ndarray:
+            values = cols.number(field.source)
+            with np.errstate(invalid="ignore"):
+                return (values >= low) & (values <= high)
+
+        return predicate
+
+
+class CompiledFilter:
+    """A parsed filter expression; see the module docstring."""
+
+    def __init__(self, text: str):
+        self.text = text.strip()
+        self._predicate = _Parser(self.text).parse()
+
+    def mask(self, rows: Sequence) -> np.ndarray:
+        """Boolean array: True for each row of `rows` matching the filter."""
+        if len(rows) == 0:
+            return np.zeros(0, dtype=bool)
+        return np.asarray(self._predicate(_Columns(rows)), dtype=bool)
+
+    def filter(self, rows: Sequence) -> list:
+        """Return the rows matching the filter, in order."""
+        keep = self.mask(rows)
+        return [rows[int(i)] for i in np.flatnonzero(keep)]
+
+    def __repr__(self) -> str:
+        return f"CompiledFilter({self.text!r})"
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_cached(text: str) -> CompiledFilter:
+    return CompiledFilter(text)
+
+
+def compile_filter(text) -> Optional[CompiledFilter]:
+    """Compile `text` (None or blank gives None; compiled filters pass through).
+
+    Raises `FilterSyntaxError` for an invalid expression.
+    """
+    if text is None or isinstance(text, CompiledFilter):
+        return text
+    text = str(text).strip()
+    if not text:
+        return None
+    return _compile_cached(text)
@@ -0,0 +1,296 @@
+"""Small HTTP client used by the network providers.
+
+Features over a plain `urllib.request.urlopen` call:
+- negotiates gzip/deflate and decompresses incrementally while streaming
+- keeps connections alive and reuses them (and a single SSL context) across
+  repeated requests to the same host within the session
+
+Like `urlopen`, it honours the `HTTP_PROXY`/`HTTPS_PROXY`/`NO_PROXY`
+settings (`urllib.request.getproxies`): https goes through a CONNECT
+tunnel, plain http sends absolute URLs to the proxy, and credentials in
+the proxy URL are sent as Basic `Proxy-Authorization`.
+"""
+import base64
+import http.client
+import ssl
+import threading
+import urllib.parse
+import urllib.request
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.services.cancel import check_cancelled
+
+ACCEPT_ENCODING = "gzip, deflate"
+USER_AGENT = "getsupernovae"
+CHUNK_SIZE = 64 * 1024
+
+_ssl_context: Optional[ssl.SSLContext] = None
+_ssl_lock = threading.Lock()
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the process-wide SSL context (created once).
+
+    Certificate verification stays relaxed as in the original downloader;
+    some mirrors serve incomplete chains.
+    """
+    global _ssl_context
+    with _ssl_lock:
+        if _ssl_context is None:
+            ctx = ssl.create_default_context()
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            _ssl_context = ctx
+        return _ssl_context
+
+
+def proxy_for(scheme: str, host: str) -> Optional[urllib.parse.SplitResult]:
+    """Return the proxy configured for `scheme://host`, or None to connect directly."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    return urllib.parse.urlsplit(proxy)
+
+
+def _proxy_auth_headers(proxy: urllib.parse.SplitResult) -> Dict[str, str]:
+    if proxy.username is None:
+        return {}
+    credentials = "%s:%s" % (
+        urllib.parse.unquote(proxy.username), urllib.parse.unquote(proxy.password or "")
+    )
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")}
+
+
+class _ForwardProxyConnection(http.client.HTTPConnection):
+    """Plain http through a proxy: requests carry the absolute URL and the proxy credentials."""
+
+    def __init__(self, proxy_host, proxy_port, timeout, proxy_headers):
+        super().__init__(proxy_host, proxy_port, timeout=timeout)
+        self.proxy_headers = proxy_headers
+
+
+@dataclass
+class FetchResult:
+    """Decoded response body plus the metadata callers may need."""
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    # bytes received on the wire (before decompression)
+    wire_bytes: int = 0
+    content_encoding: Optional[str] = None
+
+
+class _Decoder:
+    """Incremental decoder for a `Content-Encoding` value."""
+
+    def __init__(self, encoding: Optional[str]):
+        self.encoding = (encoding or "identity").strip().lower()
+        self._obj = None
+        if self.encoding in ("gzip", "x-gzip"):
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            # "deflate" is supposed to be zlib-wrapped but some servers send
+            # raw deflate streams; decide on the first chunk
+            self._obj = zlib.decompressobj(zlib.MAX_WBITS)
+            self._first = True
+
+    def decode(self, chunk: bytes) -> bytes:
+        if self._obj is None:
+            return chunk
+        if self.encoding == "deflate" and self._first:
+            self._first = False
+            try:
+                return self._obj.decompress(chunk)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        if self._obj is None:
+            return b""
+        return self._obj.flush()
+
+
+class HTTPConnectionPool:
+    """Keep-alive connection pool keyed by (scheme, host, port).
+
+    Connections are checked out for the duration of a request, so the pool
+    can be shared by several threads; idle connections are kept up to
+    `max_idle_per_host`.
+    """
+
+    def __init__(self, timeout: float = 20, max_idle_per_host: int = 4):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        # number of connections opened so far (useful for diagnostics/tests)
+        self.connections_opened = 0
+
+    def _key(self, parts: urllib.parse.SplitResult) -> Tuple[str, str, int]:
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        return scheme, parts.hostname or "", port
+
+    def _checkout(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+
+        scheme, host, port = key
+        proxy = proxy_for(scheme, host)
+        if proxy is not None:
+            proxy_port = proxy.port or (443 if proxy.scheme == "https" else 80)
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    proxy.hostname, proxy_port, timeout=timeout, context=get_ssl_context()
+                )
+                conn.set_tunnel(host, port, headers=_proxy_auth_headers(proxy))
+            else:
+                conn = _ForwardProxyConnection(proxy.hostname, proxy_port, timeout, _proxy_auth_headers(proxy))
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=get_ssl_context())
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self.connections_opened += 1
+        return conn, False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        cancel=None,
+    ) -> FetchResult:
+        """GET `url`, decompressing the body while it streams in.
+
+        Redirects are followed (up to 5). A request on a reused connection
+        that the server already closed is retried once on a new connection.
+        `cancel` (a `CancellationToken`) is checked between body chunks; a
+        cancelled download closes its connection.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        for _ in range(5):
+            check_cancelled(cancel)
+            result, location = self._get_once(url, headers, timeout, cancel)
+            if location is None:
+                return result
+            url = urllib.parse.urljoin(url, location)
+        raise http.client.HTTPException(f"too many redirects fetching {url}")
+
+    def _get_once(self, url, headers, timeout, cancel=None):
+        parts = urllib.parse.urlsplit(url)
+        key = self._key(parts)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        req_headers = {
+            "Host": parts.netloc,
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "User-Agent": USER_AGENT,
+            "Connection": "keep-alive",
+        }
+        if headers:
+            req_headers.update(headers)
+
+        def send(conn):
+            if isinstance(conn, _ForwardProxyConnection):
+                target = urllib.parse.urlunsplit(parts._replace(fragment=""))
+                conn.request("GET", target, headers=dict(req_headers, **conn.proxy_headers))
+            else:
+                conn.request("GET", path, headers=req_headers)
+            return conn.getresponse()
+
+        conn, reused = self._checkout(key, timeout)
+        try:
+            try:
+                resp = send(conn)
+            except (http.client.RemoteDisconnected, ConnectionError, BrokenPipeError):
+                if not reused:
+                    raise
+                # stale keep-alive connection: retry once on a fresh one
+                conn.close()
+                conn, reused = self._checkout_new(key, timeout)
+                resp = send(conn)
+
+            result = self._read(resp, cancel)
+        except Exception:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+
+        if resp.status in (301, 302, 303, 307, 308) and result.headers.get("location"):
+            return result, result.headers["location"]
+        return result, None
+
+    def _checkout_new(self, key, timeout):
+        with self._lock:
+            self._idle.pop(key, None)
+        return self._checkout(key, timeout)
+
+    def _read(self, resp: http.client.HTTPResponse, cancel=None) -> FetchResult:
+        headers = {k.lower(): v for k, v in resp.getheaders()}
+        encoding = headers.get("content-encoding")
+        decoder = _Decoder(encoding)
+        chunks = []
+        wire = 0
+        while True:
+            check_cancelled(cancel)
+            chunk = resp.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            wire += len(chunk)
+            out = decoder.decode(chunk)
+            if out:
+                chunks.append(out)
+        tail = decoder.flush()
+        if tail:
+            chunks.append(tail)
+        return FetchResult(resp.status, b"".join(chunks), headers, wire, encoding)
+
+
+_default_pool: Optional[HTTPConnectionPool] = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> HTTPConnectionPool:
+    """Return the session-wide connection pool shared by the providers."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = HTTPConnectionPool()
+        return _default_pool
@@ -0,0 +1,165 @@
+"""Ignore list of supernovae that should not be reported again.
+
+The list lives in `old_supernovae.txt` (one entry per line, `#` comments).
+`IgnoreList` keeps it as a set of normalised names ('SN 2025abc' and
+'AT2025abc' are the same entry), so membership is a hash lookup. Entries
+containing `*`, `?` or `[` are wildcard rules: plain prefixes such as
+`2025*` become one `str.startswith` check, other globs are compiled into a
+single regular expression.
+
+The file is re-read only when its mtime or size changes, and `add` appends
+a line instead of rewriting the file. `version` changes whenever the
+content does, so callers can use it in cache keys.
+"""
+import fnmatch
+import os
+import re
+import threading
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from app.config.snconfig import get_user_config_dir
+from app.services.composite import normalize_name
+
+IGNORE_FILE = "old_supernovae.txt"
+_WILDCARD_CHARS = set("*?[")
+
+
+def _is_rule(entry: str) -> bool:
+    return any(c in _WILDCARD_CHARS for c in entry)
+
+
+class IgnoreList:
+    """Hash-indexed ignore list backed by a text file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_user_config_dir(), IGNORE_FILE)
+        self.version = 0
+        self._lock = threading.RLock()
+        self._entries: List[str] = []
+        self._names = set()
+        self._prefixes = ()
+        self._pattern = None
+        self._stat = None
+        self.reload_if_changed()
+
+    # loading -----------------------------------------------------------
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """Re-read the file if it changed on disk; returns True if reloaded."""
+        stat = self._file_stat()
+        with self._lock:
+            if stat == self._stat:
+                return False
+            entries = []
+            if stat is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as fh:
+                        entries = [l.strip() for l in fh if l.strip() and not l.strip().startswith("#")]
+                except OSError:
+                    entries = []
+            self._set_entries(entries)
+            self._stat = stat
+            return True
+
+    def _set_entries(self, entries: List[str]) -> None:
+        self._entries = list(entries)
+        names = set()
+        prefixes = []
+        globs = []
+        for entry in self._entries:
+            if not _is_rule(entry):
+                names.add(normalize_name(entry))
+                continue
+            rule = normalize_name(entry)
+            head = rule[:-1]
+            if rule.endswith("*") and head and not _is_rule(head):
+                prefixes.append(head)
+            else:
+                globs.append(fnmatch.translate(rule))
+        self._names = names
+        self._prefixes = tuple(prefixes)
+        self._pattern = re.compile("|".join(globs)) if globs else None
+        self.version += 1
+
+    # queries -----------------------------------------------------------
+
+    def _match_normalized(self, key: str) -> bool:
+        if key in self._names:
+            return True
+        if self._prefixes and key.startswith(self._prefixes):
+            return True
+        return self._pattern is not None and self._pattern.match(key) is not None
+
+    def __contains__(self, name) -> bool:
+        self.reload_if_changed()
+        with self._lock:
+            return self._match_normalized(normalize_name(str(name)))
+
+    def mask(self, names: Iterable[str]) -> np.ndarray:
+        """Boolean array: True for each of `names` that is ignored."""
+        self.reload_if_changed()
+        with self._lock:
+            match = self._match_normalized
+            return np.fromiter((match(normalize_name(str(n))) for n in names), dtype=bool)
+
+    def __iter__(self):
+        self.reload_if_changed()
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        self.reload_if_changed()
+        return len(self._entries)
+
+    # updates -----------------------------------------------------------
+
+    def add(self, name: str) -> bool:
+        """Append `name` (or a wildcard rule) to the file.
+
+        Returns False when the name is already ignored.
+        """
+        name = name.strip()
+        if not name:
+            return False
+        with self._lock:
+            self.reload_if_changed()
+            if not _is_rule(name) and name in self:
+                return False
+            if name in self._entries:
+                return False
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            needs_newline = False
+            try:
+                with open(self.path, "rb") as fh:
+                    fh.seek(-1, os.SEEK_END)
+                    needs_newline = fh.read(1) != b"\n"
+            except OSError:
+                pass
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(("\n" if needs_newline else "") + name + "\n")
+
+            self._set_entries(self._entries + [name])
+            self._stat = self._file_stat()
+            return True
+
+    def replace(self, entries: Iterable[str]) -> None:
+        """Rewrite the whole file with `entries` (deduplicated, sorted)."""
+        lines = [e.strip() for e in entries if e.strip() and not e.strip().startswith("#")]
+        unique_sorted = sorted(set(lines), key=lambda s: s.lower())
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as fh:
+                for line in unique_sorted:
+                    fh.write(line + "\n")
+            self._set_entries(unique_sorted)
+            self._stat = self._file_stat()
@@ -0,0 +1,82 @@
+"""Array pre-filter applied before the visibility computation.
+
+Visibility needs an AltAz transform per entry, so everything that can be
+decided from the catalog columns alone is done first, as numpy masks over
+the whole catalog:
+
+- magnitude threshold (entries without a magnitude are dropped)
+- limit magnitudes: '>m' means fainter than m, so it only passes when
+  m is strictly brighter than the threshold
+- discovery date window (entries without a parsed date are dropped)
+- ignore list
+- an optional compiled filter expression (see services.filter_expr)
+
+Works on a `SupernovaCatalog` (columns used directly) or on any list of
+`SupernovaDTO`-like rows (columns gathered once).
+"""
+from datetime import date
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.models.catalog import SupernovaCatalog, date_to_ordinal
+
+
+def _columns(rows):
+    if isinstance(rows, SupernovaCatalog):
+        return rows.mag, rows.ordinals("date_obj"), rows.column("mag_limit"), rows.names
+    mag = np.array([np.nan if r.mag is None else float(r.mag) for r in rows], dtype=np.float64)
+    ordinals = np.array(
+        [date_to_ordinal(r.date_obj) if r.date is not None else 0 for r in rows], dtype=np.int64
+    )
+    limits = np.array([getattr(r, "mag_limit", None) or "" for r in rows], dtype=object)
+    names = [r.name for r in rows]
+    return mag, ordinals, limits, names
+
+
+def ignore_mask(names, ignore) -> np.ndarray:
+    """True for each name matched by `ignore` (an IgnoreList or a collection)."""
+    if ignore is None:
+        return np.zeros(len(names), dtype=bool)
+    mask = getattr(ignore, "mask", None)
+    if mask is not None:
+        return np.asarray(mask(names), dtype=bool)
+    ignored = ignore if isinstance(ignore, (set, frozenset)) else set(ignore)
+    return np.fromiter((str(n) in ignored for n in names), dtype=bool, count=len(names))
+
+
+def prefilter_mask(
+    rows: Sequence,
+    max_mag: float,
+    from_date: Optional[date] = None,
+    ignore=None,
+    where=None,
+) -> np.ndarray:
+    """Boolean mask of the rows that may be selected (before visibility).
+
+    `where` is a `CompiledFilter` (or anything with a `mask(rows)` method).
+    """
+    mag, ordinals, limits, names = _columns(rows)
+    max_mag = float(max_mag)
+
+    with np.errstate(invalid="ignore"):
+        keep = mag <= max_mag
+        fainter_limit = limits == ">"
+        keep &= ~(fainter_limit & (mag >= max_mag))
+
+    keep &= ordinals > 0
+    if from_date is not None:
+        keep &= ordinals > date_to_ordinal(from_date)
+    if ignore is not None and keep.any():
+        keep &= ~ignore_mask(names, ignore)
+    if where is not None and keep.any():
+        keep &= where.mask(rows)
+    return keep
+
+
+def prefilter(
+    rows: Sequence, max_mag: float, from_date: Optional[date] = None, ignore=None, where=None
+) -> list:
+    """Return the rows surviving `prefilter_mask`, in catalog order."""
+    keep = prefilter_mask(rows, max_mag, from_date, ignore, where)
+    return [rows[int(i)] for i in np.flatnonzero(keep)]
@@ -1,9 +1,20 @@
-from typing import List, Protocol, Iterable
-import urllib.request
+from typing import List, Protocol
+import csv
+import io
+import threading
+import urllib.error
 from bs4 import BeautifulSoup
+from astropy.coordinates import SkyCoord
+import astropy.units as u
 
 from app.models.dto import SupernovaDTO
-from app.utils.snparser import _parse_row_safe
+from app.models.catalog import SupernovaRow
+from app.utils.snparser import _extract_row_fields, _parse_row_fields, row_signature, parse_date, parse_magnitude
+from app.services.snapshot import CatalogSnapshotStore
+from app.services.delta import diff_catalogs, index_by_name
+from app.services.httpclient import default_pool
+from app.services.cancel import check_cancelled
+from app.services.timing import timed
 
 
 class ISupernovaProvider(Protocol):
@@ -13,18 +24,83 @@ class ISupernovaProvider(Protocol):
 class RochesterProvider:
     """Abstract base class for Rochester providers."""
 
+    # optional CatalogSnapshotStore used to skip parsing unchanged pages
+    snapshot_store = None
+    # catalog from the previous fetch (set by the caller). Rows whose raw
+    # content is unchanged reuse the previous DTO instead of being re-parsed,
+    # and `last_delta` reports added/changed/removed names.
+    previous = None
+    last_delta = None
+    # BeautifulSoup tree builder ("html.parser" or "lxml" when installed)
+    html_parser = "html.parser"
+    # optional CancellationToken (set by the caller), checked while
+    # downloading and every few rows while parsing
+    cancel = None
+    # optional PipelineTimer recording the "fetch" and "parse" stages
+    timer = None
+
     def parse_html(self, html: bytes | str) -> List[SupernovaDTO]:
+        with timed(self.timer, "parse") as stage:
+            result = self._load_or_parse(html)
+            stage.count = len(result)
+        if self.previous is not None:
+            self.last_delta = diff_catalogs(self.previous, result)
+        else:
+            self.last_delta = None
+        return result
+
+    def _load_or_parse(self, html: bytes | str) -> List[SupernovaDTO]:
+        store = self.snapshot_store
+        key = None
+        if store is not None:
+            try:
+                key = store.key_for(html)
+                cached = store.load(key)
+                if cached is not None:
+                    return cached
+            except Exception:
+                key = None
+
+        result = self._parse_html_rows(html)
+
+        if store is not None and key is not None:
+            try:
+                store.save(key, result)
+            except Exception:
+                # a failed cache write must never break a fetch
+                pass
+
+        return result
+
+    def _parse_html_rows(self, html: bytes | str) -> List[SupernovaDTO]:
         if isinstance(html, bytes):
             try:
                 html = html.decode("utf-8")
             except Exception:
                 html = html.decode(errors="replace")
 
-        soup = BeautifulSoup(html, "html.parser")
+        check_cancelled(self.cancel)
+        soup = BeautifulSoup(html, self.html_parser)
         rows = soup.find_all("tr")
+        previous = index_by_name(self.previous or [])
         result: List[SupernovaDTO] = []
-        for row in rows:
-            parsed = _parse_row_safe(row)
+        for i, row in enumerate(rows):
+            if i % 64 == 0:
+                check_cancelled(self.cancel)
+            fields = _extract_row_fields(row)
+            if not fields:
+                continue
+
+            row_hash = row_signature(fields)
+            old = previous.get(fields["name"])
+            if old is not None and old.row_hash == row_hash:
+                # unchanged row: skip date/magnitude/coordinate parsing
+                if isinstance(old, SupernovaRow):
+                    old = old.to_dto()
+                result.append(old)
+                continue
+
+            parsed = _parse_row_fields(fields)
             if not parsed:
                 continue
 
@@ -44,7 +120,9 @@ class RochesterProvider:
                 parsed.get("type"),
                 parsed.get("maxMagnitudeDate_obj"),
                 parsed.get("firstObserved_obj"),
-            )            
+                row_hash,
+                parsed.get("mag_limit"),
+            )
             result.append(sn)
 
         return result
@@ -58,52 +136,192 @@ class FileRochesterProvider(RochesterProvider):
     - parse_html(html): parse and return list of Supernova
     """
 
-    def __init__(self, source: str, timeout: int = 20):
+    def __init__(self, source: str, timeout: int = 20, snapshot_store=None):
         self.timeout = timeout
         self.source = source
+        self.snapshot_store = snapshot_store
 
     def fetch(self) -> List[SupernovaDTO]:
         # support local file paths and URLs
-        try:
+        with timed(self.timer, "fetch"):
             with open(self.source, "rb") as fh:
                 html = fh.read()
-        except Exception:
-            # propagate error to caller
-            raise
 
         return self.parse_html(html)
 
 
 
+class CsvSupernovaProvider:
+    """Read a local candidate list exported as CSV.
+
+    The first row must be a header. Recognised columns (case-insensitive):
+    name, ra, dec/decl, mag, date, host, type, link. RA/Dec may be
+    sexagesimal (hours/degrees) or decimal degrees. Rows without a name or
+    valid coordinates are skipped.
+    """
+
+    def __init__(self, source: str, timeout: int = 20, delimiter: str = None):
+        self.timeout = timeout
+        self.source = source
+        self.delimiter = delimiter
+
+    def fetch(self) -> List[SupernovaDTO]:
+        with open(self.source, "r", encoding="utf-8", newline="") as fh:
+            text = fh.read()
+        return self.parse_csv(text)
+
+    def parse_csv(self, text: str) -> List[SupernovaDTO]:
+        try:
+            dialect = csv.Sniffer().sniff(text[:4096], delimiters=self.delimiter or ",;\t")
+        except Exception:
+            dialect = csv.excel
+        reader = csv.DictReader(io.StringIO(text), dialect=dialect)
+        result: List[SupernovaDTO] = []
+        for raw in reader:
+            row = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()}
+            sn = self._row_to_dto(row)
+            if sn is not None:
+                result.append(sn)
+        return result
+
+    def _row_to_dto(self, row: dict):
+        name = row.get("name", "")
+        ra = row.get("ra", "")
+        dec = row.get("dec", "") or row.get("decl", "")
+        if not name or not ra or not dec:
+            return None
+
+        try:
+            try:
+                coord = SkyCoord(float(ra), float(dec), frame="icrs", unit=(u.deg, u.deg))
+            except ValueError:
+                coord = SkyCoord(ra, dec, frame="icrs", unit=(u.hourangle, u.deg))
+        except Exception:
+            return None
+
+        mag, mag_limit = parse_magnitude(row.get("mag", ""))
+        date_obj, date_text = parse_date(row.get("date", ""))
+        return SupernovaDTO(
+            name,
+            date_text,
+            date_obj,
+            mag,
+            row.get("host") or None,
+            ra,
+            dec,
+            row.get("link", ""),
+            coord,
+            type=row.get("type") or None,
+            mag_limit=mag_limit,
+        )
+
+
+class ConditionalCache:
+    """Validators and parsed catalog of the last full response per URL.
+
+    Lets later fetches send `If-None-Match` / `If-Modified-Since` and reuse
+    the parsed catalog when the server answers 304 Not Modified. Shared by
+    every provider instance of the session (see `default_conditional_cache`).
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def request_headers(self, url: str) -> dict:
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        etag, last_modified, _result = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def result(self, url: str):
+        with self._lock:
+            entry = self._entries.get(url)
+        return entry[2] if entry is not None else None
+
+    def store(self, url: str, headers: dict, result) -> None:
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        with self._lock:
+            if etag or last_modified:
+                self._entries[url] = (etag, last_modified, result)
+            else:
+                self._entries.pop(url, None)
+
+
+_default_conditional_cache = ConditionalCache()
+
+
+def default_conditional_cache() -> ConditionalCache:
+    return _default_conditional_cache
+
+
 class NetworkRochesterProvider(RochesterProvider):
     """Network adapter that fetches Rochester HTML and returns parsed Supernovas
     and raw HTML rows. It uses `RochesterProvider.parse_html` to parse content.
+
+    Requests negotiate gzip/deflate and go through a keep-alive connection
+    pool shared for the whole session, so repeated fetches reuse the TCP/TLS
+    connection and the SSL context. Repeated fetches are conditional: when
+    the page is unchanged the server answers 304 and the catalog parsed
+    last time is returned.
     """
 
-    def __init__(self, timeout: int = 20):
+    def __init__(
+        self,
+        timeout: int = 20,
+        snapshot_store=None,
+        source: str = None,
+        pool=None,
+        archive=None,
+        conditional=None,
+    ):
         self.timeout = timeout
-        self.source = "https://www.rochesterastronomy.org/snimages/snactive.html"
-    
+        self.source = source or "https://www.rochesterastronomy.org/snimages/snactive.html"
+        # the live page is fetched on every start/refresh: reuse parsed
+        # snapshots from the user cache unless a store is injected
+        self.snapshot_store = snapshot_store if snapshot_store is not None else CatalogSnapshotStore()
+        self.pool = pool if pool is not None else default_pool()
+        self.last_response = None
+        # optional replay.SnapshotArchive keeping every fetched page
+        self.archive = archive
+        # ETag/Last-Modified and catalog of earlier fetches (session-wide)
+        self.conditional = conditional if conditional is not None else default_conditional_cache()
+        # True when the last fetch was answered with 304 Not Modified
+        self.not_modified = False
 
     def fetch(self):
-        """Fetch from `Rochester source` Returns (parsed_list, rows).
+        """Fetch from `Rochester source` and return the parsed List[SupernovaDTO]."""
+        headers = self.conditional.request_headers(self.source)
+        with timed(self.timer, "fetch"):
+            resp = self.pool.get(self.source, headers=headers, timeout=self.timeout, cancel=self.cancel)
+        self.last_response = resp
+        self.not_modified = False
 
-        parsed_list: List[Supernova]
-        rows: ResultSet of <tr> elements (BeautifulSoup list)
-        """
-        import ssl
-        source = self.source
-        try:
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            with urllib.request.urlopen(source, context=ctx, timeout=self.timeout) as resp:
-                html = resp.read()
-            
-        except Exception:
-            raise
+        if resp.status == 304:
+            cached = self.conditional.result(self.source)
+            if cached is not None:
+                self.not_modified = True
+                self.last_delta = diff_catalogs(self.previous, cached) if self.previous is not None else None
+                return cached
+        if resp.status != 200:
+            raise urllib.error.HTTPError(self.source, resp.status, f"HTTP {resp.status}", resp.headers, None)
 
-        # parse using RochesterProvider
-        return self.parse_html(html)
-        
+        if self.archive is not None:
+            try:
+                self.archive.add(resp.body)
+            except Exception:
+                # archiving is best-effort
+                pass
 
+        # parse using RochesterProvider
+        result = self.parse_html(resp.body)
+        self.conditional.store(self.source, resp.headers, result)
+        return result
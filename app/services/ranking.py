@@ -0,0 +1,92 @@
+"""Ordering and top-K selection of search results.
+
+Results used to be sorted twice by comparing astropy `Time` objects. Here
+every result gets a tuple of plain floats as sort key (computed once), and
+`top_k` keeps only the best K with a bounded heap (`heapq.nsmallest`),
+which is O(n log K) instead of sorting everything when only the first
+screen of results is wanted.
+
+Orders (best first):
+
+- ``start``: earliest start of visibility, then earliest end (the
+  historical order of the results).
+- ``altitude``: highest peak altitude during the window.
+- ``magnitude``: brightest first.
+- ``score``: ``peak altitude / 10 + visible hours - magnitude``, i.e. high,
+  long-visible and bright targets first.
+
+Ties keep the input order.
+"""
+import heapq
+from typing import Callable, Iterable, List, Optional, Tuple
+
+ORDERS = ("start", "altitude", "magnitude", "score")
+DEFAULT_ORDER = "start"
+
+_INF = float("inf")
+
+
+def _window(sn) -> Tuple[float, float]:
+    """(start, end) of the visible samples as MJD floats."""
+    try:
+        cords = sn.visibility.azCords
+        return float(cords[0].time.mjd), float(cords[-1].time.mjd)
+    except Exception:
+        return _INF, _INF
+
+
+def peak_altitude(sn) -> float:
+    """Highest sampled altitude in degrees (-inf when unknown)."""
+    visibility = getattr(sn, "visibility", None)
+    peak = getattr(visibility, "maxAlt", None)
+    if peak is not None:
+        return float(peak)
+    best = -_INF
+    for c in getattr(visibility, "azCords", None) or []:
+        try:
+            best = max(best, float(c.coord.alt.degree))
+        except Exception:
+            continue
+    return best
+
+
+def magnitude(sn) -> float:
+    try:
+        return float(sn.mag)
+    except (TypeError, ValueError):
+        return _INF
+
+
+def score(sn) -> float:
+    start, end = _window(sn)
+    hours = 0.0 if start == _INF else (end - start) * 24.0
+    peak = peak_altitude(sn)
+    mag = magnitude(sn)
+    if peak == -_INF or mag == _INF:
+        return -_INF
+    return peak / 10.0 + hours - mag
+
+
+def sort_key(order: str = DEFAULT_ORDER) -> Callable[[object], tuple]:
+    """Return a key function mapping a result to a tuple of floats (ascending = better)."""
+    if order not in ORDERS:
+        raise ValueError(f"unknown order {order!r}; expected one of {', '.join(ORDERS)}")
+    if order == "start":
+        return _window
+    if order == "altitude":
+        return lambda sn: (-peak_altitude(sn),) + _window(sn)
+    if order == "magnitude":
+        return lambda sn: (magnitude(sn),) + _window(sn)
+    return lambda sn: (-score(sn),) + _window(sn)
+
+
+def top_k(results: Iterable, k: Optional[int] = None, order: str = DEFAULT_ORDER) -> List:
+    """Return the best `k` results by `order`, best first (all when `k` is None)."""
+    key = sort_key(order)
+    # decorate once so every key is computed a single time
+    decorated = [(key(sn), i, sn) for i, sn in enumerate(results)]
+    if k is None or k >= len(decorated):
+        decorated.sort(key=lambda item: item[:2])
+    else:
+        decorated = heapq.nsmallest(max(0, int(k)), decorated, key=lambda item: item[:2])
+    return [sn for _key, _i, sn in decorated]
@@ -0,0 +1,144 @@
+"""Background refresh of the Rochester catalog.
+
+`CatalogRefresher` fetches and parses the list on a fixed schedule in a
+daemon thread and keeps the latest catalog in memory as a
+`SupernovaCatalog`. Interactive searches can then go straight to
+filtering. Network providers send conditional requests (see
+`provider.ConditionalCache`), so an unchanged page costs one 304 round-trip.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from app.i18n import _
+from app.models.catalog import SupernovaCatalog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 30 * 60
+
+
+class CatalogRefresher:
+    """Keep a warm catalog refreshed every `interval` seconds.
+
+    `on_update(catalog)` is called from the worker thread after each
+    successful refresh that produced a new catalog.
+    """
+
+    def __init__(
+        self,
+        provider_factory,
+        interval: float = DEFAULT_INTERVAL,
+        on_update: Optional[Callable[[SupernovaCatalog], None]] = None,
+        timeout: int = 20,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.provider_factory = provider_factory
+        self.interval = interval
+        self.on_update = on_update
+        self.timeout = timeout
+        self.clock = clock
+        self.error: Optional[str] = None
+        self._catalog: Optional[SupernovaCatalog] = None
+        self._source = None
+        # time of the last successful check and of the last content change
+        self._checked_at: Optional[float] = None
+        self._changed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def refresh_now(self) -> None:
+        """Ask the worker to refresh without waiting for the schedule."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def refresh(self) -> Optional[SupernovaCatalog]:
+        """Fetch once (in the calling thread) and return the catalog."""
+        try:
+            try:
+                provider = self.provider_factory(timeout=self.timeout)
+            except TypeError:
+                provider = self.provider_factory()
+            with self._lock:
+                previous = self._catalog
+            if previous is not None and hasattr(provider, "previous"):
+                provider.previous = previous
+            result = provider.fetch()
+        except Exception as ex:
+            logger.warning("background catalog refresh failed: %s", ex)
+            self.error = str(ex)
+            return None
+
+        self.error = None
+        return self.offer(result, source=result)
+
+    def offer(self, rows, source=None) -> SupernovaCatalog:
+        """Install `rows` fetched elsewhere (e.g. by a foreground search).
+
+        `source` identifies the provider result; offering the same object
+        again (a 304 answer returns the cached list) only marks the catalog
+        as checked.
+        """
+        now = self.clock()
+        with self._lock:
+            if source is not None and source is self._source and self._catalog is not None:
+                self._checked_at = now
+                return self._catalog
+
+        catalog = SupernovaCatalog.from_dtos(rows)
+        with self._lock:
+            self._catalog = catalog
+            self._source = source
+            self._checked_at = now
+            self._changed_at = now
+        if self.on_update is not None:
+            try:
+                self.on_update(catalog)
+            except Exception:
+                pass
+        return catalog
+
+    def latest(self) -> Tuple[Optional[SupernovaCatalog], Optional[float]]:
+        """Return (catalog, time of last successful check)."""
+        with self._lock:
+            return self._catalog, self._checked_at
+
+    def age(self) -> Optional[float]:
+        """Seconds since the catalog was last confirmed current, or None."""
+        with self._lock:
+            checked = self._checked_at
+        return None if checked is None else max(0.0, self.clock() - checked)
+
+
+def format_age(seconds: Optional[float]) -> str:
+    """Short translated age: 'just now', '12 min', '3 h', '2 d'."""
+    if seconds is None:
+        return ""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return _("just now")
+    if minutes < 60:
+        return _("{n} min").format(n=minutes)
+    hours = minutes // 60
+    if hours < 48:
+        return _("{n} h").format(n=hours)
+    return _("{n} d").format(n=hours // 24)
@@ -0,0 +1,248 @@
+"""Replay archived Rochester snapshots for offline backtesting.
+
+`SnapshotArchive` indexes a directory of archived pages by capture time.
+Captures are named `rochester-YYYYMMDDTHHMMSS.html.gz` when written by
+`SnapshotArchive.add` (or by `NetworkRochesterProvider` with an archive
+attached). Other `.html`, `.html.gz` and `.npz` files are picked up too,
+using a `YYYYMMDD[THHMM[SS]]` stamp in the file name or else the file
+modification time.
+
+Catalogs are only loaded when a night needs them, and the few most recently
+used are kept as `SupernovaCatalog`s. HTML captures are parsed through a
+`CatalogSnapshotStore` (the `replay/` cache directory), so replaying the
+same months again skips the HTML parser. `ReplayProvider` serves one night
+through the usual provider interface and `replay_nights` runs a whole date
+range through the selection pipeline (the `replay` command of app.cli).
+
+An archive can be shared by threads: the archive-backed
+`NetworkRochesterProvider` adds captures from the refresher and the search
+threads, so the index and the loaded catalogs are guarded by a lock.
+"""
+import bisect
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.config.snconfig import get_user_cache_dir
+from app.models.catalog import SupernovaCatalog
+from app.services.provider import RochesterProvider
+from app.services.snapshot import CatalogSnapshotStore
+
+_STAMP_RE = re.compile(r"(\d{8})(?:[T_-]?(\d{4})(\d{2})?)?")
+_EXTENSIONS = (".html.gz", ".html", ".htm", ".npz")
+
+
+def _as_datetime(when) -> datetime:
+    if isinstance(when, datetime):
+        return when
+    if isinstance(when, date):
+        return datetime.combine(when, time())
+    return datetime.fromisoformat(str(when))
+
+
+def capture_time(path: str) -> Optional[datetime]:
+    """Capture time encoded in the file name of `path`, or its mtime."""
+    m = _STAMP_RE.search(os.path.basename(path))
+    if m:
+        try:
+            stamp = m.group(1) + (m.group(2) or "0000") + (m.group(3) or "00")
+            return datetime.strptime(stamp, "%Y%m%d%H%M%S")
+        except ValueError:
+            pass
+    try:
+        return datetime.fromtimestamp(os.path.getmtime(path))
+    except OSError:
+        return None
+
+
+class SnapshotArchive:
+    """Archived Rochester captures indexed by capture time."""
+
+    def __init__(self, directory: str, max_loaded: int = 4, snapshot_store=None):
+        self.directory = directory
+        self.max_loaded = max_loaded
+        if snapshot_store is None:
+            # own store: a replay touches far more pages than the live app
+            snapshot_store = CatalogSnapshotStore(
+                os.path.join(get_user_cache_dir(), "replay"), max_entries=512
+            )
+        self.snapshot_store = snapshot_store
+        self._loaded: "OrderedDict[str, SupernovaCatalog]" = OrderedDict()
+        self._times: List[datetime] = []
+        self._paths: List[str] = []
+        self._lock = threading.Lock()
+        self.rescan()
+
+    def rescan(self) -> None:
+        """Re-read the directory listing."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        for name in names:
+            if not name.lower().endswith(_EXTENSIONS):
+                continue
+            path = os.path.join(self.directory, name)
+            when = capture_time(path)
+            if when is not None:
+                entries.append((when, path))
+        entries.sort()
+        with self._lock:
+            self._times = [w for w, _ in entries]
+            self._paths = [p for _, p in entries]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._paths)
+
+    def captures(self) -> List[Tuple[datetime, str]]:
+        with self._lock:
+            return list(zip(self._times, self._paths))
+
+    def closest(self, when, not_after: bool = False) -> Optional[Tuple[datetime, str]]:
+        """Return (capture time, path) of the capture closest to `when`.
+
+        With `not_after` only captures taken at or before `when` qualify,
+        which is what a backtest of "what would we have seen then" needs.
+        """
+        when = _as_datetime(when)
+        with self._lock:
+            i = bisect.bisect_right(self._times, when)
+            candidates = [i - 1] if not_after else [i - 1, i]
+            best = None
+            for k in candidates:
+                if 0 <= k < len(self._times):
+                    d = abs((self._times[k] - when).total_seconds())
+                    if best is None or d < best[0]:
+                        best = (d, k)
+            if best is None:
+                return None
+            return self._times[best[1]], self._paths[best[1]]
+
+    def load(self, path: str) -> SupernovaCatalog:
+        """Return the catalog stored in `path` (kept while recently used)."""
+        with self._lock:
+            catalog = self._loaded.get(path)
+            if catalog is not None:
+                self._loaded.move_to_end(path)
+                return catalog
+            # parsed under the lock so concurrent loads of a page parse it once
+            catalog = self._read(path)
+            self._loaded[path] = catalog
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+            return catalog
+
+    def _read(self, path: str) -> SupernovaCatalog:
+        if path.lower().endswith(".npz"):
+            with np.load(path, allow_pickle=False) as data:
+                catalog = SupernovaCatalog.from_arrays({k: data[k] for k in data.files})
+        else:
+            opener = gzip.open if path.lower().endswith(".gz") else open
+            with opener(path, "rb") as fh:
+                html = fh.read()
+            provider = RochesterProvider()
+            provider.snapshot_store = self.snapshot_store
+            catalog = SupernovaCatalog.from_dtos(provider.parse_html(html))
+        return catalog
+
+    def add(self, html: bytes | str, captured: Optional[datetime] = None) -> Optional[str]:
+        """Archive a fetched page; returns its path, or None if unchanged.
+
+        A page identical to the latest capture is not stored again.
+        """
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+        captured = captured or datetime.now()
+        with self._lock:
+            return self._add(html, captured)
+
+    def _add(self, html: bytes, captured: datetime) -> Optional[str]:
+        if self._paths and self._paths[-1].endswith(".html.gz"):
+            try:
+                with gzip.open(self._paths[-1], "rb") as fh:
+                    if hashlib.sha256(fh.read()).digest() == hashlib.sha256(html).digest():
+                        return None
+            except OSError:
+                pass
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, captured.strftime("rochester-%Y%m%dT%H%M%S.html.gz"))
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as fh:
+                fh.write(html)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+        i = bisect.bisect_right(self._times, captured)
+        self._times.insert(i, captured)
+        self._paths.insert(i, path)
+        return path
+
+
+class ReplayProvider:
+    """Provider serving the archived capture closest to `when`."""
+
+    def __init__(self, archive: SnapshotArchive, when, timeout: int = 20, not_after: bool = True):
+        self.archive = archive
+        self.when = when
+        self.timeout = timeout
+        self.not_after = not_after
+        self.captured = None
+
+    def fetch(self) -> SupernovaCatalog:
+        found = self.archive.closest(self.when, not_after=self.not_after)
+        if found is None:
+            raise FileNotFoundError(f"no archived capture for {self.when} in {self.archive.directory}")
+        self.captured, path = found
+        return self.archive.load(path)
+
+
+def nights(start, end) -> Iterator[date]:
+    """Every date from `start` to `end` inclusive."""
+    day = _as_datetime(start).date()
+    last = _as_datetime(end).date()
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+def replay_nights(
+    archive: SnapshotArchive,
+    days: Iterable[date],
+    make_config: Callable[[date], object],
+    selector,
+    capture_hour: int = 12,
+) -> Iterator[Tuple[date, Optional[datetime], list]]:
+    """Run the selection for each of `days` against the archive.
+
+    `make_config(day)` returns the search settings (`SupernovaCallBackData`)
+    for that night and `selector` is a `RochesterSupernova`. The capture
+    used is the latest one taken before `capture_hour` on that day. Yields
+    (day, capture time, results); nights without a capture yield
+    (day, None, []).
+    """
+    for day in days:
+        provider = ReplayProvider(archive, datetime.combine(day, time(capture_hour)))
+        try:
+            catalog = provider.fetch()
+        except FileNotFoundError:
+            yield day, None, []
+            continue
+        results = selector.selectAndSortSupernovas(make_config(day), catalog)
+        yield day, provider.captured, results
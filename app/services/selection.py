@@ -0,0 +1,393 @@
+"""Supernova selection pipeline shared by the GUI and the command line.
+
+`RochesterSupernova` turns a parsed catalog into the sorted list of
+supernovae visible from a site during an observation window, and
+`SupernovaCallBackData` holds the search settings. Nothing here imports
+tkinter, so the same pipeline runs from `getsupernovae.py` (GUI),
+`app.cli` (headless) and the batch/API entry points.
+
+`old` (the ignore list) and `visibility_windows` are process-wide: the GUI
+updates them in place when the user edits either.
+"""
+from datetime import datetime, timedelta
+from typing import List
+
+from astropy.coordinates import EarthLocation
+from astropy.time import Time
+
+from app.config.snconfig import load_visibility_windows
+from app.models.catalog import SupernovaCatalog
+from app.models.dto import SupernovaDTO
+from app.models.snmodels import Supernova
+from app.services.cancel import check_cancelled
+from app.services.filter_expr import compile_filter
+from app.services.ignore_list import IgnoreList
+from app.services.prefilter import prefilter
+from app.services.provider import NetworkRochesterProvider
+from app.services.ranking import DEFAULT_ORDER, ORDERS, top_k
+from app.services.timing import timed
+from app.ui.snvisibility import VisibilityWindow
+from app.utils.snparser import parse_date
+
+old = IgnoreList()
+visibility_windows = load_visibility_windows()
+
+
+class SupernovaCallBackData:
+    def __init__(
+        self,
+        magnitude,
+        observationDate,
+        observationTime,
+        observationHours,
+        daysToSearch,
+        site,
+        minLatitude,
+        visibilityWindowName=None,
+        filterExpression=None,
+        maxResults=None,
+        sortBy=None,
+    ):
+
+        self.magnitude = magnitude
+        self.observationDate = observationDate
+        self.observationTime = observationTime
+        self.observationHours = observationHours
+        self.daysToSearch = daysToSearch
+        self.site = site
+        self.minLatitude = minLatitude
+        self.observationStart = Time(observationDate + "T" + observationTime + "Z")
+        self.fromDateTime = self.observationStart - timedelta(days=int(daysToSearch))
+        self.fromDate = self.fromDateTime.strftime("%Y-%m-%d")
+        self.visibilityWindowName = visibilityWindowName
+        # optional filter expression text, see services.filter_expr
+        self.filterExpression = filterExpression
+        # keep only the best `maxResults` by `sortBy` (see services.ranking);
+        # None keeps every result
+        self.maxResults = maxResults
+        self.sortBy = sortBy or DEFAULT_ORDER
+
+
+def make_search_config(
+    site,
+    observationDate=None,
+    magnitude="17",
+    daysToSearch="21",
+    observationTime="21:00",
+    observationHours="5",
+    minLatitude="25",
+    visibilityWindowName=None,
+    filterExpression=None,
+    maxResults=None,
+    sortBy=None,
+) -> SupernovaCallBackData:
+    """Validate search settings given as text (command line, query string).
+
+    `observationDate` defaults to today; `maxResults` may be a number, or
+    None/"all"/0 for every result. Raises ValueError with a short message
+    for a malformed value, an unknown visibility window or order, or an
+    invalid filter expression.
+    """
+    day = observationDate or datetime.now().strftime("%Y-%m-%d")
+    try:
+        datetime.strptime(day, "%Y-%m-%d")
+        datetime.strptime(observationTime, "%H:%M")
+        float(magnitude)
+        int(daysToSearch)
+        int(observationHours)
+        float(minLatitude)
+    except (TypeError, ValueError) as ex:
+        raise ValueError(f"invalid search settings: {ex}")
+    if visibilityWindowName and visibilityWindowName not in visibility_windows:
+        raise ValueError(
+            f"unknown visibility window {visibilityWindowName!r}; "
+            f"available: {', '.join(sorted(visibility_windows)) or 'none'}"
+        )
+    try:
+        compile_filter(filterExpression)
+    except ValueError as ex:
+        raise ValueError(f"invalid filter: {ex}")
+    limit = parse_limit(maxResults)
+    if sortBy and sortBy not in ORDERS:
+        raise ValueError(f"unknown order {sortBy!r}; available: {', '.join(ORDERS)}")
+    return SupernovaCallBackData(
+        magnitude, day, observationTime, observationHours, daysToSearch, site, minLatitude,
+        visibilityWindowName or None, filterExpression or None, limit, sortBy or None,
+    )
+
+
+def parse_limit(value):
+    """Result limit from text: a positive count, or None for "all"/0/empty."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if text in ("", "all", "0"):
+        return None
+    try:
+        limit = int(text)
+    except ValueError:
+        raise ValueError(f"invalid result limit {value!r}")
+    if limit < 0:
+        raise ValueError(f"invalid result limit {value!r}")
+    return limit or None
+
+
+class RochesterSupernova:
+
+    def __init__(self, visibility_factory=None, provider_factory=None, reporter=None):
+        # visibility_factory should be a callable/class that creates a
+        # visibility window instance with signature
+        # VisibilityWindow(minAlt, maxAlt, minAz, maxAz)
+        self.visibility_factory = visibility_factory if visibility_factory is not None else VisibilityWindow
+        # provider_factory constructs a provider used to fetch Rochester data
+        self.provider_factory = provider_factory if provider_factory is not None else NetworkRochesterProvider
+        # reporter is optional; selection logic does not require it but keep for DI consistency
+        self.reporter = reporter
+        # name -> (Visibility, constellation) evaluated by the last selection
+        self.computed = {}
+
+    def visibilityParams(self, e: SupernovaCallBackData):
+        """Return (minAlt, maxAlt, minAz, maxAz) for the search `e`.
+
+        A named visibility window takes precedence over `e.minLatitude`.
+        """
+        try:
+            if getattr(e, "visibilityWindowName", None):
+                cfg = visibility_windows.get(e.visibilityWindowName)
+                if cfg is not None:
+                    return (
+                        float(cfg.get("minAlt", 0.0)),
+                        float(cfg.get("maxAlt", 90.0)),
+                        float(cfg.get("minAz", 0.0)),
+                        float(cfg.get("maxAz", 360.0)),
+                    )
+        except Exception:
+            pass
+        return float(e.minLatitude), 90.0, 0.0, 360.0
+
+    def visibilityKey(self, e: SupernovaCallBackData):
+        """Return a hashable key of every input that affects visibility.
+
+        Visibility computed for an unchanged catalog row can be reused by a
+        later run only while this key is the same.
+        """
+        site = e.site
+        try:
+            site_key = (float(site.lat.value), float(site.lon.value), float(site.height.value))
+        except Exception:
+            site_key = str(site)
+        return (
+            e.observationStart.strftime("%Y-%m-%d"),
+            e.observationTime,
+            int(e.observationHours),
+            site_key,
+            self.visibilityParams(e),
+        )
+
+    def selectionKey(self, e: SupernovaCallBackData, catalog, extra=()):
+        """Return a hashable key of every input of `selectAndSortSupernovas`.
+
+        Covers the catalog content (its fingerprint), the search fields, the
+        filter expression, the result order and limit and the ignore-list
+        version, plus `extra` (e.g. whether details were fetched). Used by
+        `SelectionCache`.
+        """
+        catalog = SupernovaCatalog.from_dtos(catalog)
+        old.reload_if_changed()
+        return (
+            catalog.fingerprint,
+            str(e.magnitude).strip(),
+            e.fromDate,
+            (getattr(e, "filterExpression", None) or "").strip(),
+            getattr(e, "sortBy", None) or DEFAULT_ORDER,
+            getattr(e, "maxResults", None),
+            old.version,
+            self.visibilityKey(e),
+            tuple(extra),
+        )
+
+    def selectAndSortSupernovas(
+        self,
+        e: SupernovaCallBackData,
+        supernovaeList: List[SupernovaDTO],
+        reuse=None,
+        on_result=None,
+        cancel=None,
+        timer=None,
+        on_progress=None,
+    ):
+        """Select the visible entries of `supernovaeList`, best first.
+
+        The order is `e.sortBy` (visibility start by default) and only the
+        best `e.maxResults` are kept when set (see services.ranking).
+        `on_result(supernova)` is called for each accepted entry as soon as
+        its visibility is known, before the final ranking. `cancel` is a
+        `CancellationToken` checked before each visibility computation and
+        `timer` a `PipelineTimer` receiving the filter/visibility/sort stages.
+        `on_progress(done, total)` reports the candidates evaluated so far.
+        """
+
+        minAlt, maxAlt, minAz, maxAz = self.visibilityParams(e)
+
+        supernovas = []
+        for supernova in self.iterSupernovas(
+            supernovaeList,
+            e.magnitude,
+            e.observationStart,
+            e.observationTime,
+            int(e.observationHours),
+            e.fromDate,
+            e.site,
+            minAlt,
+            maxAlt,
+            minAz,
+            maxAz,
+            reuse=reuse,
+            where=compile_filter(getattr(e, "filterExpression", None)),
+            cancel=cancel,
+            timer=timer,
+            on_progress=on_progress,
+        ):
+            supernovas.append(supernova)
+            if on_result is not None:
+                on_result(supernova)
+
+        with timed(timer, "sort", len(supernovas)):
+            supernovas = top_k(
+                supernovas, getattr(e, "maxResults", None), getattr(e, "sortBy", None) or DEFAULT_ORDER
+            )
+
+        return supernovas
+
+    def selectSupernovas(
+        self,
+        supernovaeList: List[SupernovaDTO],
+        maxMag: str,
+        observationDay: datetime,
+        localStartTime: str,
+        hoursObservation: int,
+        fromDate: str,
+        site: EarthLocation,
+        minAlt: float = 0,
+        maxAlt: float = 90,
+        minAz: float = 0,
+        maxAz: float = 360,
+        reuse=None,
+        where=None,
+        cancel=None,
+        timer=None,
+    ):
+        """Filter `supernovaeList` by magnitude, date and visibility.
+
+        Returns the list built by `iterSupernovas`, in catalog order.
+        """
+        return list(
+            self.iterSupernovas(
+                supernovaeList,
+                maxMag,
+                observationDay,
+                localStartTime,
+                hoursObservation,
+                fromDate,
+                site,
+                minAlt,
+                maxAlt,
+                minAz,
+                maxAz,
+                reuse=reuse,
+                where=where,
+                cancel=cancel,
+                timer=timer,
+            )
+        )
+
+    def iterSupernovas(
+        self,
+        supernovaeList: List[SupernovaDTO],
+        maxMag: str,
+        observationDay: datetime,
+        localStartTime: str,
+        hoursObservation: int,
+        fromDate: str,
+        site: EarthLocation,
+        minAlt: float = 0,
+        maxAlt: float = 90,
+        minAz: float = 0,
+        maxAz: float = 360,
+        reuse=None,
+        where=None,
+        cancel=None,
+        timer=None,
+        on_progress=None,
+    ):
+        """Yield each visible `Supernova` as soon as its visibility is known.
+
+        Magnitude, date window, ignore list and the optional compiled filter
+        `where` (see services.filter_expr) are applied first as array masks
+        (see services.prefilter); only the survivors go through the
+        visibility computation.
+
+        `reuse` optionally maps SN names to (Visibility, constellation)
+        computed by a previous run with the same visibility inputs; those
+        entries skip the coordinate transforms. Every entry evaluated here is
+        recorded in `self.computed` for the next run. `on_progress(done,
+        total)` is called once the candidates are known and after each one.
+        """
+
+        observationStart = (
+            observationDay.strftime("%Y-%m-%d") + "T" + localStartTime + "Z"
+        )
+
+        time1 = Time(observationStart)
+        time2 = time1 + timedelta(hours=hoursObservation)
+
+        self.computed = {}
+        # parse fromDate string to a date object for reliable comparisons
+        try:
+            from_date_obj = parse_date(fromDate)[0]
+        except Exception:
+            from_date_obj = None
+
+        with timed(timer, "filter") as stage:
+            candidates = prefilter(supernovaeList, float(maxMag), from_date_obj, old, where)
+            stage.count = len(candidates)
+        total = len(candidates)
+        if on_progress is not None:
+            on_progress(0, total)
+        for done, snDto in enumerate(candidates, 1):
+            check_cancelled(cancel)
+            # timed per entry so the consumer's time between yields is not counted
+            with timed(timer, "visibility", 1):
+                cached = reuse.get(snDto.name) if reuse else None
+                if cached is not None:
+                    visibility, constellation = cached
+                else:
+                    visibility = self.visibility_factory(minAlt, maxAlt, minAz, maxAz).getVisibility(
+                        site, snDto.coordinates, time1, time2)
+                    constellation = None
+            self.computed[snDto.name] = (visibility, constellation)
+            if on_progress is not None:
+                on_progress(done, total)
+
+            if visibility.visible:
+                # constellation is filled in (vectorized) when displayed or
+                # reported, see services.constellations
+                data = Supernova(
+                    snDto.name,
+                    snDto.date,
+                    str(snDto.mag),
+                    snDto.host,
+                    snDto.ra,
+                    snDto.decl,
+                    snDto.link or "",
+                    constellation,
+                    snDto.coordinates,
+                    snDto.firstObserved,
+                    snDto.maxMagnitude,
+                    snDto.maxMagnitudeDate,
+                    snDto.type,
+                    visibility,
+                    snDto.maxMagnitudeDate_obj,
+                    snDto.firstObserved_obj,
+                )
+                yield data
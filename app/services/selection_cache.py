@@ -0,0 +1,60 @@
+"""LRU cache of complete selection results.
+
+Switching back and forth between a few settings (magnitude 15 vs 17, one
+visibility window or another) would otherwise recompute the visibility of
+every candidate each time. `SelectionCache` keeps the sorted result lists of
+the last few searches, keyed by everything the selection depends on (see
+`RochesterSupernova.selectionKey`): the catalog fingerprint, magnitude,
+days back, observation date, start time, hours, site, visibility window,
+filter expression and ignore-list version. Any change to one of those
+gives a different key, so stale results are never returned; old entries
+simply age out.
+"""
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional
+
+
+class SelectionCache:
+    """Thread-safe LRU mapping of selection keys to result lists."""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[List]:
+        """Return a copy of the cached results for `key`, or None."""
+        if key is None:
+            return None
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(results)
+
+    def put(self, key: Hashable, results: List) -> None:
+        if key is None or results is None:
+            return
+        with self._lock:
+            self._entries[key] = list(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
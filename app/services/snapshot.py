@@ -0,0 +1,131 @@
+"""Parsed catalog snapshots keyed by the hash of the fetched HTML.
+
+Parsing the Rochester page (BeautifulSoup tree plus one `SkyCoord` per row)
+dominates startup time, yet the page is frequently identical between runs.
+`CatalogSnapshotStore` keeps the parsed catalog in a compact `.npz` file in
+the user cache directory, using the column layout of `SupernovaCatalog`:
+string fields as unicode arrays, RA/Dec in degrees and dates as proleptic
+ordinals. Loading a snapshot rebuilds all coordinates with a single
+vectorized `SkyCoord`.
+
+The refresher and the search threads save snapshots concurrently, often
+through different stores on the same directory, so `save` and `prune`
+are serialized per directory and pruning tolerates files that another
+process removed meanwhile.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config.snconfig import get_user_cache_dir
+from app.models.catalog import SupernovaCatalog
+from app.models.dto import SupernovaDTO
+
+# Bump whenever the parser or the stored layout changes so that stale
+# snapshots are never served.
+SNAPSHOT_FORMAT = 4
+
+_directory_locks: Dict[str, threading.Lock] = {}
+_directory_locks_guard = threading.Lock()
+
+
+def _directory_lock(directory: str) -> threading.Lock:
+    with _directory_locks_guard:
+        return _directory_locks.setdefault(os.path.abspath(directory), threading.Lock())
+
+
+class CatalogSnapshotStore:
+    """Store and load parsed catalogs keyed by the hash of the source HTML."""
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 8):
+        self.directory = directory or os.path.join(get_user_cache_dir(), "snapshots")
+        self.max_entries = max_entries
+        self._lock = _directory_lock(self.directory)
+
+    def key_for(self, html: bytes | str) -> str:
+        """Return the content hash used as snapshot key for `html`."""
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+        digest = hashlib.sha256(html).hexdigest()
+        return f"v{SNAPSHOT_FORMAT}-{digest}"
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npz")
+
+    def load(self, key: str) -> Optional[List[SupernovaDTO]]:
+        """Return the stored catalog for `key`, or None on a miss."""
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                columns = {k: data[k] for k in data.files}
+        except Exception:
+            return None
+
+        try:
+            # touch so pruning keeps recently used snapshots
+            os.utime(path, None)
+        except Exception:
+            pass
+
+        return self._from_columns(columns)
+
+    def save(self, key: str, dtos: List[SupernovaDTO]) -> str:
+        """Write `dtos` as the snapshot for `key` and return its path."""
+        os.makedirs(self.directory, exist_ok=True)
+        columns = self._to_columns(dtos)
+        path = self.path_for(key)
+
+        with self._lock:
+            # write to a temp file and rename so readers never see partial files
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npz.tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    np.savez(fh, **columns)
+                os.replace(tmp, path)
+            except Exception:
+                try:
+                    os.unlink(tmp)
+                except Exception:
+                    pass
+                raise
+
+            self._prune()
+        return path
+
+    def prune(self) -> None:
+        """Remove the least recently used snapshots beyond `max_entries`."""
+        with self._lock:
+            self._prune()
+
+    def _prune(self) -> None:
+        try:
+            names = [f for f in os.listdir(self.directory) if f.endswith(".npz")]
+        except Exception:
+            return
+
+        entries = []
+        for name in names:
+            p = os.path.join(self.directory, name)
+            try:
+                entries.append((os.path.getmtime(p), p))
+            except OSError:
+                # removed meanwhile (e.g. by another process)
+                continue
+        entries.sort(reverse=True)
+        for _mtime, p in entries[self.max_entries:]:
+            try:
+                os.unlink(p)
+            except Exception:
+                continue
+
+    def _to_columns(self, dtos: List[SupernovaDTO]) -> dict:
+        return SupernovaCatalog.from_dtos(dtos).to_arrays()
+
+    def _from_columns(self, columns: dict) -> List[SupernovaDTO]:
+        return SupernovaCatalog.from_arrays(columns).to_dtos()
@@ -0,0 +1,156 @@
+"""Per-stage timing of the search pipeline.
+
+A `PipelineTimer` records wall time, CPU time (of the thread running the
+stage) and an item count for each stage of one run:
+
+    fetch -> parse -> filter -> visibility -> sort -> constellations -> render
+
+Stages are timed with `timed(timer, name)`, which does nothing when the
+timer is None, so library code can take an optional timer without extra
+branches. A stage entered several times accumulates. `log_timings` appends
+a run as one JSON line to a rotating log in the user cache directory
+(`timings.log`), and `summary()` gives the short text shown in the app's
+status line.
+"""
+import contextlib
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from app.config.snconfig import get_user_cache_dir
+
+TIMINGS_LOG = "timings.log"
+_LOG_MAX_BYTES = 256 * 1024
+_LOG_BACKUPS = 3
+
+
+@dataclass
+class StageTiming:
+    name: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    count: Optional[int] = None
+
+
+class _Stage:
+    """Handle yielded by `PipelineTimer.stage`; set `count` inside the block."""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = None
+
+
+class PipelineTimer:
+    """Collect stage timings for one pipeline run (thread-safe)."""
+
+    def __init__(self):
+        self.started = datetime.now()
+        self._stages: Dict[str, StageTiming] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, wall: float, cpu: float, count: Optional[int] = None) -> None:
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = StageTiming(name)
+            stage.wall += wall
+            stage.cpu += cpu
+            if count is not None:
+                stage.count = (stage.count or 0) + count
+
+    @contextlib.contextmanager
+    def stage(self, name: str, count: Optional[int] = None) -> Iterator[_Stage]:
+        handle = _Stage()
+        handle.count = count
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield handle
+        finally:
+            self.add(name, time.perf_counter() - wall, time.thread_time() - cpu, handle.count)
+
+    @property
+    def stages(self) -> List[StageTiming]:
+        with self._lock:
+            return [StageTiming(**asdict(s)) for s in self._stages.values()]
+
+    def get(self, name: str) -> Optional[StageTiming]:
+        with self._lock:
+            return self._stages.get(name)
+
+    @property
+    def total_wall(self) -> float:
+        return sum(s.wall for s in self.stages)
+
+    def to_dict(self) -> dict:
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_wall": round(self.total_wall, 6),
+            "stages": [
+                {"name": s.name, "wall": round(s.wall, 6), "cpu": round(s.cpu, 6), "count": s.count}
+                for s in self.stages
+            ],
+        }
+
+    def summary(self) -> str:
+        """One line such as 'fetch 0.42 s · parse 0.10 s (2931) · ...'."""
+        parts = []
+        for s in self.stages:
+            text = f"{s.name} {s.wall:.2f} s"
+            if s.count is not None:
+                text += f" ({s.count})"
+            parts.append(text)
+        return " · ".join(parts)
+
+
+@contextlib.contextmanager
+def timed(timer: Optional[PipelineTimer], name: str, count: Optional[int] = None) -> Iterator[_Stage]:
+    """`timer.stage(name)`, or a no-op block when `timer` is None."""
+    if timer is None:
+        yield _Stage()
+        return
+    with timer.stage(name, count) as handle:
+        yield handle
+
+
+_logger: Optional[logging.Logger] = None
+_logger_lock = threading.Lock()
+
+
+def timings_logger(path: Optional[str] = None) -> logging.Logger:
+    """Logger writing JSON lines to the rotating timings log."""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            logger = logging.getLogger("getsupernovae.timings")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            path = path or os.path.join(get_user_cache_dir(), TIMINGS_LOG)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=_LOG_MAX_BYTES, backupCount=_LOG_BACKUPS, encoding="utf-8"
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+            except OSError:
+                # timing logs are diagnostics only
+                logger.addHandler(logging.NullHandler())
+            _logger = logger
+        return _logger
+
+
+def log_timings(timer: PipelineTimer, logger: Optional[logging.Logger] = None, **extra) -> None:
+    """Append `timer` (plus `extra` fields, e.g. source=...) as one JSON line."""
+    record = timer.to_dict()
+    record.update(extra)
+    try:
+        (logger or timings_logger()).info(json.dumps(record, default=str))
+    except Exception:
+        pass
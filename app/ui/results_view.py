@@ -0,0 +1,245 @@
+"""Tk-free model behind the virtualized results table.
+
+A `ttk.Treeview` slows down with every item it holds, and inserting one
+item per result froze the window for thousands of results. The results
+table therefore keeps the whole (sorted) result list here and only shows a
+page of it: the Treeview holds one item per visible line and the values
+of those items are rewritten when the user scrolls. `ResultsModel` knows
+which rows make up the page (`top` and `window`), formats only the rows
+that have been on screen and remembers the selected supernova
+independently of the Treeview items, so the selection survives scrolling
+and sorting. Formatting a row costs about a millisecond (times and
+coordinates), so columns are sorted on the underlying attributes
+(`SORT_KEYS`) rather than on the displayed text, and the keys of a
+column are computed once per result list.
+
+Rows are identified by supernova name. `ResultsModel.update` compares a
+new result list with the displayed one (`RowsDiff`): unchanged rows keep
+their formatted values, and the scroll position and selection are kept, so
+a refresh only redraws what changed.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.services.ranking import magnitude
+
+
+def cell_sort_key(value: Any, numeric: bool = False):
+    """Sort key of a displayed cell: numbers (empty/invalid last) or case-insensitive text."""
+    if numeric:
+        try:
+            return float(value) if value else math.inf
+        except (TypeError, ValueError):
+            return math.inf
+    return str(value).lower() if value else ""
+
+
+def _text(attr: str) -> Callable[[Any], str]:
+    return lambda sn: str(getattr(sn, attr, "") or "").lower()
+
+
+def _coordinate(attr: str) -> Callable[[Any], float]:
+    # the representation skips the frame attribute lookup of SkyCoord.ra/.dec
+    # (~25x faster); it holds (ra, dec) for the ICRS/FK5 catalog coordinates
+    def key(sn):
+        try:
+            return float(getattr(sn.coordinates.data, attr).degree)
+        except Exception:
+            return math.inf
+    return key
+
+
+def _observation_window(sn) -> Tuple[float, float]:
+    """(start, end) of the visible samples as JD floats."""
+    try:
+        cords = sn.visibility.azCords
+        start, end = cords[0].time, cords[-1].time
+        return start.jd1 + start.jd2, end.jd1 + end.jd2
+    except Exception:
+        return math.inf, math.inf
+
+
+# results table column -> sort key computed from the supernova itself
+SORT_KEYS: Dict[str, Callable[[Any], Any]] = {
+    "name": _text("name"),
+    "type": _text("type"),
+    "magnitude": magnitude,
+    "date": _text("date"),
+    "observation_time": _observation_window,
+    "host": _text("host"),
+    "constellation": _text("constellation"),
+    "ra": _coordinate("lon"),
+    "dec": _coordinate("lat"),
+}
+
+
+def row_key(sn: Any) -> str:
+    """Identity of a results row."""
+    return getattr(sn, "name", None) or ""
+
+
+def row_signature(sn: Any) -> tuple:
+    """Comparable value of everything the row of `sn` displays."""
+    visibility = getattr(sn, "visibility", None)
+    return tuple(key(sn) for key in SORT_KEYS.values()) + (getattr(visibility, "maxAlt", None),)
+
+
+@dataclass
+class RowsDiff:
+    """Names added, changed, removed and unchanged by a results update."""
+    added: Set[str] = field(default_factory=set)
+    changed: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    unchanged: Set[str] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+class ResultsModel:
+    """Result rows, their display order, the visible page and the selection.
+
+    `present` maps a supernova to the tuple of cell values of its row; it
+    is called at most once per row that stays unchanged. The selection is
+    kept by name (`selected_name`), so it follows a supernova across
+    updates and comes back when a streamed row arrives again.
+    """
+
+    def __init__(self, present: Callable[[Any], Sequence[Any]]):
+        self.present = present
+        self.rows: List[Any] = []
+        self.top = 0
+        self.selected_name: Optional[str] = None
+        self._values: Dict[int, Tuple] = {}
+        # column -> {id(sn): sort key}
+        self._sort_keys: Dict[int, Dict[int, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def selected(self) -> Any:
+        """The displayed supernova named `selected_name`, or None."""
+        if self.selected_name is None:
+            return None
+        for sn in self.rows:
+            if row_key(sn) == self.selected_name:
+                return sn
+        return None
+
+    @selected.setter
+    def selected(self, sn: Any) -> None:
+        self.selected_name = None if sn is None else row_key(sn)
+
+    def set_rows(self, rows) -> None:
+        """Replace the result list; scroll to the top and drop the selection."""
+        self.rows = list(rows)
+        self._values = {}
+        self._sort_keys = {}
+        self.top = 0
+        self.selected_name = None
+
+    def update(self, rows) -> RowsDiff:
+        """Replace the result list with `rows`, matching rows by name.
+
+        Rows whose displayed content did not change keep their formatted
+        values and sort keys. The selection is kept, and so is the first
+        displayed row when it is still there (otherwise the scroll offset;
+        the next `scroll_to` clamps it). Returns the differences.
+        """
+        rows = list(rows)
+        anchor = row_key(self.rows[self.top]) if self.top < len(self.rows) else None
+        previous: Dict[str, Any] = {}
+        for sn in self.rows:
+            previous.setdefault(row_key(sn), sn)
+        diff = RowsDiff()
+        values: Dict[int, Tuple] = {}
+        sort_keys: Dict[int, Dict[int, Any]] = {column: {} for column in self._sort_keys}
+        for sn in rows:
+            name = row_key(sn)
+            old = previous.pop(name, None)
+            if old is None:
+                diff.added.add(name)
+            elif old is not sn and row_signature(old) != row_signature(sn):
+                diff.changed.add(name)
+            else:
+                diff.unchanged.add(name)
+                if id(old) in self._values:
+                    values[id(sn)] = self._values[id(old)]
+                for column, keys in self._sort_keys.items():
+                    if id(old) in keys:
+                        sort_keys[column][id(sn)] = keys[id(old)]
+        diff.removed = set(previous)
+        self.rows = rows
+        self._values = values
+        self._sort_keys = sort_keys
+        if anchor in diff.unchanged or anchor in diff.changed:
+            self.top = next(i for i, sn in enumerate(rows) if row_key(sn) == anchor)
+        return diff
+
+    def append(self, rows) -> None:
+        self.rows.extend(rows)
+
+    def clear(self) -> None:
+        self.set_rows([])
+
+    def values(self, index: int) -> Tuple:
+        """Cell values of the row at display position `index`."""
+        sn = self.rows[index]
+        values = self._values.get(id(sn))
+        if values is None:
+            values = tuple(self.present(sn))
+            self._values[id(sn)] = values
+        return values
+
+    def sort(self, column: int, numeric: bool = False, reverse: bool = False,
+             key: Optional[Callable[[Any], Any]] = None) -> None:
+        """Order rows by `key(sn)`, or by the displayed value of `column`.
+
+        Ties keep their order.
+        """
+        keys = self._sort_keys.setdefault(column, {})
+        for i, sn in enumerate(self.rows):
+            if id(sn) not in keys:
+                keys[id(sn)] = key(sn) if key is not None else cell_sort_key(self.values(i)[column], numeric)
+        self.rows.sort(key=lambda sn: keys[id(sn)], reverse=reverse)
+
+    def index_of(self, sn: Any) -> Optional[int]:
+        for i, row in enumerate(self.rows):
+            if row is sn:
+                return i
+        return None
+
+    def scroll_to(self, top: int, page: int) -> int:
+        """Make `top` the first displayed row, clamped so the page stays full."""
+        self.top = max(0, min(int(top), len(self.rows) - max(1, page)))
+        return self.top
+
+    def scroll_by(self, delta: int, page: int) -> int:
+        return self.scroll_to(self.top + delta, page)
+
+    def ensure_visible(self, index: int, page: int) -> int:
+        """Scroll the least needed for row `index` to be on the page."""
+        page = max(1, page)
+        if index < self.top:
+            return self.scroll_to(index, page)
+        if index >= self.top + page:
+            return self.scroll_to(index - page + 1, page)
+        return self.top
+
+    def window(self, page: int) -> range:
+        """Display positions of the rows on a page of `page` lines."""
+        return range(self.top, min(len(self.rows), self.top + max(0, page)))
+
+    def fraction(self, page: int) -> Tuple[float, float]:
+        """(first, last) visible fractions, as a Tk scrollbar expects them."""
+        total = len(self.rows)
+        if total == 0:
+            return 0.0, 1.0
+        return self.top / total, min(total, self.top + page) / total
+
+    def top_for_fraction(self, fraction: float) -> int:
+        """First row for a scrollbar dragged to `fraction`."""
+        return int(round(float(fraction) * len(self.rows)))
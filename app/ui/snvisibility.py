@@ -1,11 +1,56 @@
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+import numpy as np
 from app.models.snmodels import AxCordInTime, Visibility
 from astropy.coordinates import AltAz
+from astropy.time import Time
 from datetime import timedelta
 
 # Use the pure visibility helpers to compute summary metadata (non-breaking)
 from app.services.visibility import visibility_summary
 
+# Sampling step of the visibility traces.
+SAMPLE_STEP = timedelta(hours=0.5)
+
+# (site, time1, time2) -> (sample times, AltAz frame); see observation_frames
+_frames_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_frames_lock = threading.Lock()
+_FRAMES_MAX = 64
+
+
+def _site_key(site):
+    try:
+        return (float(site.lat.value), float(site.lon.value), float(site.height.value))
+    except Exception:
+        return id(site)
+
+
+def observation_frames(site, time1, time2) -> Tuple[List[Time], AltAz]:
+    """Return the sample times of an observation window and their AltAz frame.
+
+    The frame holds every sample time, so a candidate is transformed once
+    for the whole window instead of once per sample. Every candidate of a
+    search (and every search with the same site and window) shares it.
+    """
+    key = (_site_key(site), time1.isot, time2.isot)
+    with _frames_lock:
+        cached = _frames_cache.get(key)
+        if cached is not None:
+            _frames_cache.move_to_end(key)
+            return cached
+    times = []
+    loopTime = time1
+    while loopTime < time2:
+        times.append(loopTime)
+        loopTime = loopTime + SAMPLE_STEP
+    frame = AltAz(obstime=Time(times), location=site) if times else None
+    with _frames_lock:
+        _frames_cache[key] = (times, frame)
+        while len(_frames_cache) > _FRAMES_MAX:
+            _frames_cache.popitem(last=False)
+    return times, frame
+
 
 class VisibilityWindow:
     def __init__(self, minAlt: float = 0, maxAlt: float = 90, minAz: float = 0, maxAz: float = 360):
@@ -21,19 +66,16 @@ class VisibilityWindow:
         Returns a `Visibility` object (from `snmodels`).
         """
         visible = False
-        loopTime = time1
         azVisibles = []
-        while loopTime < time2:
-            altaz = coord.transform_to(AltAz(obstime=loopTime, location=site))
-            if (
-                altaz.alt.dms.d >= self.minAlt
-                and altaz.alt.dms.d <= self.maxAlt
-                and altaz.az.dms.d >= self.minAz
-                and altaz.az.dms.d <= self.maxAz
-            ):
+        times, frame = observation_frames(site, time1, time2)
+        if times:
+            altaz = coord.transform_to(frame)
+            alt = altaz.alt.dms.d
+            az = altaz.az.dms.d
+            inside = (alt >= self.minAlt) & (alt <= self.maxAlt) & (az >= self.minAz) & (az <= self.maxAz)
+            for i in np.flatnonzero(inside):
                 visible = True
-                azVisibles.append(AxCordInTime(loopTime, altaz))
-            loopTime = loopTime + timedelta(hours=0.5)
+                azVisibles.append(AxCordInTime(times[i], altaz[i]))
 
         azVisibles.sort(key=lambda x: x.time)
 
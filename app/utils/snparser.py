@@ -1,7 +1,9 @@
+import functools
+import hashlib
 import re
 import urllib.parse
 from typing import Optional, Tuple
-from datetime import datetime
+from datetime import date, datetime
 from bs4 import Tag
 from astropy.coordinates import SkyCoord
 import astropy.units as u
@@ -30,6 +32,10 @@ def parse_magnitude(text: str) -> Tuple[Optional[float], Optional[str]]:
     return val, limit
 
 
+# YYYY-MM-DD with '-', '/' or '.' separators: the Rochester date layouts
+_DATE_RE = re.compile(r"^([0-9]{4})[-/.]([0-9]{1,2})[-/.]([0-9]{1,2})$")
+
+
 def parse_date(text: str):
     """
     Parse date strings like 'YYYY/MM/DD' or 'YYYY-MM-DD' into a date object and
@@ -43,6 +49,44 @@ def parse_date(text: str):
     if s == "":
         return None, None
 
+    return _parse_date_cached(s)
+
+
+def parse_dates(texts):
+    """Bulk `parse_date`: return a list of (date_obj, normalized_string).
+
+    Each distinct string of the column is parsed once.
+    """
+    seen = {}
+    result = []
+    for text in texts:
+        try:
+            parsed = seen[text]
+        except KeyError:
+            parsed = seen[text] = parse_date(text)
+        except TypeError:
+            parsed = parse_date(text)
+        result.append(parsed)
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_cached(s: str):
+    # the same few dates repeat across rows and columns; results are
+    # immutable (date, str) tuples so sharing them is safe
+    m = _DATE_RE.match(s)
+    if m:
+        try:
+            dt = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            dt = None
+        if dt is not None and dt.year >= 1000:
+            return dt, dt.isoformat()
+    return _parse_date_strptime(s)
+
+
+def _parse_date_strptime(s: str):
+    """Slow path for inputs the regex does not cover (same rules as before)."""
     for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"):
         try:
             dt = datetime.strptime(s, fmt).date()
@@ -78,7 +122,12 @@ def format_iso_datetime(obj):
         return ""
 
 
-def _parse_row_safe(row: Tag):
+def _extract_row_fields(row: Tag):
+    """Extract the raw cell texts of a Rochester table row.
+
+    Returns a dict of stripped strings (no date/magnitude/coordinate
+    parsing) or None when the row does not have the expected layout.
+    """
     cols = row.find_all("td")
     if len(cols) < 12:
         return None
@@ -94,43 +143,61 @@ def _parse_row_safe(row: Tag):
             else:
                 link = urllib.parse.urljoin("https://www.rochesterastronomy.org/", href)
 
-        host = cols[1].get_text(strip=True)
-        ra_text = cols[2].get_text(strip=True)
-        dec_text = cols[3].get_text(strip=True)
+        return {
+            "name": name,
+            "link": link,
+            "host": cols[1].get_text(strip=True),
+            "ra": cols[2].get_text(strip=True),
+            "decl": cols[3].get_text(strip=True),
+            "mag": cols[5].get_text(strip=True),
+            "date": cols[6].get_text(strip=True),
+            "type": cols[7].get_text(strip=True),
+            "maxMagnitude": cols[9].get_text(strip=True),
+            "maxMagnitudeDate": cols[10].get_text(strip=True),
+            "firstObserved": cols[11].get_text(strip=True),
+        }
+    except Exception:
+        return None
+
 
-        mag_text = cols[5].get_text(strip=True)
-        mag_val, mag_limit = parse_magnitude(mag_text)
+def row_signature(fields: dict) -> str:
+    """Return a short digest of the raw row fields.
 
-        raw_date_text = cols[6].get_text(strip=True)
-        date_obj, date_text = parse_date(raw_date_text)
+    Two rows with the same signature parse to identical entries, which lets
+    callers reuse previously parsed data for unchanged rows.
+    """
+    raw = "\x1f".join(str(fields.get(k) or "") for k in sorted(fields))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
 
-        type_text = cols[7].get_text(strip=True)
-        max_mag_text = cols[9].get_text(strip=True)
-        max_mag = max_mag_text
 
-        raw_max_mag_date = cols[10].get_text(strip=True)
-        max_mag_date_obj, max_mag_date = parse_date(raw_max_mag_date)
+def _parse_row_fields(fields: dict):
+    """Parse raw row fields (see `_extract_row_fields`) into typed values."""
+    if not fields:
+        return None
 
-        raw_first_observed = cols[11].get_text(strip=True)
-        first_observed_obj, first_observed = parse_date(raw_first_observed)
+    try:
+        mag_val, mag_limit = parse_magnitude(fields["mag"])
+        date_obj, date_text = parse_date(fields["date"])
+        max_mag_date_obj, max_mag_date = parse_date(fields["maxMagnitudeDate"])
+        first_observed_obj, first_observed = parse_date(fields["firstObserved"])
 
         try:
-            coord = SkyCoord(ra_text, dec_text, frame="icrs", unit=(u.hourangle, u.deg))
+            coord = SkyCoord(fields["ra"], fields["decl"], frame="icrs", unit=(u.hourangle, u.deg))
         except Exception:
             return None
 
         return {
-            "name": name,
-            "link": link,
-            "host": host,
-            "ra": ra_text,
-            "decl": dec_text,
+            "name": fields["name"],
+            "link": fields["link"],
+            "host": fields["host"],
+            "ra": fields["ra"],
+            "decl": fields["decl"],
             "mag": mag_val,
             "mag_limit": mag_limit,
             "date": date_text,
             "date_obj": date_obj,
-            "type": type_text,
-            "maxMagnitude": max_mag,
+            "type": fields["type"],
+            "maxMagnitude": fields["maxMagnitude"],
             "maxMagnitudeDate": max_mag_date,
             "maxMagnitudeDate_obj": max_mag_date_obj,
             "firstObserved": first_observed,
@@ -140,3 +207,7 @@ def _parse_row_safe(row: Tag):
 
     except Exception:
         return None
+
+
+def _parse_row_safe(row: Tag):
+    return _parse_row_fields(_extract_row_fields(row))
@@ -0,0 +1,154 @@
+"""Rochester parser throughput benchmark.
+
+Generates synthetic Rochester pages (see `benchmarks.synthetic`) and reports
+for each size and parser backend:
+- end-to-end rows/sec of `RochesterProvider.parse_html` (snapshots off)
+- peak traced memory of that run
+- the per-stage split: HTML tree, cell extraction, date/magnitude parsing
+  and coordinate construction
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_parser
+    python -m benchmarks.bench_parser --rows 1000 10000 --backends lxml
+    python -m benchmarks.bench_parser --json bench_output.json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bs4 import BeautifulSoup
+from astropy.coordinates import SkyCoord
+import astropy.units as u
+
+from app.services.provider import RochesterProvider
+from app.utils.snparser import _extract_row_fields, parse_dates, parse_magnitude
+from benchmarks.synthetic import generate_page
+
+DEFAULT_ROWS = (1_000, 10_000, 100_000)
+DEFAULT_BACKENDS = ("html.parser", "lxml")
+
+
+def available_backends(requested) -> List[str]:
+    result = []
+    for backend in requested:
+        try:
+            BeautifulSoup("<p></p>", backend)
+            result.append(backend)
+        except Exception:
+            print(f"skipping unavailable parser backend {backend!r}", file=sys.stderr)
+    return result
+
+
+def measure_stages(html: str, backend: str) -> Dict[str, float]:
+    """Time each parsing stage separately (seconds)."""
+    stages = {}
+
+    t = time.perf_counter()
+    rows = BeautifulSoup(html, backend).find_all("tr")
+    stages["html_tree"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    fields = [f for f in (_extract_row_fields(r) for r in rows) if f]
+    stages["cell_extraction"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for f in fields:
+        parse_magnitude(f["mag"])
+    for column in ("date", "maxMagnitudeDate", "firstObserved"):
+        parse_dates([f[column] for f in fields])
+    stages["dates_magnitudes"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for f in fields:
+        try:
+            SkyCoord(f["ra"], f["decl"], frame="icrs", unit=(u.hourangle, u.deg))
+        except Exception:
+            pass
+    stages["coordinates"] = time.perf_counter() - t
+
+    return stages
+
+
+def measure_end_to_end(html: str, backend: str) -> Dict[str, float]:
+    provider = RochesterProvider()
+    provider.html_parser = backend
+
+    gc.collect()
+    t = time.perf_counter()
+    parsed = provider.parse_html(html)
+    elapsed = time.perf_counter() - t
+    del parsed
+
+    # tracing slows allocation-heavy code a lot: measure memory separately
+    gc.collect()
+    tracemalloc.start()
+    parsed = provider.parse_html(html)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": elapsed,
+        "parsed_rows": len(parsed),
+        "peak_mib": peak / (1024 * 1024),
+    }
+
+
+def run(rows_list, backends, seed: int = 0, malformed: float = 0.05) -> List[dict]:
+    results = []
+    for n in rows_list:
+        html = generate_page(n, seed=seed, malformed_fraction=malformed)
+        for backend in backends:
+            e2e = measure_end_to_end(html, backend)
+            stages = measure_stages(html, backend)
+            results.append(
+                {
+                    "rows": n,
+                    "backend": backend,
+                    "html_bytes": len(html),
+                    "parsed_rows": e2e["parsed_rows"],
+                    "seconds": e2e["seconds"],
+                    "rows_per_sec": n / e2e["seconds"] if e2e["seconds"] else float("inf"),
+                    "peak_mib": e2e["peak_mib"],
+                    "stages": stages,
+                }
+            )
+            print(format_result(results[-1]))
+    return results
+
+
+def format_result(r: dict) -> str:
+    total = sum(r["stages"].values()) or 1.0
+    split = "  ".join(
+        f"{name} {secs:.2f}s ({100 * secs / total:.0f}%)" for name, secs in r["stages"].items()
+    )
+    return (
+        f"{r['rows']:>7} rows  {r['backend']:<11}  {r['rows_per_sec']:>9.0f} rows/s  "
+        f"peak {r['peak_mib']:7.1f} MiB  | {split}"
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS))
+    ap.add_argument("--backends", nargs="+", default=list(DEFAULT_BACKENDS))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--malformed", type=float, default=0.05, help="fraction of malformed rows")
+    ap.add_argument("--json", help="also write the results to this JSON file")
+    args = ap.parse_args(argv)
+
+    results = run(args.rows, available_backends(args.backends), args.seed, args.malformed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
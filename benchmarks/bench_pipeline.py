@@ -0,0 +1,72 @@
+"""End-to-end search pipeline benchmark with per-stage timings.
+
+Runs a synthetic Rochester page (see `benchmarks.synthetic`) through
+parse -> filter -> visibility -> sort -> constellations with a
+`PipelineTimer` and prints wall time, CPU time and item count per stage.
+The fetch stage is not included (the page is generated in memory).
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --rows 2000 --mag 18 --json pipeline.json
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.constellations import assign_constellations
+from app.services.provider import RochesterProvider
+from app.services.timing import PipelineTimer, timed
+from benchmarks.synthetic import generate_page
+from getsupernovae import RochesterSupernova, SupernovaCallBackData, sites
+
+
+def run_pipeline(html: str, config: SupernovaCallBackData, timer: PipelineTimer = None) -> PipelineTimer:
+    """Parse `html` and select with `config`, recording every stage in `timer`."""
+    timer = timer or PipelineTimer()
+    provider = RochesterProvider()
+    provider.timer = timer
+    catalog = provider.parse_html(html)
+    results = RochesterSupernova().selectAndSortSupernovas(config, catalog, timer=timer)
+    with timed(timer, "constellations", len(results)):
+        assign_constellations(results)
+    return timer
+
+
+def format_timer(timer: PipelineTimer) -> str:
+    lines = [f"{'stage':<15}{'wall s':>9}{'cpu s':>9}{'items':>9}"]
+    for s in timer.stages:
+        count = "" if s.count is None else str(s.count)
+        lines.append(f"{s.name:<15}{s.wall:>9.3f}{s.cpu:>9.3f}{count:>9}")
+    lines.append(f"{'total':<15}{timer.total_wall:>9.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--mag", default="17", help="maximum magnitude")
+    ap.add_argument("--days", default="30", help="days back to search")
+    ap.add_argument("--site", default="Sabadell")
+    # synthetic discovery dates end on this day (see benchmarks.synthetic)
+    ap.add_argument("--date", default="2026-03-12", help="observation date")
+    ap.add_argument("--json", help="also write the timings to this JSON file")
+    args = ap.parse_args(argv)
+
+    html = generate_page(args.rows, seed=args.seed)
+    config = SupernovaCallBackData(
+        args.mag, args.date, "21:00", "8", args.days, sites[args.site], "20"
+    )
+    timer = run_pipeline(html, config)
+    print(format_timer(timer))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(timer.to_dict(), fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Synthetic Rochester-style pages for parser benchmarks and tests.
+
+The real `snactive.html` page is one large table with a header block and
+one 12-column row per object. `generate_rows` produces deterministic row
+data (seeded) including a share of malformed rows, and `render_page` turns
+them into HTML with the same cell layout `snparser._extract_row_fields`
+expects.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator, List
+
+# kinds of malformed rows mixed into the table
+BAD_COORDINATES = "bad_coordinates"
+MISSING_DATE = "missing_date"
+LIMIT_MAGNITUDE = "limit_magnitude"
+SHORT_ROW = "short_row"
+MALFORMED_KINDS = (BAD_COORDINATES, MISSING_DATE, LIMIT_MAGNITUDE, SHORT_ROW)
+
+_TYPES = ("Ia", "II", "IIP", "IIn", "Ib", "Ic", "Ic-BL", "Ia-91T", "unk", "")
+_HOSTS = ("NGC", "IC", "UGC", "PGC", "MCG", "CGCG", "anonymous")
+
+
+@dataclass
+class SyntheticRow:
+    name: str
+    host: str
+    ra: str
+    dec: str
+    mag: str
+    date: str
+    type: str
+    max_mag: str
+    max_mag_date: str
+    first_observed: str
+    kind: str = "ok"
+
+    @property
+    def parseable(self) -> bool:
+        """True when the provider is expected to keep this row."""
+        return self.kind not in (BAD_COORDINATES, SHORT_ROW)
+
+
+def _designation(i: int, year: int) -> str:
+    letters = ""
+    n = i + 26  # start at two-letter designations like real reports
+    while n:
+        n, r = divmod(n, 26)
+        letters = chr(ord("a") + r) + letters
+    return f"SN{year}{letters}"
+
+
+def _ra(rng: random.Random) -> str:
+    total = rng.uniform(0, 24 * 3600)
+    h, rem = divmod(total, 3600)
+    m, s = divmod(rem, 60)
+    return f"{int(h):02d}:{int(m):02d}:{min(s, 59.99):05.2f}"
+
+
+def _dec(rng: random.Random) -> str:
+    total = rng.uniform(-89.5, 89.5)
+    sign = "+" if total >= 0 else "-"
+    total = abs(total) * 3600
+    d, rem = divmod(total, 3600)
+    m, s = divmod(rem, 60)
+    return f"{sign}{int(d):02d}:{int(m):02d}:{min(s, 59.9):04.1f}"
+
+
+def _fmt_date(d: date) -> str:
+    return d.strftime("%Y/%m/%d")
+
+
+def generate_rows(n_rows: int, seed: int = 0, malformed_fraction: float = 0.05, today: date = None) -> Iterator[SyntheticRow]:
+    """Yield `n_rows` deterministic rows, `malformed_fraction` of them broken."""
+    rng = random.Random(seed)
+    today = today or date(2026, 3, 12)
+    for i in range(n_rows):
+        discovered = today - timedelta(days=rng.randint(0, 120))
+        max_date = discovered + timedelta(days=rng.randint(0, 20))
+        mag = rng.uniform(11.5, 20.5)
+        row = SyntheticRow(
+            name=_designation(i, discovered.year),
+            host=f"{rng.choice(_HOSTS)} {rng.randint(1, 9999)}",
+            ra=_ra(rng),
+            dec=_dec(rng),
+            mag=f"{mag:.1f}",
+            date=_fmt_date(max_date),
+            type=rng.choice(_TYPES),
+            max_mag=f"{mag - rng.uniform(0, 1.5):.1f}",
+            max_mag_date=_fmt_date(max_date),
+            first_observed=_fmt_date(discovered),
+        )
+
+        if rng.random() < malformed_fraction:
+            row.kind = rng.choice(MALFORMED_KINDS)
+            if row.kind == BAD_COORDINATES:
+                row.ra, row.dec = "99:99:99", "+xx:00:00"
+            elif row.kind == MISSING_DATE:
+                row.date = ""
+                row.first_observed = "unknown"
+            elif row.kind == LIMIT_MAGNITUDE:
+                row.mag = ">" + row.mag
+        yield row
+
+
+def render_row(row: SyntheticRow) -> str:
+    if row.kind == SHORT_ROW:
+        return f"<tr><td>{row.name}</td><td>{row.host}</td><td>{row.ra}</td></tr>\n"
+    slug = row.name[2:].lower()
+    return (
+        "<tr>"
+        f'<td><a href="../sn{slug[:4]}/sn{slug}.html">{row.name}</a></td>'
+        f"<td>{row.host}</td>"
+        f"<td>{row.ra}</td>"
+        f"<td>{row.dec}</td>"
+        "<td>0.0 0.0</td>"
+        f"<td>{row.mag}</td>"
+        f"<td>{row.date}</td>"
+        f"<td>{row.type}</td>"
+        "<td>z=0.0123</td>"
+        f"<td>{row.max_mag}</td>"
+        f"<td>{row.max_mag_date}</td>"
+        f"<td>{row.first_observed}</td>"
+        "<td>ATLAS</td>"
+        "</tr>\n"
+    )
+
+
+def render_page(rows: List[SyntheticRow]) -> str:
+    """Render rows as a Rochester-style HTML page."""
+    parts = [
+        "<html><head><title>Latest Supernovae (synthetic)</title></head><body>\n",
+        "<h2>Active supernovae</h2>\n<table border=1>\n",
+        "<tr><th>SN</th><th>Host</th><th>R.A.</th><th>Decl.</th><th>Offset</th>"
+        "<th>Mag</th><th>Date</th><th>Type</th><th>z</th><th>Max mag</th>"
+        "<th>Max mag date</th><th>First observed</th><th>Discoverer</th></tr>\n",
+    ]
+    parts.extend(render_row(r) for r in rows)
+    parts.append("</table>\n</body></html>\n")
+    return "".join(parts)
+
+
+def generate_page(n_rows: int, seed: int = 0, malformed_fraction: float = 0.05) -> str:
+    return render_page(list(generate_rows(n_rows, seed, malformed_fraction)))
@@ -3,37 +3,48 @@
 #
 
 from threading import Thread
-from typing import List
+import functools
 import urllib.parse
 from astropy.coordinates import EarthLocation
-from astropy.time import Time
-from datetime import datetime, timedelta
+from datetime import datetime
 import sys
 import os
 
+if __name__ == "__main__":
+    # batch worker processes of a frozen (PyInstaller) build start here
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+
+# `getsupernovae.py search|batch|serve ...` runs the headless CLI (app.cli)
+# without loading tkinter at all, so it can run from cron or over ssh.
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in ("search", "batch", "replay", "serve"):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app.cli import main as cli_main
+
+    sys.exit(cli_main(sys.argv[1:]))
+
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 
-from app.models.dto import SupernovaDTO
 # ensure local modules in this directory can be imported when script run directly
 sys.path.insert(0, os.path.dirname(__file__))
 import astropy.units as u
 
 
 
-from app.models.snmodels import Supernova
-from app.utils.snparser import parse_date
+from app.models.catalog import SupernovaCatalog
 from app.ui.snvisibility import VisibilityWindow
 from app.ui.results_presenter import ResultsPresenter
+from app.ui.results_view import SORT_KEYS, ResultsModel, row_key
 from app.reports.report_text import createText, createTextAsString
 from app.reports.report_pdf import createPdf
 from app.config.snconfig import (
-    load_old_supernovae,
     load_sites,
     load_visibility_windows,
+    load_catalog_sources,
     bootstrap_config,
-    get_user_config_dir,
     load_user_prefs,
     save_user_prefs,
 )
@@ -41,176 +52,57 @@ from app.config.snconfig import (
 # import the external plotter helper
 from app.i18n import _, set_language, get_language
 from app.services.provider import NetworkRochesterProvider
+from app.services.delta import diff_catalogs
+from app.services.details import DetailFetcher, enrich_supernovas
+from app.services.composite import make_provider_factory
+from app.services.constellations import assign_constellations, default_grid
+from app.services.filter_expr import FilterSyntaxError, compile_filter
+from app.services.replay import SnapshotArchive
+from app.services.refresher import CatalogRefresher, format_age
+from app.services.cancel import CancellationToken, OperationCancelled
+from app.services.timing import PipelineTimer, log_timings, timed
+from app.services.events import (
+    FINAL_EVENTS,
+    EventChannel,
+    PartialResult,
+    Progress,
+    SearchDone,
+    SearchFailed,
+    SearchCancelled,
+    StageStarted,
+)
+from app.services.selection_cache import SelectionCache
+from app.services.ranking import DEFAULT_ORDER, ORDERS
+from app.services import selection
+# selection pipeline (tkinter-free, shared with app.cli); re-exported here
+from app.services.selection import (
+    RochesterSupernova,
+    SupernovaCallBackData,
+    old,
+    parse_limit,
+    visibility_windows,
+)
 from app import __version__
 
 bootstrap_config()
-old = load_old_supernovae()
 sites = load_sites()
-visibility_windows = load_visibility_windows()
-
-class SupernovaCallBackData:
-    def __init__(
-        self,
-        magnitude,
-        observationDate,
-        observationTime,
-        observationHours,
-        daysToSearch,
-        site,
-        minLatitude,
-        visibilityWindowName=None,
-    ):
-
-        self.magnitude = magnitude
-        self.observationDate = observationDate
-        self.observationTime = observationTime
-        self.observationHours = observationHours
-        self.daysToSearch = daysToSearch
-        self.site = site
-        self.minLatitude = minLatitude
-        self.observationStart = Time(observationDate + "T" + observationTime + "Z")
-        self.fromDateTime = self.observationStart - timedelta(days=int(daysToSearch))
-        self.fromDate = self.fromDateTime.strftime("%Y-%m-%d")
-        self.visibilityWindowName = visibilityWindowName
-
-class RochesterSupernova:
-
-    def __init__(self, visibility_factory=None, provider_factory=None, reporter=None):
-        # visibility_factory should be a callable/class that creates a
-        # visibility window instance with signature
-        # VisibilityWindow(minAlt, maxAlt, minAz, maxAz)
-        self.visibility_factory = visibility_factory if visibility_factory is not None else VisibilityWindow
-        # provider_factory constructs a provider used to fetch Rochester data
-        self.provider_factory = provider_factory if provider_factory is not None else NetworkRochesterProvider
-        # reporter is optional; selection logic does not require it but keep for DI consistency
-        self.reporter = reporter
-
-    def selectAndSortSupernovas(
-        self, e: SupernovaCallBackData, supernovaeList: List[SupernovaDTO]
-    ):
-
-        # Determine visibility window values: prefer named window if provided
-        try:
-            if getattr(e, "visibilityWindowName", None):
-                cfg = visibility_windows.get(e.visibilityWindowName)
-                if cfg is not None:
-                    minAlt = float(cfg.get("minAlt", 0.0))
-                    maxAlt = float(cfg.get("maxAlt", 90.0))
-                    minAz = float(cfg.get("minAz", 0.0))
-                    maxAz = float(cfg.get("maxAz", 360.0))
-                else:
-                    minAlt = float(e.minLatitude)
-                    maxAlt = 90.0
-                    minAz = 0.0
-                    maxAz = 360.0
-            else:
-                minAlt = float(e.minLatitude)
-                maxAlt = 90.0
-                minAz = 0.0
-                maxAz = 360.0
-        except Exception:
-            minAlt = float(e.minLatitude)
-            maxAlt = 90.0
-            minAz = 0.0
-            maxAz = 360.0
-
-        supernovas = self.selectSupernovas(
-            supernovaeList,
-            e.magnitude,
-            e.observationStart,
-            e.observationTime,
-            int(e.observationHours),
-            e.fromDate,
-            e.site,
-            minAlt,
-            maxAlt,
-            minAz,
-            maxAz,
-        )
-
-        supernovas.sort(key=lambda x: x.visibility.azCords[-1].time)
-        supernovas.sort(key=lambda x: x.visibility.azCords[0].time)
-
-        return supernovas
-
-    def selectSupernovas(
-        self,
-        supernovaeList: List[SupernovaDTO],
-        maxMag: str,
-        observationDay: datetime,
-        localStartTime: str,
-        hoursObservation: int,
-        fromDate: str,
-        site: EarthLocation,
-        minAlt: float = 0,
-        maxAlt: float = 90,
-        minAz: float = 0,
-        maxAz: float = 360,
-    ):
-
-        observationStart = (
-            observationDay.strftime("%Y-%m-%d") + "T" + localStartTime + "Z"
-        )
-
-        time1 = Time(observationStart)
-        time2 = time1 + timedelta(hours=hoursObservation)
-
-        supernovas = []
-        # parse fromDate string to a date object for reliable comparisons
-        try:
-            from_date_obj = parse_date(fromDate)[0]
-        except Exception:
-            from_date_obj = None
-        for snDto in supernovaeList:
-            
-            # numeric comparison (ensure maxMag param is numeric)
-            try:
-                max_mag_threshold = float(maxMag)
-            except Exception:
-                max_mag_threshold = float(str(maxMag))
-
-            if snDto.mag > max_mag_threshold:
-                continue
-
-            # if parsed date failed to parse, skip
-            if snDto.date is None:
-                continue
-
-            if from_date_obj is not None and snDto.date_obj <= from_date_obj:
-                continue
-
-            visibility = self.visibility_factory(minAlt, maxAlt, minAz, maxAz).getVisibility(
-                site, snDto.coordinates, time1, time2)
-
-            if visibility.visible and snDto.name not in old:
-                data = Supernova(
-                    snDto.name,
-                    snDto.date,
-                    str(snDto.mag),
-                    snDto.host,
-                    snDto.ra,
-                    snDto.decl,
-                    snDto.link or "",
-                    snDto.coordinates.get_constellation(),
-                    snDto.coordinates,
-                    snDto.firstObserved,
-                    snDto.maxMagnitude,
-                    snDto.maxMagnitudeDate,
-                    snDto.type,
-                    visibility,
-                    snDto.maxMagnitudeDate_obj,
-                    snDto.firstObserved_obj,
-                )
-                supernovas.append(data)
-
-        return supernovas
-
 
 # Note: domain model dataclasses live in `app.models.snmodels` and are imported
 # at the top of this module. Do not redefine them here to avoid drift.
 
 class AsyncRochesterDownload(Thread):
-    def __init__(self, e: SupernovaCallBackData, visibility_factory=None, provider_factory=None, reporter=None):
+    def __init__(
+        self,
+        e: SupernovaCallBackData,
+        visibility_factory=None,
+        provider_factory=None,
+        reporter=None,
+        previous_dtos=None,
+        previous_visibility=None,
+        detail_fetcher=None,
+        catalog=None,
+        cancel=None,
+    ):
         super().__init__()
 
         # Don't reset language - respect the user's current language setting
@@ -223,26 +115,112 @@ class AsyncRochesterDownload(Thread):
         # optional reporter object/module for DI
         self.reporter = reporter
         self.dto_list = None
+        # catalog and (visibilityKey, computed) from the previous run, used
+        # to only re-process added/changed entries
+        self.previous_dtos = previous_dtos
+        self.previous_visibility = previous_visibility
+        self.delta = None
+        self.visibility = None
+        # optional DetailFetcher: enrich results from their detail pages
+        self.detail_fetcher = detail_fetcher
+        # warm catalog (e.g. from CatalogRefresher): skip the download
+        self.catalog = catalog
+        # provider result as returned by fetch() (None when `catalog` was used)
+        self.fetched = None
+        # RochesterSupernova.selectionKey of this run (for SelectionCache)
+        self.selection_key = None
+        # typed progress/result events for the UI (services.events): stage
+        # changes, N of M candidates evaluated, each accepted result as soon
+        # as its visibility is known, and a final done/failed/cancelled
+        # event; `result` holds the final ranked list
+        self.events = EventChannel()
+        # number of streamed results already shown by the UI
+        self.streamed = 0
+        # set cancel_token.cancel() to stop the search at its next checkpoint
+        self.cancel_token = cancel if cancel is not None else CancellationToken()
+        self.cancelled = False
+        # per-stage wall/CPU time and counts of this run
+        self.timer = PipelineTimer()
 
     def run(self):
         try:
-            # Use the injected provider factory to download and parse content.
-            try:
-                provider = self.provider_factory(timeout=20)
-            except TypeError:
-                # provider_factory may be a class that doesn't accept timeout
-                provider = self.provider_factory()
-            supernovaeList = provider.fetch()
+            if self.catalog is not None:
+                supernovaeList = self.catalog
+            else:
+                self.events.post(StageStarted("fetch"))
+                # Use the injected provider factory to download and parse content.
+                try:
+                    provider = self.provider_factory(timeout=20)
+                except TypeError:
+                    # provider_factory may be a class that doesn't accept timeout
+                    provider = self.provider_factory()
+                if self.previous_dtos is not None and hasattr(provider, "previous"):
+                    provider.previous = self.previous_dtos
+                if hasattr(provider, "cancel"):
+                    provider.cancel = self.cancel_token
+                if hasattr(provider, "timer"):
+                    provider.timer = self.timer
+                supernovaeList = provider.fetch()
+                self.fetched = supernovaeList
+                self.delta = getattr(provider, "last_delta", None)
+
+            if self.delta is None and self.previous_dtos is not None:
+                self.delta = diff_catalogs(self.previous_dtos, supernovaeList)
+
             # propagate injected provider_factory and reporter to selection logic
             rochesterSupernova = RochesterSupernova(
                 visibility_factory=self.visibility_factory,
                 provider_factory=self.provider_factory,
                 reporter=self.reporter,
             )
+
+            # keep the rows (column-wise, see SupernovaCatalog) so the app
+            # can re-filter without re-downloading
+            self.dto_list = SupernovaCatalog.from_dtos(supernovaeList)
+            # computed before selecting so it matches the ignore list used
+            self.selection_key = rochesterSupernova.selectionKey(
+                self.config, self.dto_list, extra=(self.detail_fetcher is not None,)
+            )
+
+            # reuse visibility of unchanged rows when the filters match
+            reuse = None
+            visibility_key = rochesterSupernova.visibilityKey(self.config)
+            if self.delta is not None and self.previous_visibility:
+                prev_key, prev_computed = self.previous_visibility
+                if prev_key == visibility_key:
+                    reuse = {n: v for n, v in prev_computed.items() if n in self.delta.unchanged}
+
+            # load (or build, ~2 s the first time) the constellation grid
+            # here so the Tk thread only does lookups when showing results
+            with timed(self.timer, "constellations"):
+                default_grid()
+
             # Continue using existing selection/filtering logic which expects raw rows
-            self.result = rochesterSupernova.selectAndSortSupernovas(self.config, supernovaeList)
-            # keep raw rows so the app can re-filter without re-downloading
-            self.dto_list = supernovaeList
+            self.events.post(StageStarted("select"))
+            self.result = rochesterSupernova.selectAndSortSupernovas(
+                self.config, supernovaeList, reuse=reuse,
+                on_result=lambda sn: self.events.post(PartialResult(sn)),
+                cancel=self.cancel_token, timer=self.timer,
+                on_progress=lambda done, total: self.events.post(Progress(done, total)),
+            )
+            self.visibility = (visibility_key, rochesterSupernova.computed)
+
+            if self.detail_fetcher is not None and self.result:
+                self.cancel_token.raise_if_cancelled()
+                self.events.post(StageStarted("details"))
+                try:
+                    with timed(self.timer, "details", len(self.result)):
+                        enrich_supernovas(self.result, self.detail_fetcher, cancel=self.cancel_token)
+                except OperationCancelled:
+                    raise
+                except Exception:
+                    # enrichment is best-effort; keep the selection results
+                    pass
+                self.cancel_token.raise_if_cancelled()
+        except OperationCancelled:
+            # superseded or cancelled by the user: nothing to report
+            self.cancelled = True
+            self.result = None
         except Exception as ex:
             # record the error for the main thread to show
             try:
@@ -251,6 +229,13 @@ class AsyncRochesterDownload(Thread):
                 self.error = "unknown error"
             self.result = None
 
+        if self.cancelled:
+            self.events.post(SearchCancelled())
+        elif self.result is None:
+            self.events.post(SearchFailed(self.error or "unknown error"))
+        else:
+            self.events.post(SearchDone(self.result))
+
 
 class SearchFilters:
     def __init__(
@@ -301,39 +286,40 @@ class SupernovasApp(tk.Tk):
                 self.resultsTree.tag_configure('oddrow', background="#ffffff")
                 self.resultsTree.tag_configure('evenrow_bright', background="#f0f0f0", foreground="#cc0000")
                 self.resultsTree.tag_configure('oddrow_bright', background="#ffffff", foreground="#cc0000")
+
+            # entries added since the previous refresh
+            self.resultsTree.tag_configure('newrow', font=("TkDefaultFont", 10, "bold"))
             
             # Reapply tags to all existing items to preserve bright highlighting
             self._reapply_tree_tags()
         except Exception:
             pass
     
-    def _reapply_tree_tags(self):
-        """Reapply tags to all tree items based on magnitude and position."""
+    def _row_tags(self, sn, index):
+        """Return the Treeview tags for `sn` displayed at row `index`.
+
+        Rows alternate colors, bright (mag < 15) entries are highlighted and
+        entries added since the previous refresh get the `newrow` tag.
+        """
+        mag = getattr(sn, 'mag', None)
         try:
-            if not hasattr(self, 'resultsTree') or self.resultsTree is None:
-                return
-            
-            items = self.resultsTree.get_children('')
-            for index, item in enumerate(items):
-                try:
-                    if item in self.supernova_data:
-                        sn = self.supernova_data[item]
-                        mag = getattr(sn, 'mag', None)
-                        try:
-                            is_bright = mag is not None and float(mag) < 15
-                        except (ValueError, TypeError):
-                            is_bright = False
-                        
-                        if is_bright:
-                            tag = 'evenrow_bright' if index % 2 == 0 else 'oddrow_bright'
-                        else:
-                            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-                        
-                        self.resultsTree.item(item, tags=(tag,))
-                except Exception:
-                    pass
-        except Exception:
-            pass
+            is_bright = mag is not None and float(mag) < 15
+        except (ValueError, TypeError):
+            is_bright = False
+
+        if is_bright:
+            tag = 'evenrow_bright' if index % 2 == 0 else 'oddrow_bright'
+        else:
+            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
+
+        if getattr(sn, 'name', None) in getattr(self, 'new_names', ()):
+            return (tag, 'newrow')
+        return (tag,)
+
+    def _reapply_tree_tags(self):
+        """Reapply tags to the displayed rows based on magnitude and position."""
+        if getattr(self, 'resultsTree', None) is not None:
+            self._render_results()
     
     def apply_theme(self):
         """Apply light/dark theme to ttk widgets and some native widgets."""
@@ -487,6 +473,11 @@ class SupernovasApp(tk.Tk):
                 "visibilityWindow": (getattr(self, "visibilityWindow", None) and self.visibilityWindow.get()) or "",
                 "observationHours": (getattr(self, "observationDuration", None) and self.observationDuration.get()) or "",
                 "observationTime": (getattr(self, "observationTime", None) and self.observationTime.get()) or "",
+                "fetchDetails": bool(getattr(self, "fetchDetails", None) and self.fetchDetails.get()),
+                "refreshMinutes": getattr(self, "refresh_minutes", 30),
+                "filterExpression": (getattr(self, "filterExpression", None) and self.filterExpression.get()) or "",
+                "maxResults": self._result_limit() or 0,
+                "sortBy": self._sort_order(),
             }
             try:
                 save_user_prefs(prefs)
@@ -519,6 +510,34 @@ class SupernovasApp(tk.Tk):
                 self.observationDuration.set(str(prefs.get("observationHours")))
         except Exception:
             pass
+        try:
+            if "fetchDetails" in prefs:
+                self.fetchDetails.set(bool(prefs.get("fetchDetails")))
+        except Exception:
+            pass
+        try:
+            if "refreshMinutes" in prefs:
+                self.refresh_minutes = max(0, int(prefs.get("refreshMinutes")))
+        except Exception:
+            pass
+        try:
+            if prefs.get("filterExpression"):
+                self.filterExpression.set(str(prefs.get("filterExpression")))
+        except Exception:
+            pass
+        try:
+            if "maxResults" in prefs:
+                limit = parse_limit(prefs.get("maxResults"))
+                self.maxResults.set(str(limit) if limit else _("All"))
+        except Exception:
+            pass
+        try:
+            order = prefs.get("sortBy")
+            if order in ORDERS:
+                self.sortBy.set(order)
+                self.sortLabel.set(self._sort_labels()[order])
+        except Exception:
+            pass
         try:
             site = prefs.get("site")
             if site and site in list(sites.keys()):
@@ -562,10 +581,41 @@ class SupernovasApp(tk.Tk):
             sites[self.site.get()],
             self.minLatitud.get(),
             getattr(self, "visibilityWindow", None) and self.visibilityWindow.get(),
+            getattr(self, "filterExpression", None) and self.filterExpression.get(),
+            self._result_limit(),
+            self._sort_order(),
         )
 
         return callbackData
 
+    def _sort_labels(self):
+        """Result orders (services.ranking) and their translated labels."""
+        return {
+            "start": _("Start time"),
+            "altitude": _("Peak altitude"),
+            "magnitude": _("Magnitude"),
+            "score": _("Score"),
+        }
+
+    def _sort_order(self):
+        order = getattr(self, "sortBy", None) and self.sortBy.get()
+        return order if order in ORDERS else DEFAULT_ORDER
+
+    def _on_sort_label(self):
+        """Order combobox changed: store the order key behind the label."""
+        label = self.sortLabel.get()
+        for order, text in self._sort_labels().items():
+            if label == text:
+                self.sortBy.set(order)
+                return
+
+    def _result_limit(self):
+        """Number of results to keep, or None for all of them."""
+        try:
+            return parse_limit(self.maxResults.get())
+        except Exception:
+            return None
+
     #
     # Check if there is already a search done with current filters
     #
@@ -642,21 +692,10 @@ class SupernovasApp(tk.Tk):
     #
     def callbackRefreshSearchSupernovas(self, e: SupernovaCallBackData):
 
-        # If a refresh isn't already running, start an async refresh.
-        # If we are already refreshing, ignore the extra click. If there
-        # are cached results, they will be updated once the running
-        # refresh completes and `monitor` finishes.
-        if not self.refreshing:
-            self.refreshing = True
-            # disable the refresh button (searchButton) while refresh is running
-            try:
-                self.searchButton["state"] = tk.DISABLED
-            except Exception:
-                pass
-            self.callbackSearchSupernovasAsync(e, "REFRESH")
-        else:
-            # Already refreshing: do nothing (avoid using None results).
-            return
+        # Start an async refresh. A search still running (e.g. with the
+        # previous filters) is cancelled and superseded by this one.
+        self.refreshing = True
+        self.callbackSearchSupernovasAsync(e, "REFRESH")
         
             
     #
@@ -664,9 +703,33 @@ class SupernovasApp(tk.Tk):
     #
     def callbackSearchSupernovasAsync(self, e: SupernovaCallBackData, source="SEARCH"):
 
+        # reject an invalid filter before starting the download
+        try:
+            compile_filter(getattr(e, "filterExpression", None))
+        except FilterSyntaxError as ex:
+            self.refreshing = False
+            try:
+                self.searchButton["state"] = tk.NORMAL
+            except Exception:
+                pass
+            messagebox.showerror(_("Filter error"), _("Invalid filter: {ex}").format(ex=ex))
+            return
+
+        # only one search pipeline at a time: stop the one in flight
+        self._cancel_search()
+
+        # settings already searched against the current catalog: no work
+        cached = self._cached_selection(e, source)
+        if cached is not None:
+            self.refreshing = False
+            self.supernovasFound = cached
+            self.set_results_text("")
+            self._finish_search(source)
+            return
+
+        # the search button stays enabled: searching again supersedes
         self.txtButton["state"] = tk.DISABLED
         self.pdfButton["state"] = tk.DISABLED
-        self.searchButton["state"] = tk.DISABLED
         
         self.start_progress_bar()
 
@@ -675,165 +738,520 @@ class SupernovasApp(tk.Tk):
             visibility_factory=self.visibility_factory,
             provider_factory=self.provider_factory,
             reporter=self.reporter,
+            previous_dtos=getattr(self, "last_rows", None),
+            previous_visibility=getattr(self, "last_visibility", None),
+            detail_fetcher=DetailFetcher() if self.fetchDetails.get() else None,
+            catalog=self._warm_catalog(source),
         )
+        self.search_thread = download_thread
+        self.search_source = source
+        # the worker wakes the Tk loop as soon as it posts an event
+        download_thread.events.notify = self._wake_search_events
         download_thread.start()
 
-        self.monitor(download_thread, source)
+        self._watch_search(download_thread)
 
-    def monitor(self, thread, source="SEARCH"):
-        if thread.is_alive():
-            # check the thread every 100ms
-            self.after(100, lambda: self.monitor(thread, source))
-        else:
+    def _cached_selection(self, e, source):
+        """Results of an earlier identical search, or None.
 
-            self.supernovasFound = thread.result
+        The catalog a new search would use is the warm one from the
+        refresher, else the last one downloaded. "Refresh Search" always
+        recomputes.
+        """
+        if source == "REFRESH":
+            return None
+        catalog = self._warm_catalog(source)
+        if catalog is None:
+            catalog = self.last_rows
+        if catalog is None:
+            return None
+        try:
+            key = RochesterSupernova().selectionKey(e, catalog, extra=(bool(self.fetchDetails.get()),))
+        except Exception:
+            return None
+        return self.selection_cache.get(key)
+
+    def _cancel_search(self):
+        """Ask the running search (if any) to stop; returns True if one was running."""
+        thread = self.search_thread
+        self.search_thread = None
+        if thread is not None:
+            thread.events.notify = None
+        if thread is not None and thread.is_alive():
+            thread.cancel_token.cancel()
+            return True
+        return False
 
-            # Populate results grid when data is available (also for PDF path)
+    def callbackCancelSearch(self):
+        """Cancel button: stop the running search and restore the controls."""
+        self._cancel_search()
+        self.refreshing = False
+        for button in (self.txtButton, self.pdfButton, self.searchButton):
             try:
-                if self.supernovasFound:
-                    # pass empty datatxt to indicate no error message
-                    try:
-                        self.set_results_text("")
-                    except Exception:
-                        pass
+                button["state"] = tk.NORMAL
             except Exception:
                 pass
+        self.end_progress_bar()
+
+    def _warm_catalog(self, source):
+        """Catalog kept by the background refresher, unless the user asked
+        for a refresh (which always goes to the network)."""
+        if source == "REFRESH" or self.refresher is None:
+            return None
+        catalog, _checked = self.refresher.latest()
+        return catalog
+
+    def _start_refresher(self):
+        minutes = self.refresh_minutes
+        self.refresher = CatalogRefresher(self.provider_factory, interval=max(1, minutes) * 60)
+        if minutes > 0:
+            self.refresher.start()
+        self._update_catalog_age()
+
+    def _update_catalog_age(self, schedule=False):
+        """Show how old the in-memory catalog is; repeats every 30 s."""
+        try:
+            age = self.refresher.age() if self.refresher is not None else None
+            if age is None:
+                text = ""
+            else:
+                text = _("Catalog updated: {age}").format(age=format_age(age))
+            self.catalogAgeLabel.config(text=text)
+        except Exception:
+            pass
+        if schedule:
+            self.after(30000, lambda: self._update_catalog_age(schedule=True))
+
+    def _show_timings(self, timer, source):
+        """Put the stage timings of a finished run in the status line and the log."""
+        try:
+            self.timingLabel.config(text=timer.summary())
+        except Exception:
+            pass
+        log_timings(timer, source=source)
+
+    def _wake_search_events(self):
+        """Called from the worker thread: schedule `_on_search_events`."""
+        self.event_generate("<<SearchEvents>>", when="tail")
+
+    def _watch_search(self, thread):
+        """Safety net for Tk builds that cannot take events from other
+        threads: look at the channel once a second while `thread` runs."""
+        if thread is not self.search_thread:
+            return
+        self._on_search_events()
+        if thread is self.search_thread:
+            self.after(1000, lambda: self._watch_search(thread))
 
-            # If download/parsing failed, show an error banner in the results
-            if self.supernovasFound is None:
-                err = getattr(thread, "error", None)
-                if err:
-                    self.set_results_text(f"ERROR: Failed to fetch/parse data - {err}")
+    def _on_search_events(self, event=None, limit=500):
+        """Apply the events posted by the running search (services.events).
+
+        Handles at most `limit` events per call and reschedules itself for
+        the rest so a burst of results does not block the UI.
+        """
+        thread = self.search_thread
+        if thread is None:
+            return
+        batch = []
+        final = None
+        for ev in thread.events.drain(limit):
+            if isinstance(ev, PartialResult):
+                batch.append(ev.supernova)
+            elif isinstance(ev, Progress):
+                self._show_progress(ev.done, ev.total)
+            elif isinstance(ev, StageStarted):
+                self._show_stage(ev.stage)
+            elif isinstance(ev, FINAL_EVENTS):
+                final = ev
+        if batch:
+            self._show_partial_results(thread, batch)
+        if final is not None:
+            self._complete_search(thread, getattr(self, "search_source", "SEARCH"))
+        elif not thread.events.empty():
+            self.after_idle(self._on_search_events)
+
+    def _show_stage(self, stage):
+        texts = {
+            "fetch": _("Downloading catalog..."),
+            "select": _("Computing visibility..."),
+            "details": _("Fetching discovery details..."),
+        }
+        try:
+            self.timingLabel.config(text=texts.get(stage, stage))
+        except Exception:
+            pass
+
+    def _show_progress(self, done, total):
+        """Switch the progress bar to determinate once the candidate count is known."""
+        try:
+            if total <= 0:
+                return
+            if str(self.progressBar.cget("mode")) != "determinate":
+                self.progressBar.stop()
+                self.progressBar.config(mode="determinate", maximum=total)
+            self.progressBar.config(value=done)
+            self.timingLabel.config(
+                text=_("Computing visibility: {done} of {total}").format(done=done, total=total)
+            )
+        except Exception:
+            pass
+
+    def _show_partial_results(self, thread, batch):
+        """Append results `thread` accepted before its final ranking.
+
+        The first batch replaces the previous results (keeping the rows,
+        selection and scroll position of the supernovae found again); the
+        final ranked list replaces the streamed rows when the search is
+        done.
+        """
+        try:
+            self._sync_selection_from_tree()
+            with timed(thread.timer, "constellations"):
+                assign_constellations(batch)
+            # streamed rows arrive unranked; show at most the requested
+            # number until the final ranked list replaces them
+            cap = getattr(thread.config, "maxResults", None)
+            if cap is not None:
+                batch = batch[:max(0, cap - thread.streamed)]
+            with timed(thread.timer, "render"):
+                if thread.streamed == 0:
+                    self.results_message = None
+                    self.results_model.update(batch)
                 else:
-                    self.set_results_text("ERROR: Failed to fetch data (no details)")
+                    self.results_model.append(batch)
+                thread.streamed += len(batch)
+                self.results_model.scroll_to(self.results_model.top, self.results_page)
+                self._render_results()
+        except Exception:
+            pass
 
-            if source == "PDF":
-                try:
-                    self.pdfButton["state"] = tk.NORMAL
-                    self.pdfButton.invoke()
-                except Exception:
-                    pass
-                # ensure other controls are re-enabled after PDF generation
-                try:
-                    self.txtButton["state"] = tk.NORMAL
-                except Exception:
-                    pass
-                try:
-                    self.searchButton["state"] = tk.NORMAL
-                except Exception:
-                    pass
-            elif source == "TXT":
-                try:
-                    self.txtButton["state"] = tk.NORMAL
-                    self.txtButton.invoke()
-                except Exception:
-                    pass
-                # ensure other controls are re-enabled after text output
-                try:
-                    self.pdfButton["state"] = tk.NORMAL
-                except Exception:
-                    pass
+    def _complete_search(self, thread, source="SEARCH"):
+        """The search posted its final event: show results or the error."""
+        self.search_thread = None
+        thread.events.notify = None
+
+        self.supernovasFound = thread.result
+
+        # remember the catalog and per-entry visibility so the next
+        # refresh only re-processes added/changed rows
+        if thread.result is not None:
+            if getattr(thread, "dto_list", None) is not None:
+                self.last_rows = thread.dto_list
+                if getattr(thread, "fetched", None) is not None and self.refresher is not None:
+                    self.refresher.offer(thread.dto_list, source=thread.fetched)
+                    self._update_catalog_age()
+            self.last_visibility = getattr(thread, "visibility", None)
+            delta = getattr(thread, "delta", None)
+            if delta is not None:
+                self.new_names = set(delta.added)
+            self.selection_cache.put(getattr(thread, "selection_key", None), thread.result)
+
+        # Populate results grid when data is available (also for PDF path)
+        try:
+            if self.supernovasFound:
+                # pass empty datatxt to indicate no error message
                 try:
-                    self.searchButton["state"] = tk.NORMAL
+                    self.set_results_text("", timer=thread.timer)
                 except Exception:
                     pass
-            elif source == "REFRESH":
+        except Exception:
+            pass
+
+        # If download/parsing failed, show an error banner in the results
+        if self.supernovasFound is None:
+            err = getattr(thread, "error", None)
+            if err:
+                self.set_results_text(f"ERROR: Failed to fetch/parse data - {err}")
+            else:
+                self.set_results_text("ERROR: Failed to fetch data (no details)")
+        else:
+            self._show_timings(thread.timer, source)
+
+        self._finish_search(source)
+
+    def _finish_search(self, source):
+        """Produce the output requested by `source` and restore the controls."""
+        if source == "PDF":
+            try:
+                self.pdfButton["state"] = tk.NORMAL
+                self.pdfButton.invoke()
+            except Exception:
+                pass
+            # ensure other controls are re-enabled after PDF generation
+            try:
                 self.txtButton["state"] = tk.NORMAL
-                self.txtButton.invoke()
-                # refresh completed
-                self.refreshing = False
+            except Exception:
+                pass
+            try:
+                self.searchButton["state"] = tk.NORMAL
+            except Exception:
+                pass
+        elif source == "TXT":
+            try:
                 self.txtButton["state"] = tk.NORMAL
+                self.txtButton.invoke()
+            except Exception:
+                pass
+            # ensure other controls are re-enabled after text output
+            try:
                 self.pdfButton["state"] = tk.NORMAL
-                self.searchButton["state"] = tk.NORMAL            
-                # cache raw rows if available for later re-filtering
-                try:
-                    self.last_rows = getattr(thread, "dto_list", None)
-                except Exception:
-                    self.last_rows = None
-            self.end_progress_bar()
+            except Exception:
+                pass
+            try:
+                self.searchButton["state"] = tk.NORMAL
+            except Exception:
+                pass
+        elif source == "REFRESH":
+            self.txtButton["state"] = tk.NORMAL
+            self.txtButton.invoke()
+            # refresh completed
+            self.refreshing = False
+            self.txtButton["state"] = tk.NORMAL
+            self.pdfButton["state"] = tk.NORMAL
+            self.searchButton["state"] = tk.NORMAL            
+        self.end_progress_bar()
 
     def start_progress_bar(self):
         # place progress bar under the Results textbox (results column)
         # and above the toolbar so it remains visible and doesn't overlap
-        self.progressBar.grid(column=3, row=10, columnspan=2, sticky="ew")
+        self.progressBar.grid(column=3, row=10, sticky="ew")
+        # indeterminate until the worker reports how many candidates it
+        # evaluates (see _show_progress)
+        self.progressBar.config(mode="indeterminate", value=0)
         self.progressBar.start()
+        try:
+            self.cancelButton.grid(column=4, row=10, sticky=tk.W, padx=5)
+        except Exception:
+            pass
 
     def end_progress_bar(self):
         self.progressBar.stop()
         self.progressBar.grid_forget()
+        try:
+            self.cancelButton.grid_forget()
+        except Exception:
+            pass
 
 
     def callbackClearResults(self, var, index, mode):
         self.supernovasFound = None
 
-    def set_results_text(self, datatxt: str):
-        """Helper to update the results table from supernova data."""
-        # Clear existing tree entries
+    def _present_row(self, sn):
+        """Return the results table cell values of `sn`."""
         try:
-            for item in self.resultsTree.get_children():
-                self.resultsTree.delete(item)
-            self.supernova_data.clear()
+            row = self.presenter.present(sn)
         except Exception:
-            pass
+            # Fallback to minimal row on presenter error
+            row = (
+                getattr(sn, 'name', ''),
+                getattr(sn, 'type', ''),
+                getattr(sn, 'mag', '') or '',
+                getattr(sn, 'date', '') or '',
+                '',
+                getattr(sn, 'host', ''),
+                getattr(sn, 'constellation', ''),
+                '',
+                '',
+                '🔗',
+                '🔗',
+            )
+        return row
+
+    def set_results_text(self, datatxt: str, timer=None):
+        """Helper to update the results table from supernova data.
+
+        Rows are matched by name with the displayed ones
+        (`ResultsModel.update`), so only added, removed and changed rows are
+        redrawn and the selection and scroll position are kept. `timer` (a
+        `PipelineTimer`) receives the constellations and render stages.
+        """
+        self._sync_selection_from_tree()
+        self.results_message = None
         
         # If datatxt is an error message, show it
         if datatxt and (datatxt.startswith("ERROR") or self.supernovasFound is None):
-            try:
-                # Insert error as a single row
-                self.resultsTree.insert("", "end", values=(datatxt, "", "", "", "", "", "", "", "", "", ""))
-            except Exception:
-                pass
+            # Show the error as a single row
+            self.results_model.clear()
+            self.results_message = datatxt
+            self._render_results()
             return
         
-        # Populate tree from self.supernovasFound
+        # Populate the table from self.supernovasFound
         try:
+            with timed(timer, "constellations"):
+                assign_constellations(self.supernovasFound)
+        except Exception:
             pass
+
+        try:
+            with timed(timer, "render", len(self.supernovasFound or ())):
+                self.results_model.update(self.supernovasFound or [])
+                self.results_model.scroll_to(self.results_model.top, self.results_page)
+                self._render_results()
+        except Exception as e:
+            # If population fails, show error
+            self.results_model.clear()
+            self.results_message = f"Error: {str(e)}"
+            self._render_results()
+
+    def _render_results(self):
+        """Show the page of `self.results_model` that starts at its `top` row.
+
+        The table holds one Treeview item per visible line; their values and
+        tags are rewritten in place, so the cost does not depend on the
+        number of results, and lines that already show the right content
+        (`self.displayed_lines`) are not touched.
+        """
+        try:
+            tree = self.resultsTree
+            model = self.results_model
+            displayed = self.displayed_lines
+            if len(model) == 0 and self.results_message:
+                lines = [((self.results_message,) + ("",) * 10, (), None)]
+            else:
+                lines = [
+                    (model.values(i), self._row_tags(model.rows[i], i), model.rows[i])
+                    for i in model.window(self.results_page)
+                ]
+            items = tree.get_children('')
+            self.supernova_data.clear()
+            selected = ()
+            redrawn = False
+            for slot, (values, tags, sn) in enumerate(lines):
+                if slot < len(items):
+                    item = items[slot]
+                    if displayed.get(item) != (values, tags):
+                        tree.item(item, values=values, tags=tags)
+                        redrawn = True
+                else:
+                    item = tree.insert("", "end", values=values, tags=tags)
+                displayed[item] = (values, tags)
+                if sn is not None:
+                    self.supernova_data[item] = sn
+                    if model.selected_name is not None and row_key(sn) == model.selected_name:
+                        selected = (item,)
+            if len(items) > len(lines):
+                tree.delete(*items[len(lines):])
+                for item in items[len(lines):]:
+                    displayed.pop(item, None)
+            if tuple(tree.selection()) != selected:
+                tree.selection_set(selected)
+            if selected:
+                tree.focus(selected[0])
+            # the Treeview scrolls by itself when a clicked line is cut off
+            tree.yview_moveto(0)
+            self.resultsScrollbar.set(*model.fraction(self.results_page))
+            if redrawn:
+                self._hide_tooltip()
         except Exception:
             pass
 
+    def _results_page_size(self):
+        """Number of whole result lines that fit in the results table."""
+        tree = self.resultsTree
+        try:
+            rowheight = int(ttk.Style(self).lookup("ResultsTreeview.Treeview", "rowheight") or 28)
+        except (tk.TclError, ValueError):
+            rowheight = 28
+        heading = rowheight
+        items = tree.get_children('')
+        if items:
+            bbox = tree.bbox(items[0])
+            if bbox:
+                heading = bbox[1]
+        return max(1, (tree.winfo_height() - heading) // rowheight)
+
+    def _on_results_configure(self, event=None):
+        """Resize the page of displayed rows to the results table height."""
+        try:
+            page = self._results_page_size()
+        except Exception:
+            return
+        if page != self.results_page:
+            self.results_page = page
+            self._sync_selection_from_tree()
+            self.results_model.scroll_to(self.results_model.top, page)
+            self._render_results()
+
+    def _scroll_results(self, delta=0, top=None):
+        """Scroll the results table by `delta` rows (or to row `top`)."""
+        self._sync_selection_from_tree()
+        if top is None:
+            self.results_model.scroll_by(delta, self.results_page)
+        else:
+            self.results_model.scroll_to(top, self.results_page)
+        self._render_results()
+
+    def _on_results_yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")."""
         try:
-            if self.supernovasFound:
-                for idx, sn in enumerate(self.supernovasFound):
-                    presenter = self.presenter
-                    try:
-                        row = presenter.present(sn)
-                    except Exception:
-                        # Fallback to minimal row on presenter error
-                        row = (
-                            getattr(sn, 'name', ''),
-                            getattr(sn, 'type', ''),
-                            getattr(sn, 'mag', '') or '',
-                            getattr(sn, 'date', '') or '',
-                            '',
-                            getattr(sn, 'host', ''),
-                            getattr(sn, 'constellation', ''),
-                            '',
-                            '',
-                            '🔗',
-                            '🔗',
-                        )
-
-                    # Determine brightness tag based on numeric magnitude
-                    mag_val = None
-                    try:
-                        mag_val = float(getattr(sn, 'mag', None)) if getattr(sn, 'mag', None) is not None else None
-                    except Exception:
-                        mag_val = None
+            if args[0] == "moveto":
+                self._scroll_results(top=self.results_model.top_for_fraction(args[1]))
+            elif args[0] == "scroll":
+                step = self.results_page if args[2] == "pages" else 1
+                self._scroll_results(int(args[1]) * step)
+        except Exception:
+            pass
 
-                    is_bright = mag_val is not None and mag_val < 15
-                    tag = ('evenrow_bright' if idx % 2 == 0 else 'oddrow_bright') if is_bright else ('evenrow' if idx % 2 == 0 else 'oddrow')
+    def _on_results_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            units = -1
+        elif getattr(event, "num", None) == 5:
+            units = 1
+        else:
+            units = -1 if event.delta > 0 else 1
+        self._scroll_results(3 * units)
+        return "break"
+
+    def _on_results_key(self, event):
+        """Move the selection through all results, not just the displayed page."""
+        model = self.results_model
+        if len(model) == 0:
+            return "break"
+        page = self.results_page
+        selected = self._selected_supernova()
+        current = model.index_of(selected) if selected is not None else None
+        if event.keysym == "Home":
+            index = 0
+        elif event.keysym == "End":
+            index = len(model) - 1
+        elif current is None:
+            index = model.top
+        else:
+            step = {"Up": -1, "Down": 1, "Prior": -page, "Next": page}.get(event.keysym, 0)
+            index = current + step
+        index = max(0, min(len(model) - 1, index))
+        model.selected = model.rows[index]
+        model.ensure_visible(index, page)
+        self._render_results()
+        self._on_selection_change()
+        return "break"
+
+    def _sync_selection_from_tree(self):
+        """Copy the Treeview selection of the displayed page into the model.
+
+        A selected supernova that was scrolled off the page stays selected;
+        one that is on the page but no longer selected there was deselected.
+        """
+        try:
+            selection = self.resultsTree.selection()
+        except Exception:
+            return
+        model = self.results_model
+        if selection and selection[0] in self.supernova_data:
+            model.selected = self.supernova_data[selection[0]]
+        elif model.selected_name is not None and any(
+            row_key(sn) == model.selected_name for sn in self.supernova_data.values()
+        ):
+            model.selected_name = None
+
+    def _selected_supernova(self):
+        """Return the selected result, picking up changes made on the table first."""
+        self._sync_selection_from_tree()
+        return self.results_model.selected
 
-                    item_id = self.resultsTree.insert("", "end", values=row, tags=(tag,))
-                    self.supernova_data[item_id] = sn
-        except Exception as e:
-            # If population fails, show error
-            try:
-                self.resultsTree.insert("", "end", values=(f"Error: {str(e)}", "", "", "", "", "", "", "", "", "", ""))
-            except Exception:
-                pass
-    
     def _sort_column(self, col, is_numeric):
-        """Sort treeview by column."""
+        """Sort the results by column."""
         try:
             # Toggle sort direction if same column clicked
             if self.sort_column == col:
@@ -842,55 +1260,24 @@ class SupernovasApp(tk.Tk):
                 self.sort_column = col
                 self.sort_reverse = False
             
-            # Get column index
             col_idx = self.resultsTree['columns'].index(col)
-            
-            # Get all items with their values
-            items = [(self.resultsTree.set(item, col), item) for item in self.resultsTree.get_children('')]
-            
-            # Sort items
-            if is_numeric:
-                # Numeric sort - handle empty values
-                def sort_key(x):
-                    try:
-                        return float(x[0]) if x[0] else float('inf')
-                    except (ValueError, TypeError):
-                        return float('inf')
-                items.sort(key=sort_key, reverse=self.sort_reverse)
+            selected = self._selected_supernova()
+            self.results_model.sort(col_idx, is_numeric, self.sort_reverse, key=SORT_KEYS.get(col))
+
+            # keep the selected row in view, otherwise show the first rows
+            index = self.results_model.index_of(selected) if selected is not None else None
+            if index is None:
+                self.results_model.scroll_to(0, self.results_page)
             else:
-                # Alphabetic sort
-                items.sort(key=lambda x: x[0].lower() if x[0] else '', reverse=self.sort_reverse)
-            
-            # Rearrange items in sorted order
-            for index, (val, item) in enumerate(items):
-                self.resultsTree.move(item, '', index)
-                
-                # Reapply alternating row colors and brightness after sorting
-                try:
-                    if item in self.supernova_data:
-                        sn = self.supernova_data[item]
-                        mag = getattr(sn, 'mag', None)
-                        try:
-                            is_bright = mag is not None and float(mag) < 15
-                        except (ValueError, TypeError):
-                            is_bright = False
-                        
-                        if is_bright:
-                            tag = 'evenrow_bright' if index % 2 == 0 else 'oddrow_bright'
-                        else:
-                            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-                        
-                        self.resultsTree.item(item, tags=(tag,))
-                except Exception:
-                    pass
+                self.results_model.ensure_visible(index, self.results_page)
+            self._render_results()
         except Exception:
             pass
     
-    def _on_selection_change(self, event):
-        """Enable or disable Find stars button based on tree selection."""
+    def _on_selection_change(self, event=None):
+        """Enable or disable Find stars button based on the selection."""
         try:
-            selection = self.resultsTree.selection()
-            if selection and len(selection) > 0:
+            if self._selected_supernova() is not None:
                 self.findStarsButton.config(state=tk.NORMAL)
             else:
                 self.findStarsButton.config(state=tk.DISABLED)
@@ -900,16 +1287,10 @@ class SupernovasApp(tk.Tk):
     def _find_stars_in_simbad(self):
         """Query SIMBAD for objects near the selected supernova."""
         try:
-            selection = self.resultsTree.selection()
-            if not selection or len(selection) == 0:
-                return
-            
-            item = selection[0]
-            if item not in self.supernova_data:
+            sn = self._selected_supernova()
+            if sn is None:
                 return
             
-            sn = self.supernova_data[item]
-            
             
             # Build SIMBAD query URL for the region around the supernova
             # Using the web interface format
@@ -1008,6 +1389,10 @@ class SupernovasApp(tk.Tk):
                     first_obs = getattr(sn, 'firstObserved', None)
                     if first_obs:
                         tooltip_lines.append(f"First observed: {first_obs}")
+
+                    discoverer = getattr(sn, 'discoverer', None)
+                    if discoverer:
+                        tooltip_lines.append(f"Discoverer: {discoverer}")
                     
                     max_mag = getattr(sn, 'maxMagnitude', None)
                     max_mag_date = getattr(sn, 'maxMagnitudeDate', None)
@@ -1223,6 +1608,32 @@ class SupernovasApp(tk.Tk):
             self.entryLatitud = ttk.Entry(parent_for_lat, textvariable=self.minLatitud)
             self.entryLatitud.grid(column=1, row=7, padx=5, pady=5, sticky=tk.W)
 
+            # Optional enrichment from the per-SN Rochester detail pages
+            self.fetchDetailsToggle = ttk.Checkbutton(
+                left_frame, text=_("Fetch discovery details"), variable=self.fetchDetails
+            )
+            self.fetchDetailsToggle.grid(column=0, row=11, columnspan=2, padx=5, pady=5, sticky=tk.W)
+
+            # Optional filter expression, e.g. "type contains Ia and mag between 13 and 16"
+            self.labelFilter = ttk.Label(left_frame, text=_("Filter: "))
+            self.labelFilter.grid(column=0, row=12, padx=5, pady=5, sticky=tk.W)
+            self.entryFilter = ttk.Entry(left_frame, textvariable=self.filterExpression, width=40)
+            self.entryFilter.grid(column=1, row=12, columnspan=2, padx=5, pady=5, sticky=tk.W)
+
+            # Show only the best N results in the chosen order (services.ranking)
+            self.labelShow = ttk.Label(left_frame, text=_("Show best: "))
+            self.labelShow.grid(column=0, row=13, padx=5, pady=5, sticky=tk.W)
+            self.cbMaxResults = ttk.Combobox(
+                left_frame, values=["25", "50", "100", "200", _("All")], textvariable=self.maxResults, width=6
+            )
+            self.cbMaxResults.grid(column=1, row=13, padx=5, pady=5, sticky=tk.W)
+            self.cbSortBy = ttk.Combobox(
+                left_frame, values=list(self._sort_labels().values()), textvariable=self.sortLabel,
+                state="readonly", width=14,
+            )
+            self.cbSortBy.grid(column=2, row=13, padx=5, pady=5, sticky=tk.W)
+            self.cbSortBy.bind('<<ComboboxSelected>>', lambda ev: self._on_sort_label())
+
             # Persist preferences when key UI options change
             try:
                 cb = lambda *a: (self.callbackClearResults(*a), self._persist_prefs())
@@ -1234,6 +1645,11 @@ class SupernovasApp(tk.Tk):
                 vis_cb = lambda *a: (self.callbackClearResults(*a), self._persist_prefs(), self._update_visibility_ui())
                 self._safe_trace_add(self.visibilityWindow, vis_cb)
 
+                self._safe_trace_add(self.fetchDetails, cb)
+                self._safe_trace_add(self.filterExpression, cb)
+                self._safe_trace_add(self.maxResults, cb)
+                self._safe_trace_add(self.sortBy, cb)
+
                 try:
                     if getattr(self, 'langVar', None):
                         self._safe_trace_add(self.langVar, lambda *a: (self._persist_prefs(),))
@@ -1292,9 +1708,12 @@ class SupernovasApp(tk.Tk):
             self.resultsTree.column("rochester", width=80, anchor=tk.CENTER)
             self.resultsTree.column("tns", width=60, anchor=tk.CENTER)
 
-            vsb = ttk.Scrollbar(results_frame, orient="vertical", command=self.resultsTree.yview)
+            # The tree only holds the displayed page of results (see
+            # app.ui.results_view); the vertical scrollbar moves the page.
+            vsb = ttk.Scrollbar(results_frame, orient="vertical", command=self._on_results_yview)
             hsb = ttk.Scrollbar(results_frame, orient="horizontal", command=self.resultsTree.xview)
-            self.resultsTree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+            self.resultsTree.configure(xscrollcommand=hsb.set)
+            self.resultsScrollbar = vsb
 
             self.resultsTree.grid(column=0, row=0, sticky="nsew")
             vsb.grid(column=1, row=0, sticky="ns")
@@ -1305,8 +1724,19 @@ class SupernovasApp(tk.Tk):
             self.resultsTree.bind("<Motion>", self._on_results_motion)
             self.resultsTree.bind("<Leave>", self._on_results_leave)
             self.resultsTree.bind("<<TreeviewSelect>>", self._on_selection_change)
+            self.resultsTree.bind("<Configure>", self._on_results_configure)
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                self.resultsTree.bind(sequence, self._on_results_wheel)
+            for key in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+                self.resultsTree.bind(key, self._on_results_key)
 
+            # item id -> supernova shown on that line of the current page
             self.supernova_data = {}
+            self.results_model = ResultsModel(self._present_row)
+            self.results_message = None
+            self.results_page = int(self.resultsTree.cget("height"))
+            # item id -> (values, tags) it currently shows
+            self.displayed_lines = {}
             self.tooltip_window = None
             self.tooltip_item = None
 
@@ -1382,6 +1812,7 @@ class SupernovasApp(tk.Tk):
             self.exitButton.grid(column=3, row=15, padx=5, pady=5, sticky=tk.E)
 
             self.progressBar = ttk.Progressbar(self, mode='indeterminate', length = 400 )
+            self.cancelButton = ttk.Button(self, text=_("Cancel"), command=lambda: self.callbackCancelSearch())
         except Exception:
             pass
 
@@ -1405,8 +1836,13 @@ class SupernovasApp(tk.Tk):
                 provider_factory=self.provider_factory,
                 reporter=self.reporter,
             )
-            # compute with current filters
-            new_results = rochester.selectAndSortSupernovas(self.getDataToSearch(), self.last_rows)
+            # compute with current filters (or reuse an identical earlier search)
+            e = self.getDataToSearch()
+            key = rochester.selectionKey(e, self.last_rows, extra=(False,))
+            new_results = self.selection_cache.get(key)
+            if new_results is None:
+                new_results = rochester.selectAndSortSupernovas(e, self.last_rows)
+                self.selection_cache.put(key, new_results)
             self.supernovasFound = new_results
 
             # show results according to source
@@ -1449,21 +1885,15 @@ class SupernovasApp(tk.Tk):
 
     def callbackIgnoreSelectedSN(self):
         """Add the currently selected SN from the Results table to the
-        user's `old_supernovae.txt`, sorting and deduplicating the file.
+        user's `old_supernovae.txt` (`IgnoreList.add` appends one line and
+        skips names that are already ignored).
         """
         # get selection from tree
         try:
-            selection = self.resultsTree.selection()
-            if not selection:
+            sn = self._selected_supernova()
+            if sn is None:
                 messagebox.showinfo(_("No selection"), _("No supernova selected in the Results table."))
                 return
-            
-            item = selection[0]
-            if item not in self.supernova_data:
-                messagebox.showinfo(_("No selection"), _("No supernova data found for selection."))
-                return
-            
-            sn = self.supernova_data[item]
             name = getattr(sn, 'name', '').strip()
         except Exception:
             messagebox.showinfo(_("No selection"), _("No supernova selected in the Results table."))
@@ -1473,39 +1903,13 @@ class SupernovasApp(tk.Tk):
             messagebox.showinfo(_("No selection"), _("Selected supernova has no name."))
             return
 
-        # determine path
-        try:
-            cfgdir = get_user_config_dir()
-            os.makedirs(cfgdir, exist_ok=True)
-            path = os.path.join(cfgdir, "old_supernovae.txt")
-        except Exception:
-            path = os.path.join(os.path.dirname(__file__), "old_supernovae.txt")
-
-        # read existing
-        existing = []
-        try:
-            with open(path, "r", encoding="utf-8") as fh:
-                existing = [l.strip() for l in fh if l.strip() and not l.strip().startswith("#")]
-        except Exception:
-            existing = []
-
-        if name in existing:
+        if name in old:
             messagebox.showinfo(_("Already present"), _("'{name}' is already ignored.").format(name=name))
             return
 
-        existing.append(name)
-        unique_sorted = sorted(set(existing), key=lambda s: s.lower())
-
         try:
-            with open(path, "w", encoding="utf-8") as fh:
-                for ln in unique_sorted:
-                    fh.write(ln + "\n")
-            # reload global old list
-            try:
-                global old
-                old = load_old_supernovae(path)
-            except Exception:
-                pass
+            # appends one line to the ignore file; the list updates in place
+            old.add(name)
             messagebox.showinfo(_("Added"), _("Added '{name}' to ignored supernovae.").format(name=name))
             # Auto-reload results using cached rows when possible
             try:
@@ -1523,23 +1927,17 @@ class SupernovasApp(tk.Tk):
     def callbackEditOldSupernovae(self):
         """Open a simple dialog to edit the user's `old_supernovae.txt` file.
 
-        The editor writes to the user config directory returned by
-        `get_user_config_dir()` and updates the global `old` list when saved.
+        The editor writes the file behind the global `old` IgnoreList (in
+        the user config directory) and updates the list when saved.
         """
-        try:
-            cfgdir = get_user_config_dir()
-            os.makedirs(cfgdir, exist_ok=True)
-            path = os.path.join(cfgdir, "old_supernovae.txt")
-        except Exception:
-            # fallback to package-local file if user config dir can't be used
-            path = os.path.join(os.path.dirname(__file__), "old_supernovae.txt")
+        path = old.path
 
         # Load current contents (preserve comments and blank lines minimally)
         try:
             with open(path, "r", encoding="utf-8") as fh:
                 current = fh.read()
         except Exception:
-            current = "" if old is None else "\n".join(old)
+            current = "\n".join(old)
 
         # Create editor window
         editor = tk.Toplevel(self)
@@ -1554,19 +1952,9 @@ class SupernovasApp(tk.Tk):
         def do_save():
             content = txt.get("1.0", "end").strip()
             try:
-                # Normalize: keep only non-empty, non-comment lines
-                lines = [line.strip() for line in content.splitlines() if line.strip() and not line.strip().startswith("#")]
-                # Deduplicate and sort (case-insensitive sort)
-                unique_sorted = sorted(set(lines), key=lambda s: s.lower())
-                with open(path, "w", encoding="utf-8") as fh:
-                    for ln in unique_sorted:
-                        fh.write(ln + "\n")
-                # update global old list so the running app respects changes
-                try:
-                    global old
-                    old = load_old_supernovae(path)
-                except Exception:
-                    pass
+                # keeps non-comment lines, deduplicated and sorted; the
+                # running app sees the new list immediately
+                old.replace(content.splitlines())
                 editor.destroy()
                 # Auto-reload results using cached rows when possible
                 try:
@@ -1696,6 +2084,8 @@ class SupernovasApp(tk.Tk):
                     visibility_windows = new_vis
                 except Exception:
                     visibility_windows = new_vis
+                # the selection pipeline reads the windows from its own module
+                selection.visibility_windows = new_vis
 
                 try:
                     vals = [""] + sorted(list(visibility_windows.keys()))
@@ -1741,6 +2131,19 @@ class SupernovasApp(tk.Tk):
 
         self.supernovasFound = None
         self.refreshing = False
+        # running AsyncRochesterDownload (at most one, see _cancel_search)
+        # and the action that started it ("SEARCH", "PDF", "TXT", "REFRESH")
+        self.search_thread = None
+        self.search_source = "SEARCH"
+        # posted by the worker's EventChannel (see _wake_search_events)
+        self.bind("<<SearchEvents>>", self._on_search_events)
+        # results of recent searches by RochesterSupernova.selectionKey
+        self.selection_cache = SelectionCache()
+        # parsed catalog and visibility of the last run, plus the names that
+        # were added by the last refresh (highlighted in the results table)
+        self.last_rows = None
+        self.last_visibility = None
+        self.new_names = set()
         
         # Create dark_mode variable first (required by apply_theme)
         self.dark_mode = tk.BooleanVar(value=True)
@@ -1784,6 +2187,19 @@ class SupernovasApp(tk.Tk):
 
         self.results = tk.StringVar()
         self.results.trace_add(["write", "unset"], self.callbackClearResults)
+
+        # fetch detail pages (discoverer, recent magnitudes) for the results
+        self.fetchDetails = tk.BooleanVar(value=False)
+        # filter expression applied on top of the search fields
+        self.filterExpression = tk.StringVar()
+        # result limit ("All" keeps every result) and order
+        # (services.ranking); sortLabel is its translated combobox text
+        self.maxResults = tk.StringVar(value="100")
+        self.sortBy = tk.StringVar(value=DEFAULT_ORDER)
+        self.sortLabel = tk.StringVar(value=self._sort_labels()[DEFAULT_ORDER])
+        # background catalog refresh period (prefs "refreshMinutes", 0 = off)
+        self.refresh_minutes = 30
+        self.refresher = None
         # Dark mode variable already created earlier (before apply_theme call)
         self.dark_mode.trace_add(["write", "unset"], lambda *a: None)
         
@@ -1930,6 +2346,16 @@ class SupernovasApp(tk.Tk):
         # legacy placement removed; button moved next to the Results controls
 
         self.progressBar = ttk.Progressbar(self, mode='indeterminate', length = 400 );
+        self.cancelButton = ttk.Button(self, text=_("Cancel"), command=lambda: self.callbackCancelSearch())
+
+        # age of the warm catalog kept by the background refresher
+        self.catalogAgeLabel = ttk.Label(self, text="")
+        self.catalogAgeLabel.grid(column=3, row=12, sticky=tk.W, padx=5)
+        # per-stage timings of the last search (see services.timing)
+        self.timingLabel = ttk.Label(self, text="")
+        self.timingLabel.grid(column=3, row=13, columnspan=2, sticky=tk.W, padx=5)
+        self._start_refresher()
+        self._update_catalog_age(schedule=True)
 
     def _on_language_change(self):
         """Handler when UI language selection changes: apply and refresh labels."""
@@ -1969,6 +2395,10 @@ class SupernovasApp(tk.Tk):
                 pass
             self.labelVisibility.config(text=_("Visibility window:"))
             self.labelLatitud.config(text=_("Min latitude: "))
+            try:
+                self.fetchDetailsToggle.config(text=_("Fetch discovery details"))
+            except Exception:
+                pass
             self.labelResults.config(text=_("Results: "))
             try:
                 self.darkToggle.config(text=_("Dark mode"))
@@ -1984,6 +2414,21 @@ class SupernovasApp(tk.Tk):
                 self.txtButton.config(text=_("TXT"))
                 self.searchButton.config(text=_("Refresh Search"))
                 self.exitButton.config(text=_("Exit"))
+                self.cancelButton.config(text=_("Cancel"))
+            except Exception:
+                pass
+            try:
+                self.labelFilter.config(text=_("Filter: "))
+            except Exception:
+                pass
+            try:
+                limit = self._result_limit()
+                self.labelShow.config(text=_("Show best: "))
+                self.cbMaxResults.config(values=["25", "50", "100", "200", _("All")])
+                self.cbSortBy.config(values=list(self._sort_labels().values()))
+                self.sortLabel.set(self._sort_labels()[self._sort_order()])
+                if limit is None:
+                    self.maxResults.set(_("All"))
             except Exception:
                 pass
             # Update window title
@@ -2047,7 +2492,15 @@ def main():
     
 
     filters = SearchFilters(mag, daysToSearch, datetime.now(), "21:00", 5, site, 25)
-    app = SupernovasApp(filters)
+    # optionally archive every fetched page for offline replay (services.replay)
+    primary_factory = None
+    archive_dir = os.environ.get("GETSUPERNOVAE_ARCHIVE_DIR")
+    if archive_dir:
+        primary_factory = functools.partial(NetworkRochesterProvider, archive=SnapshotArchive(archive_dir))
+
+    # merge local candidate lists (catalog_sources.json) with Rochester
+    provider_factory = make_provider_factory(load_catalog_sources(), primary_factory)
+    app = SupernovasApp(filters, provider_factory=provider_factory)
     app.mainloop()
 
 
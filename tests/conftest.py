@@ -0,0 +1,32 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+from astropy.coordinates import SkyCoord
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.dto import SupernovaDTO
+
+DEFAULT_POSITION = ('12h00m00s', '+30d00m00s')
+
+
+@pytest.fixture
+def supernova_row():
+    """Factory of catalog rows as providers return them.
+
+    `supernova_row('a', mag=15.0)` is SN2025a discovered on 2025-12-01 at
+    12h +30d. `position` is (ra, dec) as text or in degrees, `day=None`
+    leaves the date empty, `position=None` the coordinates, and other
+    keywords are passed to `SupernovaDTO`.
+    """
+    coordinates = {}
+
+    def make(suffix, day='2025-12-01', mag=14.0, position=DEFAULT_POSITION, **fields):
+        if position is not None and position not in coordinates:
+            coordinates[position] = SkyCoord(*position, unit='deg')
+        return SupernovaDTO(
+            f'SN2025{suffix}', day, date.fromisoformat(day) if day else None, mag,
+            coordinates=coordinates.get(position), **fields)
+    return make
@@ -0,0 +1,79 @@
+import functools
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services import selection
+from app.services.api_server import ApiServer, CandidatesService
+from app.services.provider import FileRochesterProvider
+from app.services.refresher import CatalogRefresher
+from benchmarks.synthetic import generate_page
+from getsupernovae import sites
+
+QUERY = '/candidates?site=Sabadell&date=2026-03-12&mag=18&days=30'
+
+
+@pytest.fixture
+def server(tmp_path):
+    page = tmp_path / 'rochester.html'
+    page.write_text(generate_page(60))
+    refresher = CatalogRefresher(functools.partial(FileRochesterProvider, str(page)))
+    httpd = ApiServer(('127.0.0.1', 0), CandidatesService(refresher, sites), workers=4)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(server, path):
+    url = 'http://127.0.0.1:%d%s' % (server.server_address[1], path)
+    try:
+        with urllib.request.urlopen(url, timeout=60) as resp:
+            return resp.status, dict(resp.headers), json.loads(resp.read())
+    except urllib.error.HTTPError as ex:
+        return ex.code, dict(ex.headers), json.loads(ex.read())
+
+
+def test_candidates_are_selected_once_then_cached(server):
+    status, headers, data = get(server, QUERY)
+    assert status == 200 and headers['X-Cache'] == 'MISS'
+    assert data['site']['name'] == 'Sabadell' and data['observationDate'] == '2026-03-12'
+    assert data['count'] == len(data['supernovae']) > 0
+
+    status, headers, again = get(server, QUERY)
+    assert headers['X-Cache'] == 'HIT'
+    assert again['supernovae'] == data['supernovae']
+    assert get(server, '/health')[2]['cacheHits'] == 1
+
+
+def test_concurrent_identical_queries_compute_once(server, monkeypatch):
+    calls = []
+    select = selection.RochesterSupernova.selectAndSortSupernovas
+
+    def counting(self, *args, **kwargs):
+        calls.append(1)
+        return select(self, *args, **kwargs)
+
+    monkeypatch.setattr(selection.RochesterSupernova, 'selectAndSortSupernovas', counting)
+    with ThreadPoolExecutor(4) as pool:
+        answers = list(pool.map(lambda _: get(server, QUERY + '&hours=3'), range(4)))
+    assert all(status == 200 for status, _, _ in answers)
+    assert len({json.dumps(data['supernovae']) for _, _, data in answers}) == 1
+    assert len(calls) == 1
+
+
+def test_errors_are_json(server):
+    status, _, data = get(server, '/candidates?mag=bright')
+    assert status == 400 and 'invalid search settings' in data['error']
+    assert get(server, '/candidates?site=Nowhere')[0] == 404
+    assert get(server, '/nothing')[0] == 404
+    assert get(server, '/sites')[2]['sites'] == list(sites)
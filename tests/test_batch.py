@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.batch import BatchJob, BatchResult, batch_summary, expand_dates, run_batch, summary_text
+from app.services.selection import SupernovaCallBackData
+from getsupernovae import sites
+
+
+@pytest.fixture
+def rows(supernova_row):
+    # near the celestial pole: visible all night from Sabadell
+    pole = ('02h00m00s', '+85d00m00s')
+    return [
+        supernova_row('a', type='Ia', position=pole),
+        supernova_row('b', '2025-12-02', 19.0, type='II', position=pole),
+    ]
+
+
+def job(day, site='Sabadell'):
+    return BatchJob(site, SupernovaCallBackData('16', day, '21:00', '2', '30', sites[site], '20'))
+
+
+def test_expand_dates_merges_lists_and_ranges():
+    assert expand_dates(['2026-04-03', '2026-04-01'], '2026-04-02', '2026-04-03') == [
+        '2026-04-01', '2026-04-02', '2026-04-03']
+    assert expand_dates(start='2026-04-30') == ['2026-04-30']
+    with pytest.raises(ValueError):
+        expand_dates(start='2026-04-02', end='2026-04-01')
+    with pytest.raises(ValueError):
+        expand_dates(['04/01/2026'])
+
+
+def test_run_batch_reports_each_night(rows):
+    written = []
+
+    def report(j, supernovas):
+        written.append((j.date, j.site_name))
+        return f'{j.date}.txt'
+
+    jobs = [job('2025-12-05'), job('2025-12-06'), job('2025-12-06', 'Requena')]
+    results = run_batch(rows, jobs, report=report)
+
+    assert [(r.date, r.site_name) for r in results] == written
+    assert all(r.names == ['SN2025a'] and r.error is None for r in results)
+    assert results[0].path == '2025-12-05.txt'
+
+
+def test_run_batch_in_worker_processes(rows):
+    results = run_batch(rows, [job('2025-12-05'), job('2025-12-06')], workers=2)
+    assert [r.date for r in results] == ['2025-12-05', '2025-12-06']
+    assert all(r.count == 1 for r in results)
+
+
+def test_failed_report_is_recorded_per_job(rows):
+    def report(j, supernovas):
+        raise OSError('disk full')
+
+    results = run_batch(rows, [job('2025-12-05')], report=report)
+    assert results[0].error == 'disk full' and results[0].count == 1
+
+
+def test_summary_lists_candidates_seen_on_several_nights():
+    results = [
+        BatchResult('2026-04-01', 'Sabadell', 2, ['SN1', 'SN2']),
+        BatchResult('2026-04-01', 'Requena', 1, ['SN1']),
+        BatchResult('2026-04-02', 'Sabadell', 1, ['SN1'], error=None),
+    ]
+    summary = batch_summary(results)
+    assert summary['candidates'] == 2
+    assert summary['recurring'] == [{'name': 'SN1', 'nights': ['2026-04-01', '2026-04-02']}]
+    assert 'SN1: 2 nights' in summary_text(results)
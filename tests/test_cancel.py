@@ -0,0 +1,101 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.snmodels import AxCordInTime, Visibility
+from app.services.cancel import CancellationToken, OperationCancelled
+from app.services.events import SearchCancelled
+from app.services.httpclient import HTTPConnectionPool
+from app.services.provider import RochesterProvider
+from getsupernovae import AsyncRochesterDownload, RochesterSupernova, SupernovaCallBackData, sites
+
+from benchmarks.synthetic import generate_page
+
+
+class CancellingVisibility:
+    """Visible; cancels `token` after the first computation."""
+
+    token = None
+
+    def __init__(self, minAlt, maxAlt, minAz, maxAz):
+        pass
+
+    def getVisibility(self, site, coord, t1, t2):
+        CancellingVisibility.token.cancel()
+        return Visibility(True, [AxCordInTime(t1, None)])
+
+
+@pytest.fixture
+def rows(supernova_row):
+    return [supernova_row(c) for c in 'abc']
+
+
+def test_visibility_loop_stops_at_next_entry(rows):
+    token = CancellationToken()
+    CancellingVisibility.token = token
+    selector = RochesterSupernova(visibility_factory=CancellingVisibility)
+    it = selector.iterSupernovas(
+        rows, '16', datetime(2025, 12, 5), '21:00', 4, '2025-11-05', sites['Sabadell'], cancel=token)
+    assert next(it).name == 'SN2025a'
+    with pytest.raises(OperationCancelled):
+        next(it)
+
+
+def test_parser_checks_token():
+    provider = RochesterProvider()
+    provider.cancel = CancellationToken()
+    provider.cancel.cancel()
+    with pytest.raises(OperationCancelled):
+        provider.parse_html(generate_page(50))
+
+
+class VisibleAllNight:
+    def __init__(self, minAlt, maxAlt, minAz, maxAz):
+        pass
+
+    def getVisibility(self, site, coord, t1, t2):
+        return Visibility(True, [AxCordInTime(t1, None), AxCordInTime(t2, None)])
+
+
+class CancellingFetcher:
+    """Detail fetcher whose search is cancelled while the pages load."""
+
+    def __init__(self, token):
+        self.token = token
+
+    def fetch_many(self, urls, cancel=None):
+        assert cancel is self.token
+        self.token.cancel()
+        return {}
+
+
+def test_download_is_not_started_when_cancelled():
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        HTTPConnectionPool().get('http://127.0.0.1:9/never', cancel=token)
+
+
+def test_cancelled_thread_reports_no_error(rows):
+    token = CancellationToken()
+    CancellingVisibility.token = token
+    e = SupernovaCallBackData('16', '2025-12-05', '21:00', '4', '30', sites['Sabadell'], '0')
+    thread = AsyncRochesterDownload(e, visibility_factory=CancellingVisibility, catalog=rows, cancel=token)
+    thread.run()
+    assert thread.cancelled
+    assert thread.result is None and thread.error is None
+    assert isinstance(thread.events.drain()[-1], SearchCancelled)
+
+
+def test_cancel_during_detail_enrichment_drops_the_result(rows):
+    token = CancellationToken()
+    e = SupernovaCallBackData('16', '2025-12-05', '21:00', '4', '30', sites['Sabadell'], '0')
+    thread = AsyncRochesterDownload(e, visibility_factory=VisibleAllNight, catalog=rows, cancel=token,
+                                    detail_fetcher=CancellingFetcher(token))
+    thread.run()
+    assert thread.cancelled and thread.result is None
+    assert isinstance(thread.events.drain()[-1], SearchCancelled)
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.catalog import SupernovaCatalog
+from app.models.dto import SupernovaDTO
+from app.services.delta import diff_catalogs
+from app.services.provider import FileRochesterProvider, RochesterProvider
+from benchmarks.synthetic import render_page, generate_rows
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'snactive.html')
+FIELDS = ('name', 'date', 'date_obj', 'mag', 'host', 'ra', 'decl', 'link', 'firstObserved',
+          'maxMagnitude', 'maxMagnitudeDate', 'type', 'maxMagnitudeDate_obj',
+          'firstObserved_obj', 'row_hash', 'mag_limit')
+
+
+def test_rows_behave_like_dtos():
+    dtos = FileRochesterProvider(FIXTURE).fetch()
+    dtos.append(SupernovaDTO('SN2025none'))
+    catalog = SupernovaCatalog.from_dtos(dtos)
+
+    assert len(catalog) == len(dtos)
+    for dto, row in zip(dtos, catalog):
+        for f in FIELDS:
+            assert getattr(row, f) == getattr(dto, f), f
+        if dto.coordinates is None:
+            assert row.coordinates is None
+        else:
+            assert row.coordinates.separation(dto.coordinates).arcsec < 1e-6
+    assert catalog[-1].to_dto() == dtos[-1]
+    assert np.isnan(catalog.mag[-1])
+
+
+def test_columns_take_and_arrays_roundtrip():
+    rows = list(generate_rows(50, seed=1, malformed_fraction=0))
+    catalog = SupernovaCatalog.from_dtos(RochesterProvider().parse_html(render_page(rows)))
+
+    bright = catalog.take(catalog.mag < 15)
+    assert len(bright) == int((catalog.mag < 15).sum())
+    assert all(r.mag < 15 for r in bright)
+
+    again = SupernovaCatalog.from_arrays(catalog.to_arrays())
+    assert [r.host for r in again] == [r.host for r in catalog]
+    assert np.array_equal(again.ordinals('date_obj'), catalog.ordinals('date_obj'))
+
+
+def test_catalog_as_previous_fetch():
+    html = render_page(list(generate_rows(20, seed=2, malformed_fraction=0)))
+    provider = RochesterProvider()
+    provider.previous = SupernovaCatalog.from_dtos(provider.parse_html(html))
+
+    second = provider.parse_html(html)
+    assert all(isinstance(d, SupernovaDTO) for d in second)
+    assert provider.last_delta.is_empty
+    assert diff_catalogs(provider.previous, second).unchanged == {d.name for d in second}
@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from app import cli
+from benchmarks.synthetic import generate_page
+
+# synthetic discovery dates end on this day (see benchmarks.synthetic)
+DATE = '2026-03-12'
+
+
+@pytest.fixture(scope='module')
+def page(tmp_path_factory):
+    path = tmp_path_factory.mktemp('cli') / 'rochester.html'
+    path.write_text(generate_page(60))
+    return str(path)
+
+
+def search_args(page, *extra):
+    return ['search', '--source', page, '--date', DATE, '--mag', '18', '--days', '30', *extra]
+
+
+def test_json_report_lists_selected_supernovae(page, tmp_path):
+    out = tmp_path / 'tonight.json'
+    assert cli.main(search_args(page, '--format', 'json', '-o', str(out))) == 0
+
+    report = json.loads(out.read_text())
+    assert report['observationDate'] == DATE and report['magnitude'] == 18.0
+    assert report['count'] == len(report['supernovae']) > 0
+    sn = report['supernovae'][0]
+    assert sn['name'].startswith('SN') and sn['mag'] <= 18
+    assert sn['constellation']
+    assert sn['visibility']['from'].startswith(DATE) and sn['visibility']['maxAlt'] >= 25
+
+
+def test_text_report_goes_to_stdout(page, capsys):
+    assert cli.main(search_args(page, '--filter', 'mag < 14')) == 0
+    out = capsys.readouterr().out
+    assert out.startswith('Supernovae from: 2026-02-10 to 2026-03-12')
+
+
+def test_invalid_arguments_exit_with_status_2(page, capsys):
+    for extra in (['--site', 'Nowhere'], ['--filter', 'mag <'], ['--date', '12/03/2026']):
+        with pytest.raises(SystemExit) as exc:
+            cli.main(search_args(page, *extra))
+        assert exc.value.code == 2
+    assert 'unknown site' in capsys.readouterr().err
+
+
+def test_missing_source_exits_with_status_1(tmp_path):
+    assert cli.main(search_args(str(tmp_path / 'missing.html'))) == 1
+
+
+def test_search_command_does_not_load_tkinter(page, tmp_path):
+    out = tmp_path / 'tonight.json'
+    code = (
+        'import runpy, sys\n'
+        f'sys.argv = ["getsupernovae.py"] + {search_args(page, "--format", "json", "-o", str(out))!r}\n'
+        'try:\n'
+        f'    runpy.run_path({os.path.join(ROOT, "getsupernovae.py")!r}, run_name="__main__")\n'
+        'except SystemExit as ex:\n'
+        '    assert ex.code == 0, ex.code\n'
+        'assert "tkinter" not in sys.modules\n'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=ROOT, timeout=120)
+    assert json.loads(out.read_text())['count'] > 0
+
+
+def test_cli_import_does_not_load_pdf_or_plotting_modules():
+    code = (
+        'import sys\n'
+        'import app.cli\n'
+        'import app.reports.report_json, app.reports.report_text\n'
+        'loaded = [m for m in ("reportlab", "matplotlib") if m in sys.modules]\n'
+        'assert not loaded, loaded\n'
+        'assert "app.services.api_server" not in sys.modules\n'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=ROOT, timeout=120)
+
+
+def test_batch_writes_one_report_per_night_and_site(page, tmp_path, capsys):
+    args = ['batch', '--source', page, '--from', '2026-03-11', '--to', '2026-03-12',
+            '--sites', 'Sabadell', 'Requena', '--mag', '18', '--days', '30',
+            '--format', 'json', '--output-dir', str(tmp_path), '--workers', '1']
+    assert cli.main(args) == 0
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ['2026-03-11_Requena.json', '2026-03-11_Sabadell.json',
+                     '2026-03-12_Requena.json', '2026-03-12_Sabadell.json', 'summary.json']
+    summary = json.loads((tmp_path / 'summary.json').read_text())
+    assert [r['date'] for r in summary['runs']] == ['2026-03-11'] * 2 + ['2026-03-12'] * 2
+    assert '2026-03-12  Requena' in capsys.readouterr().out
+
+
+def test_batch_without_dates_is_an_error(page):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(['batch', '--source', page])
+    assert exc.value.code == 2
@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.composite import CompositeProvider, make_provider_factory, normalize_name
+from app.services.provider import CsvSupernovaProvider, FileRochesterProvider
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'snactive.html')
+
+CSV = """name,ra,dec,mag,date,host,type
+2025abc,12:34:56,+12:34:56,14.0,2025-12-02,NGC 1234 (local),Ia-91T
+AT2025zzz,20.9375,-1.39583,16.9,2025-11-21,IC 5678,
+SN2025new,150.0,30.0,15.5,2025/12/04,UGC 1,II
+"""
+
+
+class FailingProvider:
+    def fetch(self):
+        raise IOError("offline")
+
+
+def make_csv(tmp_path):
+    p = tmp_path / 'local.csv'
+    p.write_text(CSV, encoding='utf-8')
+    return str(p)
+
+
+def test_normalize_name():
+    assert normalize_name('SN 2025abc') == normalize_name('at2025ABC') == '2025abc'
+
+
+def test_merge_by_name_and_position_with_precedence(tmp_path):
+    provider = CompositeProvider([
+        FileRochesterProvider(FIXTURE),
+        CsvSupernovaProvider(make_csv(tmp_path)),
+        FailingProvider(),
+    ])
+    merged = provider.fetch()
+    by_name = {sn.name: sn for sn in merged}
+
+    # SN2025abc matched by name, SN2025def (01:23:45 -01:23:45) by position
+    assert sorted(by_name) == ['SN2025abc', 'SN2025def', 'SN2025new']
+    # Rochester wins on conflicting fields
+    assert by_name['SN2025abc'].mag == 15.3
+    assert by_name['SN2025abc'].type == 'Ia'
+    assert by_name['SN2025abc'].host == 'NGC 1234'
+    assert by_name['SN2025new'].date == '2025-12-04'
+    assert len(provider.errors) == 1
+
+
+def test_missing_fields_filled_from_lower_precedence(tmp_path):
+    rochester = FileRochesterProvider(FIXTURE).fetch()
+    rochester[0].host = ''
+
+    class Static:
+        def fetch(self):
+            return rochester
+
+    merged = CompositeProvider([Static(), CsvSupernovaProvider(make_csv(tmp_path))]).fetch()
+    assert merged[0].host == 'NGC 1234 (local)'
+    # the source objects are not mutated
+    assert rochester[0].host == ''
+
+
+def test_factory_without_sources_is_primary():
+    assert make_provider_factory([], primary_factory=FileRochesterProvider) is FileRochesterProvider
@@ -0,0 +1,55 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+from astropy.coordinates import SkyCoord, get_constellation
+import astropy.units as u
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.constellations import ConstellationGrid, assign_constellations
+
+
+def test_grid_matches_exact_lookup(tmp_path):
+    grid = ConstellationGrid(step=1.0, directory=str(tmp_path))
+    assert os.path.exists(grid.path)
+
+    rng = np.random.default_rng(3)
+    ra = rng.uniform(0, 360, 5000)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, 5000)))
+    expected = get_constellation(SkyCoord(ra=ra * u.deg, dec=dec * u.deg))
+    assert list(grid.lookup(ra, dec)) == list(expected)
+
+    # a second instance loads the cached grid
+    again = ConstellationGrid(step=1.0, directory=str(tmp_path))
+    assert np.array_equal(again.codes, grid.codes)
+
+
+def test_assign_constellations_only_fills_missing(tmp_path):
+    grid = ConstellationGrid(step=1.0, directory=str(tmp_path))
+    orion = SimpleNamespace(constellation=None, coordinates=SkyCoord('05:35:17 -05:23:28', unit=(u.hourangle, u.deg)))
+    kept = SimpleNamespace(constellation='Lyra', coordinates=SkyCoord(0 * u.deg, 0 * u.deg))
+    nocoord = SimpleNamespace(constellation=None, coordinates=None)
+
+    assign_constellations([orion, kept, nocoord], grid)
+    assert orion.constellation == 'Orion'
+    assert kept.constellation == 'Lyra'
+    assert nocoord.constellation is None
+
+
+def test_cells_next_to_a_boundary_are_resolved_exactly():
+    codes = np.zeros((6, 7), dtype=np.uint8)
+    # a boundary touches one corner of cell (dec 3, ra 3) only
+    codes[3, 5] = 1
+    uniform = ConstellationGrid._uniform_cells(codes)
+    assert not uniform[3, 4] and not uniform[2, 4]
+    # cell (dec 1, ra 1) has four equal corners but a neighbour touches the boundary
+    codes = np.zeros((6, 7), dtype=np.uint8)
+    codes[3, 3] = 1
+    uniform = ConstellationGrid._uniform_cells(codes)
+    assert not uniform[1, 1] and uniform[0, 0]
+    # RA wraps: the first and last columns are neighbours
+    codes = np.zeros((6, 7), dtype=np.uint8)
+    codes[2, 1] = 1
+    assert not ConstellationGrid._uniform_cells(codes)[2, 5]
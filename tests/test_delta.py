@@ -0,0 +1,86 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.delta import diff_catalogs
+from app.services.provider import RochesterProvider
+
+ROW = '''
+<tr>
+    <td><a href="../snimages/{name}.html">{name}</a></td>
+    <td>NGC 1234</td>
+    <td>12:34:56</td>
+    <td>+12:34:56</td>
+    <td></td>
+    <td>{mag}</td>
+    <td>2025/12/01</td>
+    <td>Ia</td>
+    <td></td>
+    <td>14.8</td>
+    <td>2025/12/03</td>
+    <td>2025/11/30</td>
+</tr>
+'''
+
+
+def page(*rows):
+    return '<table>' + ''.join(ROW.format(name=n, mag=m) for n, m in rows) + '</table>'
+
+
+def test_diff_reports_added_changed_removed():
+    provider = RochesterProvider()
+    first = provider.parse_html(page(('SN2025a', '15.0'), ('SN2025b', '16.0'), ('SN2025c', '17.0')))
+    second = provider.parse_html(page(('SN2025a', '15.0'), ('SN2025b', '15.5'), ('SN2025d', '14.0')))
+
+    delta = diff_catalogs(first, second)
+    assert delta.added == {'SN2025d'}
+    assert delta.changed == {'SN2025b'}
+    assert delta.removed == {'SN2025c'}
+    assert delta.unchanged == {'SN2025a'}
+
+
+def test_provider_reuses_unchanged_rows():
+    provider = RochesterProvider()
+    first = provider.parse_html(page(('SN2025a', '15.0'), ('SN2025b', '16.0')))
+    assert provider.last_delta is None
+
+    provider.previous = first
+    second = provider.parse_html(page(('SN2025a', '15.0'), ('SN2025b', '15.5')))
+
+    # unchanged entry is the very same object (no re-parse, same SkyCoord)
+    assert second[0] is first[0]
+    assert second[1] is not first[1]
+    assert second[1].mag == 15.5
+    assert provider.last_delta.changed == {'SN2025b'}
+    assert provider.last_delta.unchanged == {'SN2025a'}
+
+
+def test_selection_reuses_visibility_of_unchanged_entries():
+    from datetime import datetime
+    from app.models.snmodels import Visibility, AxCordInTime
+    from astropy.coordinates import EarthLocation
+    import astropy.units as u
+    from getsupernovae import RochesterSupernova
+
+    calls = []
+
+    class CountingVisibility:
+        def __init__(self, *args):
+            pass
+
+        def getVisibility(self, site, coord, t1, t2):
+            calls.append(coord)
+            return Visibility(True, [AxCordInTime(t1, None)])
+
+    dtos = RochesterProvider().parse_html(page(('SN2025a', '15.0'), ('SN2025b', '16.0')))
+    rs = RochesterSupernova(visibility_factory=CountingVisibility)
+    args = dict(maxMag='17', observationDay=datetime(2025, 12, 5), localStartTime='21:00',
+                hoursObservation=2, fromDate='2025-11-01', site=EarthLocation(lat=41.55 * u.deg, lon=2.09 * u.deg, height=224 * u.m))
+    rs.selectSupernovas(dtos, **args)
+    assert len(calls) == 2
+
+    reuse = {'SN2025a': rs.computed['SN2025a']}
+    results = RochesterSupernova(visibility_factory=CountingVisibility).selectSupernovas(dtos, reuse=reuse, **args)
+    assert len(calls) == 3
+    assert [sn.name for sn in results] == ['SN2025a', 'SN2025b']
@@ -0,0 +1,112 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.cancel import CancellationToken, OperationCancelled
+from app.services.details import DetailCache, DetailFetcher, enrich_supernovas, parse_detail_html
+from app.services.httpclient import HTTPConnectionPool
+
+DETAIL_PAGE = '''
+<html><body>
+<h1>SN {name} in NGC 1234</h1>
+<p>Discovered 2025/11/30.21 by ATLAS (Tonry et al.)</p>
+<table>
+<tr><th>Date (UT)</th><th>Mag</th><th>Observer</th></tr>
+<tr><td>2025/12/01.10</td><td>15.8</td><td>ZTF</td></tr>
+<tr><td>2025/12/03.25</td><td>15.3</td><td>ATLAS</td></tr>
+<tr><td>2025/12/03.40</td><td>15.1</td><td>Gaia</td></tr>
+<tr><td>2025/12/04.10</td><td>&gt;18.0</td><td>ASAS-SN</td></tr>
+</table>
+</body></html>
+'''
+
+
+class DetailHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = DetailHandler
+        with cls.lock:
+            cls.active += 1
+            cls.requests += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        time.sleep(0.05)
+        body = DETAIL_PAGE.format(name=self.path.strip('/')).encode('utf-8')
+        with cls.lock:
+            cls.active -= 1
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    DetailHandler.active = DetailHandler.max_active = DetailHandler.requests = 0
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), DetailHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:%d' % srv.server_address[1]
+    srv.shutdown()
+    srv.server_close()
+
+
+class Sn:
+    def __init__(self, name, link):
+        self.name = name
+        self.link = link
+
+
+def test_parse_detail_html():
+    d = parse_detail_html(DETAIL_PAGE.format(name='2025abc'))
+    assert d['discoverer'] == 'ATLAS'
+    # newest first, brightest measurement per night, limits ignored
+    assert d['recentMagnitudes'] == [('2025-12-03', 15.1), ('2025-12-01', 15.8)]
+
+
+def test_fetch_many_respects_per_host_limit_and_caches(server, tmp_path):
+    pool = HTTPConnectionPool(timeout=5)
+    fetcher = DetailFetcher(max_workers=8, per_host=2, cache=DetailCache(str(tmp_path)), pool=pool)
+    sns = [Sn('SN2025a%d' % i, '%s/2025a%d' % (server, i)) for i in range(6)]
+    sns.append(Sn('SN2025nolink', None))
+
+    enrich_supernovas(sns, fetcher)
+    assert DetailHandler.requests == 6
+    assert DetailHandler.max_active <= 2
+    assert all(sn.discoverer == 'ATLAS' for sn in sns[:6])
+    assert not hasattr(sns[6], 'discoverer')
+
+    # second run is served from the on-disk cache
+    enrich_supernovas([Sn('x', sns[0].link)], fetcher)
+    assert DetailHandler.requests == 6
+    pool.close()
+
+
+def test_cancel_stops_fetching_without_waiting_for_every_page(server, tmp_path):
+    pool = HTTPConnectionPool(timeout=5)
+    fetcher = DetailFetcher(max_workers=8, per_host=2, cache=DetailCache(str(tmp_path)), pool=pool)
+    sns = [Sn('SN2025c%d' % i, '%s/2025c%d' % (server, i)) for i in range(40)]
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    start = time.perf_counter()
+    with pytest.raises(OperationCancelled):
+        enrich_supernovas(sns, fetcher, cancel=token)
+    # 40 pages two at a time take a second
+    assert time.perf_counter() - start < 0.5
+    time.sleep(0.2)
+    assert DetailHandler.requests < 20
+    assert not any(hasattr(sn, 'discoverer') for sn in sns)
+    pool.close()
@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.events import EventChannel, Progress, SearchFailed, StageStarted
+from getsupernovae import AsyncRochesterDownload, SupernovaCallBackData, sites
+
+
+def test_burst_wakes_the_consumer_once_per_drain():
+    wakeups = []
+    channel = EventChannel(notify=lambda: wakeups.append(1))
+    for i in range(5):
+        channel.post(Progress(i, 5))
+    assert wakeups == [1]
+
+    assert [ev.done for ev in channel.drain(limit=3)] == [0, 1, 2]
+    channel.post(Progress(5, 5))
+    assert wakeups == [1, 1]
+    assert [ev.done for ev in channel.drain()] == [3, 4, 5]
+    assert channel.empty()
+
+
+def test_notify_errors_do_not_lose_events():
+    def broken():
+        raise RuntimeError('main thread is not in main loop')
+
+    channel = EventChannel(notify=broken)
+    channel.post(StageStarted('fetch'))
+    assert channel.drain() == [StageStarted('fetch')]
+
+
+def test_posting_from_threads():
+    channel = EventChannel()
+    workers = [threading.Thread(target=lambda: [channel.post(Progress(i, 100)) for i in range(100)])
+               for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert len(channel.drain()) == 400
+
+
+class FailingProvider:
+    def __init__(self, timeout=None):
+        pass
+
+    def fetch(self):
+        raise OSError('network unreachable')
+
+
+def test_failed_search_ends_with_a_failure_event():
+    e = SupernovaCallBackData('16', '2025-12-05', '21:00', '4', '30', sites['Sabadell'], '0')
+    thread = AsyncRochesterDownload(e, provider_factory=FailingProvider)
+    thread.run()
+    assert thread.events.drain() == [StageStarted('fetch'), SearchFailed('network unreachable')]
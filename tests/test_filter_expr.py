@@ -0,0 +1,94 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.catalog import SupernovaCatalog
+from app.services.constellations import ConstellationGrid
+from app.services.filter_expr import FilterSyntaxError, compile_filter
+from app.services.prefilter import prefilter
+
+
+@pytest.fixture
+def rows(supernova_row):
+    # M81 is in Ursa Major, M66 in Leo, M31 in Andromeda
+    m81 = ('09h55m33s', '+69d03m55s')
+    m66 = ('11h20m15s', '+12d59m30s')
+    m31 = ('00h42m44s', '+41d16m09s')
+    return [
+        supernova_row('a', mag=15.0, host='M81', type='Ia', position=m81),
+        supernova_row('b', '2025-11-20', 13.5, host='', type='II', position=m66),
+        supernova_row('c', '2025-12-03', 16.5, host=None, type='Ia-91T', position=m31),
+        supernova_row('d', None, None, host='NGC 1', type=None, position=None),
+    ]
+
+
+@pytest.fixture(autouse=True)
+def grid(tmp_path, monkeypatch):
+    grid = ConstellationGrid(step=2.0, directory=str(tmp_path))
+    monkeypatch.setattr('app.services.constellations.default_grid', lambda: grid)
+    return grid
+
+
+def names(text, data):
+    return [r.name for r in compile_filter(text).filter(data)]
+
+
+@pytest.mark.parametrize('as_catalog', [False, True])
+@pytest.mark.parametrize('text, expected', [
+    ('type contains Ia', ['SN2025a', 'SN2025c']),
+    ('TYPE CONTAINS ia', ['SN2025a', 'SN2025c']),
+    ('type = Ia', ['SN2025a']),
+    ('host not empty', ['SN2025a', 'SN2025d']),
+    ('host is empty', ['SN2025b', 'SN2025c']),
+    ('constellation in (UMa, Leo)', ['SN2025a', 'SN2025b']),
+    ('constellation = "Andromeda"', ['SN2025c']),
+    ('mag between 13 and 16', ['SN2025a', 'SN2025b']),
+    ('mag != 15', ['SN2025b', 'SN2025c']),
+    ('mag not between 13 and 16', ['SN2025c']),
+    ('not mag < 16', ['SN2025c']),
+    ('mag not in (15, 16.5)', ['SN2025b']),
+    ('type not contains Ia', ['SN2025b']),
+    ('host not contains m', ['SN2025d']),
+    ('date >= 2025-12-01', ['SN2025a', 'SN2025c']),
+    ('type contains Ia and not (host empty) or mag < 14', ['SN2025a', 'SN2025b']),
+    ('name in (SN2025a, SN2025d)', ['SN2025a', 'SN2025d']),
+])
+def test_filter_on_lists_and_catalogs(text, expected, as_catalog, rows):
+    data = SupernovaCatalog.from_dtos(rows) if as_catalog else rows
+    assert names(text, data) == expected
+
+
+@pytest.mark.parametrize('text', [
+    'mag not between 14 and 16', 'not mag < 16', 'not (mag < 16)', 'mag not in (15)', 'mag != 15',
+])
+def test_negated_comparisons_skip_missing_values(text, supernova_row):
+    data = [supernova_row('a', mag=17.0), supernova_row('b', mag=None)]
+    assert list(compile_filter(text).mask(data)) == [True, False]
+    assert list(compile_filter('mag is not empty').mask(data)) == [True, False]
+    assert list(compile_filter('mag is empty').mask(data)) == [False, True]
+
+
+@pytest.mark.parametrize('text', [
+    '', 'mag', 'mag >', 'colour = red', 'type < 3', 'mag between 1', 'mag = abc',
+    'type in (Ia', '(mag < 3', 'mag < 3 junk', 'host contains',
+])
+def test_invalid_expressions(text):
+    if not text:
+        assert compile_filter(text) is None
+        return
+    with pytest.raises(FilterSyntaxError):
+        compile_filter(text)
+
+
+def test_compile_is_cached_and_passes_compiled_through():
+    compiled = compile_filter('mag < 15')
+    assert compile_filter(' mag < 15 ') is compiled
+    assert compile_filter(compiled) is compiled
+
+
+def test_prefilter_applies_where(rows):
+    kept = prefilter(rows, 16.0, None, where=compile_filter('type contains Ia'))
+    assert [r.name for r in kept] == ['SN2025a']
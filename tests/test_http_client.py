@@ -0,0 +1,119 @@
+import gzip
+import os
+import sys
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.httpclient import HTTPConnectionPool
+from app.services.provider import NetworkRochesterProvider
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'snactive.html')
+
+
+class CompressingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    seen = []
+    paths = []
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        CompressingHandler.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with open(FIXTURE, 'rb') as fh:
+            body = fh.read()
+        accept = self.headers.get('Accept-Encoding', '')
+        CompressingHandler.seen.append(accept)
+        CompressingHandler.paths.append((self.path, self.headers.get('Proxy-Authorization')))
+        encoding = None
+        if self.path == '/raw-deflate':
+            c = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            body = c.compress(body) + c.flush()
+            encoding = 'deflate'
+        elif 'gzip' in accept:
+            body = gzip.compress(body)
+            encoding = 'gzip'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    CompressingHandler.seen = []
+    CompressingHandler.paths = []
+    CompressingHandler.connections = 0
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), CompressingHandler)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield 'http://127.0.0.1:%d' % srv.server_address[1]
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_gzip_negotiated_and_connection_reused(server, tmp_path):
+    from app.services.snapshot import CatalogSnapshotStore
+
+    pool = HTTPConnectionPool(timeout=5)
+    store = CatalogSnapshotStore(str(tmp_path))
+    for _ in range(3):
+        provider = NetworkRochesterProvider(timeout=5, source=server + '/snactive.html', pool=pool, snapshot_store=store)
+        rows = provider.fetch()
+        assert [r.name for r in rows] == ['SN2025abc', 'SN2025def']
+        assert provider.last_response.content_encoding == 'gzip'
+        assert provider.last_response.wire_bytes < len(provider.last_response.body)
+
+    assert all('gzip' in a for a in CompressingHandler.seen)
+    assert CompressingHandler.connections == 1
+    assert pool.connections_opened == 1
+    pool.close()
+
+
+def test_raw_deflate_stream_is_decoded(server):
+    pool = HTTPConnectionPool(timeout=5)
+    with open(FIXTURE, 'rb') as fh:
+        expected = fh.read()
+    resp = pool.get(server + '/raw-deflate')
+    assert resp.status == 200
+    assert resp.body == expected
+    pool.close()
+
+
+def test_http_goes_through_the_configured_proxy(server, monkeypatch):
+    # the test server plays the proxy for a host that does not exist
+    proxy = server.replace('http://', 'http://user:secret@')
+    monkeypatch.setenv('http_proxy', proxy)
+    monkeypatch.setenv('no_proxy', '')
+    pool = HTTPConnectionPool(timeout=5)
+    resp = pool.get('http://rochester.invalid/snactive.html')
+    assert resp.status == 200
+    path, auth = CompressingHandler.paths[-1]
+    assert path == 'http://rochester.invalid/snactive.html'
+    assert auth == 'Basic dXNlcjpzZWNyZXQ='
+    pool.close()
+
+    monkeypatch.setenv('no_proxy', 'rochester.invalid')
+    with pytest.raises(OSError):
+        HTTPConnectionPool(timeout=5).get('http://rochester.invalid/snactive.html')
+
+
+def test_https_tunnels_through_the_configured_proxy(monkeypatch):
+    monkeypatch.setenv('https_proxy', 'http://proxy.example:3128')
+    monkeypatch.setenv('no_proxy', '')
+    conn, reused = HTTPConnectionPool()._checkout(('https', 'www.rochesterastronomy.org', 443), 5)
+    assert not reused
+    assert (conn.host, conn.port) == ('proxy.example', 3128)
+    assert (conn._tunnel_host, conn._tunnel_port) == ('www.rochesterastronomy.org', 443)
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.ignore_list import IgnoreList
+
+
+def test_names_and_rules(tmp_path):
+    path = tmp_path / 'old_supernovae.txt'
+    path.write_text('# comment\nSN 2024abc\nAT2023*\n2022?x\n', encoding='utf-8')
+    ignore = IgnoreList(str(path))
+
+    assert 'SN2024abc' in ignore
+    assert 'AT2024abc' in ignore
+    assert 'SN2023zzz' in ignore
+    assert 'SN2022ax' in ignore
+    assert 'SN2022abx' not in ignore
+    assert 'SN2025abc' not in ignore
+    assert list(ignore.mask(['SN2023a', 'SN2025a', 'SN2024abc'])) == [True, False, True]
+    assert len(ignore) == 3
+
+
+def test_add_appends_and_external_edits_reload(tmp_path):
+    path = tmp_path / 'old_supernovae.txt'
+    path.write_text('SN2024abc', encoding='utf-8')  # no trailing newline
+    ignore = IgnoreList(str(path))
+    version = ignore.version
+
+    assert ignore.add('SN2025xyz')
+    assert not ignore.add('SN 2025xyz')
+    assert path.read_text(encoding='utf-8') == 'SN2024abc\nSN2025xyz\n'
+    assert 'SN2025xyz' in ignore and ignore.version > version
+
+    # another process edits the file
+    time.sleep(0.01)
+    path.write_text('SN2026*\n', encoding='utf-8')
+    assert 'SN2026aa' in ignore
+    assert 'SN2025xyz' not in ignore
+
+    ignore.replace(['b', 'A', 'b', '# note'])
+    assert path.read_text(encoding='utf-8') == 'A\nb\n'
@@ -0,0 +1,24 @@
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.snparser import parse_date, parse_dates
+
+
+def test_parse_date_formats():
+    assert parse_date('2025/12/01') == (date(2025, 12, 1), '2025-12-01')
+    assert parse_date(' 2025.1.5 ') == (date(2025, 1, 5), '2025-01-05')
+    assert parse_date('2025-12/01') == (date(2025, 12, 1), '2025-12-01')
+    assert parse_date('2024/02/29') == (date(2024, 2, 29), '2024-02-29')
+
+
+def test_parse_date_rejects_invalid():
+    for text in (None, '', 'unknown', '2023/02/29', '2025/13/01', '2025/12/01.5', '25/12/01'):
+        assert parse_date(text) == (None, None)
+
+
+def test_parse_dates_matches_parse_date():
+    texts = ['2025/12/01', '2025/12/01', None, 'x', '2025.11.30']
+    assert parse_dates(texts) == [parse_date(t) for t in texts]
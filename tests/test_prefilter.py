@@ -0,0 +1,40 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.catalog import SupernovaCatalog
+from app.services.prefilter import prefilter, prefilter_mask
+
+
+@pytest.fixture
+def rows(supernova_row):
+    return [
+        supernova_row('a', mag=15.0),
+        supernova_row('b', mag=17.5),                 # too faint
+        supernova_row('c', '2025-11-01'),             # too old
+        supernova_row('d', None),                     # no date
+        supernova_row('e', '2025-12-02', None),       # no magnitude
+        supernova_row('f', '2025-12-02', 17.0, mag_limit='>'),
+        supernova_row('g', '2025-12-02', 16.0, mag_limit='>'),
+        supernova_row('h', '2025-12-03', 16.5),       # ignored
+    ]
+
+
+def test_prefilter_list_and_catalog_agree(rows):
+    expected = ['SN2025a', 'SN2025g']
+    kept = prefilter(rows, 17.0, date(2025, 11, 20), {'SN2025h'})
+    assert [r.name for r in kept] == expected
+    assert kept[0] is rows[0]
+
+    catalog = SupernovaCatalog.from_dtos(rows)
+    mask = prefilter_mask(catalog, 17.0, date(2025, 11, 20), ['SN2025h'])
+    assert list(catalog.names[mask]) == expected
+
+
+def test_prefilter_without_date_window_or_ignore_list(rows):
+    assert [r.name for r in prefilter(rows, 20, None)] == [
+        'SN2025a', 'SN2025b', 'SN2025c', 'SN2025f', 'SN2025g', 'SN2025h']
@@ -0,0 +1,93 @@
+import os
+import random
+import sys
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from astropy.time import Time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.snmodels import AxCordInTime, Visibility
+from app.services.ranking import score, sort_key, top_k
+from app.services.selection import RochesterSupernova, SupernovaCallBackData, make_search_config, parse_limit
+from getsupernovae import sites
+
+T0 = Time('2026-03-12T21:00:00')
+
+
+def result(name, start_h, end_h, peak, mag):
+    cords = [AxCordInTime(T0 + timedelta(hours=h), None) for h in (start_h, end_h)]
+    return SimpleNamespace(name=name, mag=str(mag), visibility=Visibility(True, cords, maxAlt=peak))
+
+
+def results(n=200, seed=1):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        start = rnd.choice([0, 0.5, 1, 1.5, 2])
+        out.append(result(f'SN{i}', start, start + rnd.choice([0.5, 1, 3]), rnd.uniform(20, 80), rnd.uniform(12, 18)))
+    return out
+
+
+def test_start_order_matches_the_old_double_sort():
+    items = results()
+    expected = sorted(items, key=lambda x: x.visibility.azCords[-1].time)
+    expected.sort(key=lambda x: x.visibility.azCords[0].time)
+    assert [sn.name for sn in top_k(items)] == [sn.name for sn in expected]
+
+
+@pytest.mark.parametrize('order', ['start', 'altitude', 'magnitude', 'score'])
+def test_top_k_is_the_head_of_the_full_order(order):
+    items = results()
+    full = top_k(items, None, order)
+    assert [sn.name for sn in top_k(items, 10, order)] == [sn.name for sn in full[:10]]
+    assert top_k(items, 0, order) == [] and len(top_k(items, 500, order)) == len(items)
+
+
+def test_orders_put_the_best_first():
+    low_faint = result('a', 0, 1, 30, 17)
+    high_bright = result('b', 1, 4, 70, 13)
+    assert top_k([low_faint, high_bright], 1, 'start')[0].name == 'a'
+    assert top_k([low_faint, high_bright], 1, 'altitude')[0].name == 'b'
+    assert top_k([low_faint, high_bright], 1, 'magnitude')[0].name == 'b'
+    assert score(high_bright) == pytest.approx(7 + 3 - 13)
+    with pytest.raises(ValueError):
+        sort_key('random')
+
+
+def test_parse_limit_and_config_validation():
+    assert parse_limit('25') == 25 and parse_limit('all') is None and parse_limit('') is None
+    with pytest.raises(ValueError):
+        parse_limit('many')
+    with pytest.raises(ValueError):
+        make_search_config(sites['Sabadell'], '2025-12-05', sortBy='random')
+    e = make_search_config(sites['Sabadell'], '2025-12-05', maxResults='5', sortBy='magnitude')
+    assert (e.maxResults, e.sortBy) == (5, 'magnitude')
+
+
+class AlwaysVisible:
+    def __init__(self, minAlt, maxAlt, minAz, maxAz):
+        pass
+
+    def getVisibility(self, site, coord, t1, t2):
+        return Visibility(True, [AxCordInTime(t1, None), AxCordInTime(t2, None)], maxAlt=coord.dec.degree)
+
+
+def test_selection_keeps_the_best_k(supernova_row):
+    rows = [
+        supernova_row(c, mag=mag, position=(0, dec))
+        for c, mag, dec in (('a', 15.0, 10), ('b', 13.0, 50), ('c', 14.0, 30))
+    ]
+    e = SupernovaCallBackData('16', '2025-12-05', '21:00', '4', '30', sites['Sabadell'], '0',
+                              maxResults=2, sortBy='magnitude')
+    selector = RochesterSupernova(visibility_factory=AlwaysVisible)
+    assert [sn.name for sn in selector.selectAndSortSupernovas(e, rows)] == ['SN2025b', 'SN2025c']
+
+    e.sortBy = 'altitude'
+    assert [sn.name for sn in selector.selectAndSortSupernovas(e, rows)] == ['SN2025b', 'SN2025c']
+    key = selector.selectionKey(e, rows)
+    e.maxResults = None
+    assert selector.selectionKey(e, rows) != key
+    assert len(selector.selectAndSortSupernovas(e, rows)) == 3
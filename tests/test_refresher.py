@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.catalog import SupernovaCatalog
+from app.services.httpclient import HTTPConnectionPool
+from app.services.provider import ConditionalCache, NetworkRochesterProvider
+from app.services.refresher import CatalogRefresher, format_age
+from app.services.snapshot import CatalogSnapshotStore
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'snactive.html')
+ETAG = '"v1"'
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == ETAG:
+            EtagHandler.statuses.append(304)
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        with open(FIXTURE, 'rb') as fh:
+            body = fh.read()
+        EtagHandler.statuses.append(200)
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    EtagHandler.statuses = []
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), EtagHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:%d/snactive.html' % srv.server_address[1]
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_conditional_fetch_and_refresher(server, tmp_path):
+    pool = HTTPConnectionPool(timeout=5)
+    conditional = ConditionalCache()
+    store = CatalogSnapshotStore(str(tmp_path))
+
+    def factory(timeout=20):
+        return NetworkRochesterProvider(timeout=timeout, source=server, pool=pool,
+                                        snapshot_store=store, conditional=conditional)
+
+    now = [1000.0]
+    updates = []
+    refresher = CatalogRefresher(factory, interval=60, on_update=updates.append, clock=lambda: now[0])
+    assert refresher.latest() == (None, None)
+
+    first = refresher.refresh()
+    assert isinstance(first, SupernovaCatalog) and len(first) == 2
+
+    now[0] += 600
+    assert refresher.age() == 600
+    # unchanged page: 304, same catalog object, only the check time moves
+    assert refresher.refresh() is first
+    assert EtagHandler.statuses == [200, 304]
+    assert refresher.age() == 0
+    assert updates == [first]
+
+    provider = factory()
+    assert [r.name for r in provider.fetch()] == ['SN2025abc', 'SN2025def']
+    assert provider.not_modified
+    pool.close()
+
+
+def test_format_age():
+    assert format_age(None) == ''
+    assert format_age(30) == 'just now'
+    assert format_age(125) == '2 min'
+    assert format_age(3 * 3600) == '3 h'
+    assert format_age(72 * 3600) == '3 d'
+
+
+def test_format_age_translates_the_templates(monkeypatch):
+    import gettext
+    from app import i18n
+
+    class Catalan(gettext.NullTranslations):
+        def gettext(self, message):
+            return {'just now': 'ara mateix', '{n} h': '{n} hores'}.get(message, message)
+
+    monkeypatch.setattr(i18n, '_current_trans', Catalan())
+    assert format_age(30) == 'ara mateix'
+    assert format_age(3 * 3600) == '3 hores'
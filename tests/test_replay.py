@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+import threading
+from datetime import date, datetime
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from astropy.coordinates import EarthLocation
+import astropy.units as u
+
+from app import cli
+from app.services.replay import ReplayProvider, SnapshotArchive, nights, replay_nights
+from app.services.snapshot import CatalogSnapshotStore
+from benchmarks.synthetic import generate_page
+from getsupernovae import RochesterSupernova, SupernovaCallBackData
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'snactive.html')
+
+
+def make_archive(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / 'archive'), snapshot_store=CatalogSnapshotStore(str(tmp_path / 'parsed')))
+    with open(FIXTURE, 'rb') as fh:
+        html = fh.read()
+    archive.add(html, datetime(2026, 3, 1, 6, 0))
+    # identical content is not stored twice
+    assert archive.add(html, datetime(2026, 3, 2, 6, 0)) is None
+    archive.add(html.replace(b'</table>', b'</table><!-- later -->', 1), datetime(2026, 3, 10, 6, 0))
+    return archive
+
+
+def test_closest_capture(tmp_path):
+    archive = make_archive(tmp_path)
+    assert len(SnapshotArchive(archive.directory)) == 2
+
+    assert archive.closest(datetime(2026, 3, 8))[0] == datetime(2026, 3, 10, 6, 0)
+    assert archive.closest(datetime(2026, 3, 8), not_after=True)[0] == datetime(2026, 3, 1, 6, 0)
+    assert archive.closest(datetime(2026, 2, 1), not_after=True) is None
+
+    provider = ReplayProvider(archive, date(2026, 3, 12))
+    catalog = provider.fetch()
+    assert provider.captured == datetime(2026, 3, 10, 6, 0)
+    assert len(catalog) > 0
+    # loaded catalogs are kept while in use
+    assert ReplayProvider(archive, date(2026, 3, 11)).fetch() is catalog
+
+
+def test_replay_nights(tmp_path):
+    archive = make_archive(tmp_path)
+    site = EarthLocation(lat=41.55 * u.deg, lon=2.09 * u.deg, height=224 * u.m)
+
+    def config(day):
+        return SupernovaCallBackData('18', day.isoformat(), '21:00', '2', '30', site, '20')
+
+    out = list(replay_nights(archive, nights('2026-02-28', '2026-03-02'), config, RochesterSupernova()))
+    assert [d for d, _, _ in out] == [date(2026, 2, 28), date(2026, 3, 1), date(2026, 3, 2)]
+    assert out[0][1] is None and out[0][2] == []
+    assert out[1][1] == datetime(2026, 3, 1, 6, 0)
+    assert all(isinstance(r, list) for _, _, r in out)
+
+
+def test_concurrent_adds_keep_the_index_sorted(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / 'archive'), snapshot_store=CatalogSnapshotStore(str(tmp_path / 'parsed')))
+
+    def add(hour):
+        for minute in range(10):
+            archive.add(f'<html>{hour}:{minute}</html>', datetime(2026, 3, 1, hour, minute))
+
+    threads = [threading.Thread(target=add, args=(hour,)) for hour in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    captures = archive.captures()
+    assert len(captures) == 80 and captures == sorted(captures)
+    assert archive.captures() == SnapshotArchive(archive.directory).captures()
+
+
+def test_replay_command_writes_one_report_per_night(tmp_path, capsys, monkeypatch):
+    archive = SnapshotArchive(str(tmp_path / 'archive'), snapshot_store=CatalogSnapshotStore(str(tmp_path / 'parsed')))
+    archive.add(generate_page(60), datetime(2026, 3, 12, 6, 0))
+    out = tmp_path / 'out'
+    args = ['replay', '--archive', archive.directory, '--from', '2026-03-11', '--to', '2026-03-12',
+            '--mag', '18', '--days', '30', '--format', 'json', '--output-dir', str(out)]
+    # the night before the first capture has nothing to replay
+    assert cli.main(args) == 1
+
+    summary = json.loads((out / 'summary.json').read_text())
+    first, second = summary['runs']
+    assert first['date'] == '2026-03-11' and first['error'] and first['report'] is None
+    assert second['error'] is None and second['count'] > 0
+    report = out / '2026-03-12_{}.json'.format(second['site'])
+    assert json.loads(report.read_text())['count'] == second['count']
+    assert '2026-03-12' in capsys.readouterr().out
+    monkeypatch.delenv('GETSUPERNOVAE_ARCHIVE_DIR', raising=False)
+    with pytest.raises(SystemExit) as ex:
+        cli.main(args[:1] + ['--dates', '2026-03-12'])
+    assert ex.value.code == 2
@@ -0,0 +1,76 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from astropy.time import TimeDelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.snmodels import AxCordInTime, Visibility
+from app.services.events import PartialResult, Progress, SearchDone, StageStarted
+from getsupernovae import AsyncRochesterDownload, RochesterSupernova, SupernovaCallBackData, sites
+
+
+class CountingVisibility:
+    """Always visible; the start time cycles so the final sort reorders."""
+
+    calls = 0
+
+    def __init__(self, minAlt, maxAlt, minAz, maxAz):
+        pass
+
+    def getVisibility(self, site, coord, t1, t2):
+        CountingVisibility.calls += 1
+        start = t1 + TimeDelta(600 * (CountingVisibility.calls % 3), format='sec')
+        return Visibility(True, [AxCordInTime(start, None), AxCordInTime(t2, None)])
+
+
+@pytest.fixture
+def rows(supernova_row):
+    return [supernova_row(c) for c in 'abcde']
+
+
+def config():
+    return SupernovaCallBackData('16', '2025-12-05', '21:00', '4', '30', sites['Sabadell'], '0')
+
+
+def test_iter_supernovas_yields_before_evaluating_the_rest(rows):
+    CountingVisibility.calls = 0
+    selector = RochesterSupernova(visibility_factory=CountingVisibility)
+    it = selector.iterSupernovas(
+        rows, '16', datetime(2025, 12, 5), '21:00', 4, '2025-11-05', sites['Sabadell'])
+    first = next(it)
+    assert first.name == 'SN2025a'
+    assert CountingVisibility.calls == 1
+    assert [sn.name for sn in it] == ['SN2025b', 'SN2025c', 'SN2025d', 'SN2025e']
+
+
+def test_on_result_streams_in_catalog_order_then_sorts(rows):
+    CountingVisibility.calls = 0
+    streamed = []
+    selector = RochesterSupernova(visibility_factory=CountingVisibility)
+    result = selector.selectAndSortSupernovas(config(), rows, on_result=streamed.append)
+
+    assert [sn.name for sn in streamed] == ['SN2025a', 'SN2025b', 'SN2025c', 'SN2025d', 'SN2025e']
+    starts = [sn.visibility.azCords[0].time for sn in result]
+    assert starts == sorted(starts)
+    assert sorted(sn.name for sn in result) == [sn.name for sn in streamed]
+
+
+def test_download_thread_posts_typed_events(rows):
+    thread = AsyncRochesterDownload(config(), visibility_factory=CountingVisibility, catalog=rows)
+    wakeups = []
+    thread.events.notify = lambda: wakeups.append(1)
+    thread.run()
+    assert thread.error is None
+
+    events = thread.events.drain()
+    assert isinstance(events[0], StageStarted) and events[0].stage == 'select'
+    assert isinstance(events[-1], SearchDone) and events[-1].results == thread.result
+    progress = [(ev.done, ev.total) for ev in events if isinstance(ev, Progress)]
+    assert progress == [(i, 5) for i in range(6)]
+    streamed = [ev.supernova.name for ev in events if isinstance(ev, PartialResult)]
+    assert sorted(streamed) == sorted(sn.name for sn in thread.result)
+    # one wake-up for the whole burst: nobody drained in between
+    assert wakeups == [1]
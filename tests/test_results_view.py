@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+from astropy.coordinates import SkyCoord
+from astropy.time import Time, TimeDelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.snmodels import AxCordInTime, Visibility
+from app.ui.results_presenter import ResultsPresenter
+from app.ui.results_view import SORT_KEYS, ResultsModel
+
+T0 = Time('2026-03-12T21:00:00')
+COLUMNS = ('name', 'type', 'magnitude', 'date', 'observation_time', 'host', 'constellation', 'ra', 'dec')
+
+
+def supernova(i):
+    start = T0 + TimeDelta(60 * (i % 90), format='sec')
+    return SimpleNamespace(
+        name=f'SN2026{i:05d}', type='Ia' if i % 2 else 'II', mag=f'{12 + (i * 7) % 60 / 10:.1f}',
+        date='2026-03-01', host=f'NGC {i % 300}', constellation='Ori',
+        coordinates=SkyCoord((i * 37) % 360, (i * 13) % 140 - 70, unit='deg'),
+        visibility=Visibility(True, [AxCordInTime(start, None), AxCordInTime(start + TimeDelta(3600, format='sec'), None)],
+                              maxAlt=40),
+    )
+
+
+def counting_model():
+    presented = []
+    presenter = ResultsPresenter()
+
+    def present(sn):
+        presented.append(sn.name)
+        return presenter.present(sn)
+    return ResultsModel(present), presented
+
+
+def test_only_the_displayed_page_is_formatted():
+    model, presented = counting_model()
+    model.set_rows(supernova(i) for i in range(10000))
+    assert [model.values(i)[0] for i in model.window(20)] == [f'SN2026{i:05d}' for i in range(20)]
+    model.scroll_to(5000, 20)
+    [model.values(i) for i in model.window(20)]
+    model.values(5000)
+    assert len(presented) == 40
+    assert model.fraction(20) == (0.5, 0.502)
+
+
+def test_scrolling_is_clamped_to_full_pages():
+    model, _ = counting_model()
+    model.set_rows(supernova(i) for i in range(100))
+    assert model.scroll_to(95, 20) == 80 and list(model.window(20))[-1] == 99
+    assert model.scroll_by(-500, 20) == 0
+    assert model.top_for_fraction(0.25) == 25
+    assert model.ensure_visible(50, 20) == 31 and model.ensure_visible(40, 20) == 31
+    assert model.ensure_visible(3, 20) == 3
+    model.set_rows([])
+    assert model.scroll_to(10, 20) == 0 and list(model.window(20)) == [] and model.fraction(20) == (0.0, 1.0)
+
+
+def test_sort_keys_follow_the_displayed_order():
+    items = [supernova(i) for i in range(300)]
+    presenter = ResultsPresenter()
+    for index, col in enumerate(COLUMNS):
+        if col in ('observation_time', 'ra', 'dec'):
+            # as text 00:10 sorts after 23:50, 10h before 1h and -05 before -40
+            continue
+        model = ResultsModel(presenter.present)
+        model.set_rows(items)
+        model.sort(index, col == 'magnitude', key=SORT_KEYS[col])
+        by_key = [model.values(i)[index] for i in range(len(model))]
+        model.set_rows(items)
+        model.sort(index, col == 'magnitude')
+        assert by_key == [model.values(i)[index] for i in range(len(model))], col
+
+
+def test_sort_keeps_the_selection_and_is_fast_on_large_lists():
+    model, presented = counting_model()
+    model.set_rows(supernova(i) for i in range(10000))
+    model.selected = model.rows[1234]
+    start = time.perf_counter()
+    model.sort(COLUMNS.index('dec'), key=SORT_KEYS['dec'], reverse=True)
+    model.sort(COLUMNS.index('observation_time'), key=SORT_KEYS['observation_time'])
+    assert time.perf_counter() - start < 2.0
+    assert presented == []
+    assert model.rows[model.index_of(model.selected)].name == 'SN202601234'
+    starts = [sn.visibility.azCords[0].time.mjd for sn in model.rows[:500]]
+    assert starts == sorted(starts)
+
+
+def test_update_diffs_by_name_and_keeps_view_state():
+    model, presented = counting_model()
+    model.set_rows(supernova(i) for i in range(1000))
+    model.scroll_to(500, 20)
+    [model.values(i) for i in model.window(20)]
+    model.selected = model.rows[510]
+    del presented[:]
+
+    fresh = [supernova(i) for i in range(1, 1001)]
+    fresh[509].mag = '9.0'
+    diff = model.update(fresh)
+    assert diff.added == {'SN202601000'} and diff.removed == {'SN202600000'}
+    assert diff.changed == {'SN202600510'} and len(diff.unchanged) == 998
+    # the same supernova stays on the first line
+    assert model.top == 499 and model.selected is fresh[509]
+
+    # only the changed row on the page is formatted again
+    assert model.values(509)[2] == '9.0'
+    [model.values(i) for i in model.window(20)]
+    assert presented == ['SN202600510']
+
+    assert model.update(fresh).is_empty
+    model.update(fresh[:100])
+    assert model.selected is None and model.selected_name == 'SN202600510'
+    model.append(fresh[100:600])
+    assert model.selected is fresh[509]
+
+
+def test_table_selection_follows_the_displayed_page():
+    from getsupernovae import SupernovasApp
+
+    model, _ = counting_model()
+    model.set_rows(supernova(i) for i in range(100))
+    selection = []
+    app = SimpleNamespace(results_model=model, resultsTree=SimpleNamespace(selection=lambda: tuple(selection)),
+                          supernova_data={'I001': model.rows[0], 'I002': model.rows[1]})
+    sync = SupernovasApp._sync_selection_from_tree
+
+    selection.append('I002')
+    sync(app)
+    assert model.selected_name == 'SN202600001'
+    # scrolled off the page: still selected
+    selection.clear()
+    app.supernova_data = {'I001': model.rows[50], 'I002': model.rows[51]}
+    sync(app)
+    assert model.selected_name == 'SN202600001'
+    # on the page but not selected there: deselected
+    app.supernova_data = {'I001': model.rows[0], 'I002': model.rows[1]}
+    sync(app)
+    assert model.selected is None
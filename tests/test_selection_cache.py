@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.catalog import SupernovaCatalog
+from app.services import selection
+from app.services.ignore_list import IgnoreList
+from app.services.selection_cache import SelectionCache
+from getsupernovae import RochesterSupernova, SupernovaCallBackData, sites
+
+
+@pytest.fixture
+def rows(supernova_row):
+    def make(mag=14.0):
+        return [supernova_row('a', mag=mag, type='Ia'), supernova_row('b', '2025-12-02', 15.0, type='II')]
+    return make
+
+
+def config(mag='16', day='2025-12-05', start='21:00', hours='4', days='30', site='Sabadell', window=None):
+    return SupernovaCallBackData(mag, day, start, hours, days, sites[site], '0', window)
+
+
+def test_lru_evicts_oldest_and_returns_copies():
+    cache = SelectionCache(max_entries=2)
+    cache.put('a', [1])
+    cache.put('b', [2])
+    assert cache.get('a') == [1]
+    cache.put('c', [3])
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+
+    got = cache.get('a')
+    got.append(99)
+    assert cache.get('a') == [1]
+    assert cache.get('missing') is None and cache.get(None) is None
+    assert cache.hits == 3 and cache.misses == 1
+
+
+def test_fingerprint_tracks_content(rows):
+    a = SupernovaCatalog.from_dtos(rows())
+    b = SupernovaCatalog.from_dtos(rows())
+    c = SupernovaCatalog.from_dtos(rows(mag=13.0))
+    assert a.fingerprint == b.fingerprint
+    assert a.fingerprint != c.fingerprint
+
+
+def test_selection_key_changes_with_every_input(tmp_path, monkeypatch, rows):
+    ignore = IgnoreList(str(tmp_path / 'old.txt'))
+    monkeypatch.setattr(selection, 'old', ignore)
+    monkeypatch.setitem(selection.visibility_windows, 'South', {'minAlt': 20, 'minAz': 90, 'maxAz': 270})
+    selector = RochesterSupernova()
+    catalog = SupernovaCatalog.from_dtos(rows())
+    base = selector.selectionKey(config(), catalog)
+
+    assert selector.selectionKey(config(), SupernovaCatalog.from_dtos(rows())) == base
+    variants = [
+        (config(mag='17'), catalog),
+        (config(day='2025-12-06'), catalog),
+        (config(start='22:00'), catalog),
+        (config(hours='5'), catalog),
+        (config(days='10'), catalog),
+        (config(window='South'), catalog),
+        (config(), SupernovaCatalog.from_dtos(rows(mag=13.0))),
+    ]
+    for e, cat in variants:
+        assert selector.selectionKey(e, cat) != base
+
+    e = config()
+    e.filterExpression = 'type = Ia'
+    assert selector.selectionKey(e, catalog) != base
+    assert selector.selectionKey(config(), catalog, extra=(True,)) != base
+
+    ignore.add('SN2025a')
+    assert selector.selectionKey(config(), catalog) != base
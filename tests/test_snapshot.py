@@ -0,0 +1,87 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.provider import FileRochesterProvider
+from app.services.snapshot import CatalogSnapshotStore
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'snactive.html')
+
+
+def test_snapshot_roundtrip_matches_parsed_catalog(tmp_path):
+    store = CatalogSnapshotStore(str(tmp_path))
+    provider = FileRochesterProvider(FIXTURE, snapshot_store=store)
+    parsed = provider.fetch()
+
+    with open(FIXTURE, 'rb') as fh:
+        key = store.key_for(fh.read())
+    assert os.path.exists(store.path_for(key))
+
+    loaded = store.load(key)
+    assert len(loaded) == len(parsed)
+    for a, b in zip(parsed, loaded):
+        assert a.name == b.name
+        assert a.host == b.host
+        assert a.mag == b.mag
+        assert a.date == b.date
+        assert a.date_obj == b.date_obj
+        assert a.firstObserved_obj == b.firstObserved_obj
+        assert a.link == b.link
+        assert a.coordinates.separation(b.coordinates).arcsec < 1e-6
+
+
+def test_snapshot_hit_skips_parsing(tmp_path, monkeypatch):
+    store = CatalogSnapshotStore(str(tmp_path))
+    provider = FileRochesterProvider(FIXTURE, snapshot_store=store)
+    first = provider.fetch()
+
+    def fail(html):
+        raise AssertionError("HTML should not be parsed on a snapshot hit")
+
+    monkeypatch.setattr(provider, '_parse_html_rows', fail)
+    second = provider.fetch()
+    assert [sn.name for sn in second] == [sn.name for sn in first]
+
+
+def test_snapshot_miss_on_changed_html(tmp_path):
+    store = CatalogSnapshotStore(str(tmp_path))
+    assert store.key_for(b'<html>a</html>') != store.key_for(b'<html>b</html>')
+    assert store.load(store.key_for(b'<html>a</html>')) is None
+
+
+def test_concurrent_saves_prune_to_max_entries(tmp_path, monkeypatch):
+    dtos = FileRochesterProvider(FIXTURE).fetch()
+    stores = [CatalogSnapshotStore(str(tmp_path), max_entries=3) for _ in range(2)]
+    errors = []
+
+    def save(store, prefix):
+        for i in range(10):
+            try:
+                store.save(f'{prefix}{i}', dtos)
+            except Exception as ex:
+                errors.append(ex)
+
+    threads = [threading.Thread(target=save, args=(s, p)) for s, p in zip(stores, 'ab')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.npz')]) == 3
+
+    # a snapshot deleted by another process between listing and stat
+    getmtime = os.path.getmtime
+    gone = os.path.join(str(tmp_path), sorted(f for f in os.listdir(tmp_path) if f.endswith('.npz'))[0])
+
+    def vanishing(path):
+        if path == gone:
+            raise FileNotFoundError(path)
+        return getmtime(path)
+
+    monkeypatch.setattr(os.path, 'getmtime', vanishing)
+    stores[0].max_entries = 1
+    stores[0].prune()
+    # the file that could not be read is skipped, the others pruned to one
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.npz')]) == 2 and os.path.exists(gone)
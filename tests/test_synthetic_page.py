@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.provider import RochesterProvider
+from benchmarks.synthetic import generate_rows, render_page
+
+
+def test_synthetic_page_parses_expected_rows():
+    rows = list(generate_rows(300, seed=7, malformed_fraction=0.2))
+    assert any(not r.parseable for r in rows)
+
+    parsed = RochesterProvider().parse_html(render_page(rows))
+    expected = [r.name for r in rows if r.parseable]
+    assert [p.name for p in parsed] == expected
+
+
+def test_synthetic_rows_are_deterministic():
+    a = [r.ra for r in generate_rows(50, seed=3)]
+    b = [r.ra for r in generate_rows(50, seed=3)]
+    assert a == b
@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.snmodels import AxCordInTime, Visibility
+from app.services.provider import RochesterProvider
+from app.services.timing import PipelineTimer, log_timings, timed
+from benchmarks.synthetic import generate_page
+from getsupernovae import RochesterSupernova, SupernovaCallBackData, sites
+
+
+class AlwaysVisible:
+    def __init__(self, minAlt, maxAlt, minAz, maxAz):
+        pass
+
+    def getVisibility(self, site, coord, t1, t2):
+        return Visibility(True, [AxCordInTime(t1, None)])
+
+
+def test_stages_accumulate_and_summarise():
+    timer = PipelineTimer()
+    with timer.stage('parse') as stage:
+        stage.count = 10
+    with timed(timer, 'visibility', 1):
+        pass
+    with timed(timer, 'visibility', 1):
+        pass
+    with timed(None, 'ignored') as stage:
+        stage.count = 3
+
+    assert [s.name for s in timer.stages] == ['parse', 'visibility']
+    assert timer.get('parse').count == 10
+    assert timer.get('visibility').count == 2
+    assert timer.get('visibility').wall >= 0 and timer.get('visibility').cpu >= 0
+    assert timer.summary().startswith('parse ') and '(2)' in timer.summary()
+
+
+def test_stage_is_recorded_when_the_block_raises():
+    timer = PipelineTimer()
+    try:
+        with timer.stage('fetch'):
+            raise RuntimeError('network down')
+    except RuntimeError:
+        pass
+    assert timer.get('fetch') is not None
+
+
+def test_log_timings_writes_json_lines(tmp_path):
+    logger = logging.getLogger('test.timings')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.FileHandler(tmp_path / 'timings.log')
+    logger.addHandler(handler)
+    try:
+        timer = PipelineTimer()
+        with timer.stage('sort', 5):
+            pass
+        log_timings(timer, logger=logger, source='SEARCH')
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    record = json.loads((tmp_path / 'timings.log').read_text().strip())
+    assert record['source'] == 'SEARCH'
+    assert record['stages'][0]['name'] == 'sort' and record['stages'][0]['count'] == 5
+
+
+def test_provider_and_selection_report_stages(supernova_row):
+    timer = PipelineTimer()
+    provider = RochesterProvider()
+    provider.timer = timer
+    parsed = provider.parse_html(generate_page(30))
+    assert timer.get('parse').count == len(parsed)
+
+    rows = [supernova_row(c) for c in 'ab']
+    e = SupernovaCallBackData('16', '2025-12-05', '21:00', '4', '30', sites['Sabadell'], '0')
+    RochesterSupernova(visibility_factory=AlwaysVisible).selectAndSortSupernovas(e, rows, timer=timer)
+    assert timer.get('filter').count == 2
+    assert timer.get('visibility').count == 2
+    assert timer.get('sort').count == 2